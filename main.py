@@ -3,6 +3,7 @@
 Main entry point for Github Heroes.
 """
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -10,6 +11,8 @@ sys.path.insert(0, Path(__file__).parent.joinpath("src").as_posix())
 from github_heroes.core.app import run_app
 
 if __name__ == "__main__":
+    # Lets the parser processes start from a frozen (PyInstaller) executable
+    multiprocessing.freeze_support()
     # Call the Click command - it will parse sys.argv for options like --log
     # If no --log is provided, it will use the default "info" from the Click option
     sys.exit(run_app.main(standalone_mode=False))
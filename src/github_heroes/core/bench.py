@@ -0,0 +1,150 @@
+"""
+Command line benchmark for the world-build pipeline.
+"""
+
+import logging
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from github_heroes.core.logging_utils import get_logger, setup_logging
+from github_heroes.data.database import Database, set_db
+from github_heroes.data.repositories import DungeonRoomRepository, QuestRepository
+from github_heroes.game.generators import build_repo_world
+from github_heroes.github.branch_cache import BranchCache
+from github_heroes.github.cassette import LATENCY_PROFILES, Cassette
+from github_heroes.github.parse_pool import ParsePool, set_parse_pool
+from github_heroes.github.scheduler import RequestScheduler
+from github_heroes.github.scraper import BACKENDS, GitHubScraper
+from github_heroes.github.transport import TRANSPORTS, create_transport
+
+logger = get_logger(__name__)
+
+
+@click.command(
+    name="github-heroes-bench",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("repos", nargs=-1, required=True)
+@click.option(
+    "-c",
+    "--cassette",
+    "cassette_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Cassette file to replay from (or record to with --record)",
+)
+@click.option("--record", is_flag=True, help="Record live traffic to the cassette file")
+@click.option(
+    "--latency",
+    default="none",
+    type=click.Choice(list(LATENCY_PROFILES)),
+    help="Simulated network conditions when replaying",
+)
+@click.option(
+    "--backend", default="html", type=click.Choice(BACKENDS), help="Scraper backend"
+)
+@click.option(
+    "--transport",
+    "transport_name",
+    default="requests",
+    type=click.Choice(TRANSPORTS),
+    help="HTTP transport (http2 needs httpx)",
+)
+@click.option(
+    "--parse-workers",
+    type=click.IntRange(min=0),
+    help="Parser processes (0 parses in the benchmark process)",
+)
+@click.option("--runs", default=3, show_default=True, help="Builds per repository")
+@click.option(
+    "-l",
+    "--log",
+    default="warning",
+    type=click.Choice(["critical", "error", "warn", "warning", "info", "debug"]),
+    help="Logging level",
+)
+def run_bench(
+    repos,
+    cassette_path,
+    record,
+    latency,
+    backend,
+    transport_name,
+    parse_workers,
+    runs,
+    log,
+):
+    """
+    Build the worlds for REPOS (owner/repo) and report timings.
+
+    Every run starts from an empty scratch database, branch cache and rate
+    limiter and bypasses the response and parse caches, so runs are
+    comparable. With a cassette no network access is needed; record one
+    first with --record.
+    """
+    setup_logging(getattr(logging, log.upper()))
+    if record and not cassette_path:
+        raise click.UsageError("--record needs a cassette file")
+
+    cassette = None
+    if cassette_path:
+        cassette = Cassette(
+            cassette_path, mode="record" if record else "replay", latency=latency
+        )
+        if record:
+            runs = 1
+
+    parse_pool = ParsePool() if parse_workers is None else ParsePool(parse_workers)
+    set_parse_pool(parse_pool)
+
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for run in range(runs):
+            for name in repos:
+                owner, _, repo = name.partition("/")
+                db = Database(Path(tmp_dir) / f"bench_{run}_{owner}_{repo}.db")
+                set_db(db)
+                scraper = GitHubScraper(
+                    api_token=os.environ.get("GITHUB_TOKEN"),
+                    use_cache=False,
+                    scheduler=RequestScheduler(),
+                    backend=backend,
+                    cassette=cassette,
+                    transport=create_transport(transport_name),
+                )
+                scraper.branch_cache = BranchCache()
+
+                start = time.perf_counter()
+                world = build_repo_world(owner, repo, scraper)
+                elapsed = time.perf_counter() - start
+                timings.append(elapsed)
+
+                if world:
+                    rooms = len(DungeonRoomRepository.get_by_world_id(world.id))
+                    quests = len(QuestRepository.get_by_world_id(world.id))
+                    details = f"{rooms} rooms, {quests} quests"
+                    stats = scraper.transport_stats()
+                    if stats["requests"]:
+                        details += (
+                            f", {stats['requests']} requests over "
+                            f"{stats['connections']} connections"
+                        )
+                    click.echo(f"run {run + 1} {name}: {elapsed:.3f}s ({details})")
+                else:
+                    click.echo(f"run {run + 1} {name}: failed after {elapsed:.3f}s")
+                set_db(None)
+                db.conn.close()
+
+    parse_pool.shutdown(wait=True)
+    if cassette and record:
+        cassette.save()
+    click.echo(
+        f"{len(timings)} builds: min {min(timings):.3f}s, "
+        f"median {statistics.median(timings):.3f}s, max {max(timings):.3f}s"
+    )
+    if cassette and not record:
+        click.echo(f"{cassette.replayed} replayed, {cassette.missed} missing responses")
@@ -2,6 +2,7 @@
 Configuration constants and settings for Github Heroes.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -52,18 +53,100 @@ LOGS_DIR.mkdir(exist_ok=True)
 # Database
 DB_PATH = DATA_DIR / "github_heroes.db"
 
+# HTTP response cache (revalidated with ETag/Last-Modified)
+HTTP_CACHE_PATH = DATA_DIR / "http_cache.db"
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Parse result cache (reused for byte-identical pages)
+PARSE_CACHE_PATH = DATA_DIR / "parse_cache.db"
+PARSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Optional overrides of the HTML parsers' CSS selectors (see github/markup.py)
+SELECTORS_PATH = DATA_DIR / "selectors.json"
+
 # Window defaults
 DEFAULT_WINDOW_WIDTH = 1280
 DEFAULT_WINDOW_HEIGHT = 720
 
 # GitHub scraping
 DEFAULT_BRANCHES = ["main", "master"]
+# How long a detected default branch is trusted before probing again (seconds)
+BRANCH_CACHE_TTL = 24 * 60 * 60
 GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
 GITHUB_BASE = "https://github.com"
 GITHUB_SEARCH_BASE = "https://github.com/search"
+GITHUB_API_BASE = "https://api.github.com"
 
 # Request settings
 REQUEST_TIMEOUT = 30
+# Most bytes read per response, by resource type. READMEs and HTML pages are
+# cut off at the limit; larger JSON payloads are dropped since they can't parse.
+RESPONSE_BYTE_LIMITS = {
+    "readme": 1024 * 1024,
+    "html": 5 * 1024 * 1024,
+    "json": 10 * 1024 * 1024,
+}
+RESPONSE_CHUNK_SIZE = 64 * 1024
+# Maximum number of page requests issued concurrently while building one world
+FETCH_MAX_WORKERS = 6
+
+# Repository tree crawling: directory levels to descend and total entry cap
+TREE_MAX_DEPTH = 4
+TREE_MAX_ENTRIES = 1000
+
+# Issue, pull request and commit lists: items per full page (a shorter page is
+# the last one), pages fetched at most, and items kept per world
+HTML_LIST_PAGE_SIZES = {"issues": 25, "pulls": 25, "commits": 35}
+API_PAGE_SIZE = 100
+LIST_MAX_PAGES = 5
+ISSUE_QUEST_BUDGET = 75
+PR_QUEST_BUDGET = 25
+# Commits only feed activity scoring; the boss level bonus from commits caps at 50
+COMMIT_BUDGET = 50
+
+# Bulk imports: parallel world builds, tries per repository and repositories
+# whose READMEs and trees are analyzed together
+IMPORT_WORKERS = 4
+IMPORT_MAX_ATTEMPTS = 2
+IMPORT_BATCH_SIZE = 16
+IMPORT_RETRY_DELAY = 30.0  # Seconds before a failed job is tried again, doubled per try
+
+# Worker processes that parse pages and analyze READMEs off the GUI process
+# (0 parses in the calling thread); one core is left to the GUI
+PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# Background refresh: maximum age of world data, how often to look for stale
+# worlds (seconds), parallel refreshes and worlds refreshed per pass
+REFRESH_MAX_AGE_HOURS = 24
+REFRESH_CHECK_INTERVAL = 10 * 60
+REFRESH_WORKERS = 2
+REFRESH_BATCH_SIZE = 10
+
+# Repository search: how long results are reused (seconds), queries kept, and
+# how many top results get their home page fetched ahead of a world build
+SEARCH_CACHE_TTL = 10 * 60
+SEARCH_CACHE_MAX_QUERIES = 50
+SEARCH_PREFETCH_COUNT = 3
+SEARCH_PREFETCH_WORKERS = 2
+# How long a prefetched page is kept for the world build that may follow
+PREFETCH_TTL = 5 * 60
+
+# HTTP transport: "requests" (urllib3 pool) or "http2" (needs httpx), hosts
+# with a connection pool, idle connections kept per host, whether connections
+# are kept alive between requests, and whether compressed bodies are accepted
+HTTP_TRANSPORT = "requests"
+TRANSPORT_POOL_CONNECTIONS = 10
+TRANSPORT_POOL_MAXSIZE = 32
+TRANSPORT_KEEP_ALIVE = True
+TRANSPORT_COMPRESSION = True
+
+# Request scheduling (shared by all scrapers in the process)
+REQUEST_RATE_PER_HOST = 5.0  # Sustained requests per second per host
+REQUEST_BURST = 10  # Requests that may be issued back to back per host
+MAX_IN_FLIGHT_REQUESTS = 8
+REQUEST_MAX_RETRIES = 4
+REQUEST_BACKOFF_BASE = 1.0  # Seconds, doubled on every retry
+REQUEST_BACKOFF_MAX = 60.0
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
@@ -120,6 +203,16 @@ PLAYER_CLASSES = [
     "Build Fixer",
 ]
 
+# Most frequent README words kept per world (ties keep the earliest words)
+README_TOP_WORDS = 50
+
+# Related worlds: MinHash signature size (hashes, split into LSH bands of
+# equal size) over README words, keyword groups and file extensions, and how
+# many related worlds the map shows
+SIMILARITY_HASHES = 64
+SIMILARITY_BANDS = 32
+RELATED_WORLDS_COUNT = 5
+
 # Keyword groups for README analysis
 KEYWORD_GROUPS = {
     "web": [
@@ -2,11 +2,14 @@
 SQLite database connection and schema initialization.
 """
 
+import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from github_heroes.core.config import DB_PATH
+from github_heroes.core.config import DB_PATH, README_TOP_WORDS
 from github_heroes.core.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -20,6 +23,10 @@ class Database:
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or DB_PATH
         self.conn: Optional[sqlite3.Connection] = None
+        # The connection is shared by the GUI and worker threads
+        self._lock = threading.RLock()
+        # Nesting depth of transaction() blocks of the thread holding the lock
+        self._transaction_depth = 0
         self._initialize()
 
     def _initialize(self):
@@ -191,6 +198,13 @@ class Database:
         except sqlite3.OperationalError:
             pass  # Column already exists
 
+        # Add last_visited_at column to repo_worlds table if it doesn't exist (migration)
+        try:
+            cursor.execute("ALTER TABLE repo_worlds ADD COLUMN last_visited_at TEXT")
+            self.conn.commit()
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
         # Achievements table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS achievements (
@@ -220,6 +234,50 @@ class Database:
             )
         """)
 
+        # Default branch cache table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS repo_branches (
+                full_name TEXT PRIMARY KEY,
+                branch TEXT NOT NULL,
+                detected_at TEXT NOT NULL
+            )
+        """)
+
+        # Bulk import queue table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                owner TEXT NOT NULL,
+                repo TEXT NOT NULL,
+                full_name TEXT NOT NULL UNIQUE,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                world_id INTEGER,
+                added_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                next_attempt_at TEXT
+            )
+        """)
+
+        # Add next_attempt_at column to import_queue table if it doesn't exist (migration)
+        try:
+            cursor.execute("ALTER TABLE import_queue ADD COLUMN next_attempt_at TEXT")
+            self.conn.commit()
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+        # Similarity signatures of repo worlds, for related worlds
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS world_signatures (
+                world_id INTEGER PRIMARY KEY,
+                scheme TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                updated_at TEXT NOT NULL,
+                FOREIGN KEY (world_id) REFERENCES repo_worlds(id)
+            )
+        """)
+
         # Create indices
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_repo_worlds_full_name ON repo_worlds(full_name)"
@@ -242,10 +300,57 @@ class Database:
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_achievements_achievement_id ON achievements(achievement_id)"
         )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_import_queue_status ON import_queue(status)"
+        )
 
         self.conn.commit()
         logger.info("Database schema created/verified")
 
+        self._compact_readme_features()
+
+    def _compact_readme_features(self):
+        """
+        Keep only the README_TOP_WORDS most frequent README words of every
+        world (older versions stored all of them). The size compacted to is
+        recorded in the "readme_top_words" setting, so this runs again only
+        if README_TOP_WORDS is lowered.
+        """
+        cursor = self.conn.cursor()
+        row = cursor.execute(
+            "SELECT value FROM settings WHERE key = 'readme_top_words'"
+        ).fetchone()
+        if row and row[0].isdigit() and int(row[0]) <= README_TOP_WORDS:
+            return  # Already compacted to this size or smaller
+
+        updates = []
+        for world_id, features_json in cursor.execute(
+            "SELECT id, readme_features_json FROM repo_worlds WHERE readme_features_json IS NOT NULL"
+        ).fetchall():
+            try:
+                features = json.loads(features_json)
+                frequencies = features.get("word_frequencies") or {}
+            except (ValueError, AttributeError):
+                continue
+            if len(frequencies) <= README_TOP_WORDS:
+                continue
+            top_words = sorted(
+                frequencies.items(), key=lambda item: item[1], reverse=True
+            )
+            features["word_frequencies"] = dict(top_words[:README_TOP_WORDS])
+            updates.append((json.dumps(features), world_id))
+
+        cursor.executemany(
+            "UPDATE repo_worlds SET readme_features_json = ? WHERE id = ?", updates
+        )
+        cursor.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('readme_top_words', ?)",
+            (str(README_TOP_WORDS),),
+        )
+        self.conn.commit()
+        if updates:
+            logger.info(f"Compacted README word frequencies of {len(updates)} worlds")
+
     def get_connection(self) -> sqlite3.Connection:
         """Get the database connection."""
         if self.conn is None:
@@ -261,13 +366,40 @@ class Database:
 
     def execute(self, query: str, params: tuple = ()):
         """Execute a query and return cursor."""
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        return cursor
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            return cursor
 
     def commit(self):
-        """Commit the current transaction."""
-        self.conn.commit()
+        """
+        Commit the current transaction. Inside a transaction() block, the
+        commit happens when the block ends.
+        """
+        with self._lock:
+            if not self._transaction_depth:
+                self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator["Database"]:
+        """
+        Run a block as one transaction: no other thread can use the
+        connection until it ends, so read query results inside the block.
+        Commits when the block ends, or rolls back if it raises. Nested
+        blocks are part of the outer transaction.
+        """
+        with self._lock:
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self.conn.rollback()
+                raise
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self.conn.commit()
 
     def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get a setting value."""
@@ -293,3 +425,9 @@ def get_db() -> Database:
     if _db_instance is None:
         _db_instance = Database()
     return _db_instance
+
+
+def set_db(db: Optional[Database]):
+    """Replace the global database instance (e.g. with a scratch database)."""
+    global _db_instance
+    _db_instance = db
@@ -0,0 +1,164 @@
+"""
+Size-limited SQLite store with least-recently-used eviction, shared by the
+on-disk caches.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from github_heroes.core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteLRUStore:
+    """
+    Entries of one table in a dedicated SQLite file, keyed by a text key.
+
+    Subclasses set ``table``, ``key_column`` and ``columns``, the definitions
+    of the other columns; every row also records its stored ``size`` and when
+    it was ``last_used``. When the total size exceeds ``max_bytes`` the least
+    recently used entries are evicted. ``hits`` and ``misses`` count lookups
+    in this session.
+    """
+
+    table: str
+    key_column: str
+    columns: Sequence[str]
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                {self.key_column} TEXT PRIMARY KEY,
+                {", ".join(self.columns)},
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_used "
+            f"ON {self.table}(last_used)"
+        )
+        self.conn.commit()
+        row = self.conn.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        self.total_bytes = row[0]
+
+    def _load(
+        self, key: str, columns: str, lookup: bool = False
+    ) -> Optional[Tuple[Any, ...]]:
+        """
+        Get the given columns of an entry, if any. A ``lookup`` counts as a
+        hit or a miss, and marks a found entry as recently used.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {columns} FROM {self.table} WHERE {self.key_column} = ?",
+                (key,),
+            ).fetchone()
+            if lookup:
+                if row:
+                    self.hits += 1
+                    self._touch(key)
+                else:
+                    self.misses += 1
+        return row
+
+    def _touch(self, key: str):
+        """Mark an entry as recently used (lock held)."""
+        self.conn.execute(
+            f"UPDATE {self.table} SET last_used = ? WHERE {self.key_column} = ?",
+            (time.time(), key),
+        )
+        self.conn.commit()
+
+    def _save(self, key: str, values: Dict[str, Any], size: int):
+        """
+        Store an entry with the given column values, ``size`` bytes large,
+        evicting old entries if the store is full.
+        """
+        if size > self.max_bytes:
+            return
+
+        names = [self.key_column, *values, "size", "last_used"]
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT size FROM {self.table} WHERE {self.key_column} = ?", (key,)
+            ).fetchone()
+            if row:
+                self.total_bytes -= row[0]
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(names)}) "
+                f"VALUES ({', '.join('?' * len(names))})",
+                (key, *values.values(), size, time.time()),
+            )
+            self.total_bytes += size
+            self._evict()
+            self.conn.commit()
+
+    def remove(self, key: str):
+        """Remove a single entry."""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT size FROM {self.table} WHERE {self.key_column} = ?", (key,)
+            ).fetchone()
+            if row:
+                self.total_bytes -= row[0]
+                self.conn.execute(
+                    f"DELETE FROM {self.table} WHERE {self.key_column} = ?", (key,)
+                )
+                self.conn.commit()
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self.conn.execute(f"DELETE FROM {self.table}")
+            self.conn.commit()
+            self.total_bytes = 0
+
+    def set_max_bytes(self, max_bytes: int):
+        """Change the size limit, evicting entries if needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this session and current usage."""
+        with self._lock:
+            entries = self.conn.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _evict(self):
+        """Evict least recently used entries until under the size limit (lock held)."""
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute(
+                f"SELECT {self.key_column}, size FROM {self.table} "
+                "ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if not row:
+                self.total_bytes = 0
+                break
+            self.conn.execute(
+                f"DELETE FROM {self.table} WHERE {self.key_column} = ?", (row[0],)
+            )
+            self.total_bytes -= row[1]
+            logger.debug(f"Evicted {self.table} entry {row[0]}")
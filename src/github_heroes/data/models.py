@@ -87,6 +87,7 @@ class RepoWorld:
     structure_features_json: Optional[str] = None
     discovered_at: Optional[str] = None
     last_scraped_at: Optional[str] = None
+    last_visited_at: Optional[str] = None
 
     def get_readme_features(self) -> Optional[Dict[str, Any]]:
         """Get parsed README features."""
@@ -162,6 +163,23 @@ class Quest:
     status: str = "new"  # "new", "in_progress", "completed"
 
 
+@dataclass
+class ImportJob:
+    """Bulk import queue entry."""
+
+    id: Optional[int] = None
+    owner: str = ""
+    repo: str = ""
+    full_name: str = ""
+    status: str = "pending"  # "pending", "running", "done", "failed"
+    attempts: int = 0
+    error: Optional[str] = None
+    world_id: Optional[int] = None
+    added_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    next_attempt_at: Optional[str] = None  # Earliest retry of a failed job
+
+
 class ItemRarity(Enum):
     """List of rarity types."""
 
@@ -315,7 +333,9 @@ class ReadmeFeatures:
     word_count: int = 0
     char_count: int = 0
     heading_count: int = 0
-    word_frequencies: Dict[str, int] = field(default_factory=dict)
+    word_frequencies: Dict[str, int] = field(
+        default_factory=dict
+    )  # Most frequent words only (README_TOP_WORDS)
     keyword_hits: Dict[str, int] = field(default_factory=dict)
     seed: int = 0
 
@@ -2,8 +2,8 @@
 Data access layer for database operations.
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 from github_heroes.core.logging_utils import get_logger
 from github_heroes.data.database import get_db
@@ -11,6 +11,7 @@ from github_heroes.data.models import (
     Achievement,
     DungeonRoom,
     Enemy,
+    ImportJob,
     Item,
     ItemRarity,
     Player,
@@ -212,6 +213,7 @@ class RepoWorldRepository:
                 structure_features_json=row["structure_features_json"],
                 discovered_at=row["discovered_at"],
                 last_scraped_at=row["last_scraped_at"],
+                last_visited_at=row["last_visited_at"],
             )
         return None
 
@@ -240,6 +242,7 @@ class RepoWorldRepository:
                 structure_features_json=row["structure_features_json"],
                 discovered_at=row["discovered_at"],
                 last_scraped_at=row["last_scraped_at"],
+                last_visited_at=row["last_visited_at"],
             )
         return None
 
@@ -275,6 +278,35 @@ class RepoWorldRepository:
         db.commit()
         return world
 
+    @staticmethod
+    def mark_visited(world_id: int):
+        """Record that the player entered a world's dungeon."""
+        db = get_db()
+        db.execute(
+            "UPDATE repo_worlds SET last_visited_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), world_id),
+        )
+        db.commit()
+
+    @staticmethod
+    def get_stale(scraped_before: str, limit: int) -> List[RepoWorld]:
+        """
+        Get worlds last scraped before a timestamp, most recently visited first
+        (never visited last), then oldest data first.
+        """
+        db = get_db()
+        cursor = db.execute(
+            """
+            SELECT id FROM repo_worlds
+            WHERE last_scraped_at IS NULL OR last_scraped_at < ?
+            ORDER BY last_visited_at IS NULL, last_visited_at DESC, last_scraped_at
+            LIMIT ?
+        """,
+            (scraped_before, limit),
+        )
+        ids = [row["id"] for row in cursor.fetchall()]
+        return [world for world in map(RepoWorldRepository.get_by_id, ids) if world]
+
     @staticmethod
     def remove_by_id(world_id: int) -> bool:
         """Remove repo world."""
@@ -337,39 +369,140 @@ class RepoWorldRepository:
                 structure_features_json=row["structure_features_json"],
                 discovered_at=row["discovered_at"],
                 last_scraped_at=row["last_scraped_at"],
+                last_visited_at=row["last_visited_at"],
             )
             for row in cursor.fetchall()
         ]
 
 
-class EnemyRepository:
-    """Repository for enemy operations."""
+class WorldSignatureRepository:
+    """Repository for repo world similarity signatures."""
 
     @staticmethod
-    def create(enemy: Enemy) -> Enemy:
-        """Create a new enemy."""
+    def save(world_id: int, scheme: str, signature: bytes):
+        """Store a world's signature, replacing any previous one."""
         db = get_db()
-        cursor = db.execute(
+        db.execute(
             """
-            INSERT INTO enemies (world_id, name, level, hp, attack, defense, speed, tags_json, is_boss, creature_image_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT OR REPLACE INTO world_signatures (world_id, scheme, signature, updated_at)
+            VALUES (?, ?, ?, ?)
         """,
-            (
-                enemy.world_id,
-                enemy.name,
-                enemy.level,
-                enemy.hp,
-                enemy.attack,
-                enemy.defense,
-                enemy.speed,
-                enemy.tags_json,
-                1 if enemy.is_boss else 0,
-                enemy.creature_image_id,
-            ),
+            (world_id, scheme, signature, datetime.now().isoformat()),
         )
         db.commit()
-        enemy.id = cursor.lastrowid
-        return enemy
+
+    @staticmethod
+    def save_many(scheme: str, signatures: Dict[int, bytes]):
+        """Store several signatures, by world ID, in a single transaction."""
+        with get_db().transaction() as db:
+            now = datetime.now().isoformat()
+            for world_id, signature in signatures.items():
+                db.execute(
+                    """
+                    INSERT OR REPLACE INTO world_signatures (world_id, scheme, signature, updated_at)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (world_id, scheme, signature, now),
+                )
+
+    @staticmethod
+    def delete(world_id: int):
+        """Remove a world's signature."""
+        db = get_db()
+        db.execute("DELETE FROM world_signatures WHERE world_id = ?", (world_id,))
+        db.commit()
+
+    @staticmethod
+    def delete_many(world_ids: List[int]):
+        """Remove several worlds' signatures."""
+        with get_db().transaction() as db:
+            for world_id in world_ids:
+                db.execute(
+                    "DELETE FROM world_signatures WHERE world_id = ?", (world_id,)
+                )
+
+    @staticmethod
+    def get_all(scheme: str) -> Dict[int, bytes]:
+        """Get the signatures made with ``scheme``, by world ID."""
+        db = get_db()
+        cursor = db.execute(
+            "SELECT world_id, signature FROM world_signatures WHERE scheme = ?",
+            (scheme,),
+        )
+        return {row["world_id"]: row["signature"] for row in cursor.fetchall()}
+
+
+class EnemyRepository:
+    """Repository for enemy operations."""
+
+    @staticmethod
+    def create(enemy: Enemy) -> Enemy:
+        """Create a new enemy."""
+        return EnemyRepository.create_many([enemy])[0]
+
+    @staticmethod
+    def create_many(enemies: List[Enemy]) -> List[Enemy]:
+        """Create several enemies in a single transaction."""
+        with get_db().transaction() as db:
+            for enemy in enemies:
+                cursor = db.execute(
+                    """
+                    INSERT INTO enemies (world_id, name, level, hp, attack, defense, speed, tags_json, is_boss, creature_image_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        enemy.world_id,
+                        enemy.name,
+                        enemy.level,
+                        enemy.hp,
+                        enemy.attack,
+                        enemy.defense,
+                        enemy.speed,
+                        enemy.tags_json,
+                        1 if enemy.is_boss else 0,
+                        enemy.creature_image_id,
+                    ),
+                )
+                enemy.id = cursor.lastrowid
+        return enemies
+
+    @staticmethod
+    def update(enemy: Enemy) -> Enemy:
+        """Update enemy."""
+        return EnemyRepository.update_many([enemy])[0]
+
+    @staticmethod
+    def update_many(enemies: List[Enemy]) -> List[Enemy]:
+        """Update several enemies in a single transaction."""
+        with get_db().transaction() as db:
+            for enemy in enemies:
+                db.execute(
+                    """
+                    UPDATE enemies SET name=?, level=?, hp=?, attack=?, defense=?, speed=?,
+                        tags_json=?, is_boss=?, creature_image_id=?
+                    WHERE id=?
+                """,
+                    (
+                        enemy.name,
+                        enemy.level,
+                        enemy.hp,
+                        enemy.attack,
+                        enemy.defense,
+                        enemy.speed,
+                        enemy.tags_json,
+                        1 if enemy.is_boss else 0,
+                        enemy.creature_image_id,
+                        enemy.id,
+                    ),
+                )
+        return enemies
+
+    @staticmethod
+    def delete_many(enemy_ids: List[int]):
+        """Delete several enemies in a single transaction."""
+        with get_db().transaction() as db:
+            for enemy_id in enemy_ids:
+                db.execute("DELETE FROM enemies WHERE id = ?", (enemy_id,))
 
     @staticmethod
     def get_by_id(enemy_id: int) -> Optional[Enemy]:
@@ -432,24 +565,29 @@ class DungeonRoomRepository:
     @staticmethod
     def create(room: DungeonRoom) -> DungeonRoom:
         """Create a new dungeon room."""
-        db = get_db()
-        cursor = db.execute(
-            """
-            INSERT INTO dungeon_rooms (world_id, zone_name, file_path, danger_level, loot_quality, visited)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (
-                room.world_id,
-                room.zone_name,
-                room.file_path,
-                room.danger_level,
-                room.loot_quality,
-                1 if room.visited else 0,
-            ),
-        )
-        db.commit()
-        room.id = cursor.lastrowid
-        return room
+        return DungeonRoomRepository.create_many([room])[0]
+
+    @staticmethod
+    def create_many(rooms: List[DungeonRoom]) -> List[DungeonRoom]:
+        """Create several dungeon rooms in a single transaction."""
+        with get_db().transaction() as db:
+            for room in rooms:
+                cursor = db.execute(
+                    """
+                    INSERT INTO dungeon_rooms (world_id, zone_name, file_path, danger_level, loot_quality, visited)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        room.world_id,
+                        room.zone_name,
+                        room.file_path,
+                        room.danger_level,
+                        room.loot_quality,
+                        1 if room.visited else 0,
+                    ),
+                )
+                room.id = cursor.lastrowid
+        return rooms
 
     @staticmethod
     def get_by_id(room_id: int) -> Optional[DungeonRoom]:
@@ -503,6 +641,33 @@ class DungeonRoomRepository:
         db.commit()
         return room
 
+    @staticmethod
+    def update_many(rooms: List[DungeonRoom]) -> List[DungeonRoom]:
+        """Update the layout and state of several rooms in a single transaction."""
+        with get_db().transaction() as db:
+            for room in rooms:
+                db.execute(
+                    """
+                    UPDATE dungeon_rooms SET zone_name=?, danger_level=?, loot_quality=?, visited=?
+                    WHERE id=?
+                """,
+                    (
+                        room.zone_name,
+                        room.danger_level,
+                        room.loot_quality,
+                        1 if room.visited else 0,
+                        room.id,
+                    ),
+                )
+        return rooms
+
+    @staticmethod
+    def delete_many(room_ids: List[int]):
+        """Delete several rooms in a single transaction."""
+        with get_db().transaction() as db:
+            for room_id in room_ids:
+                db.execute("DELETE FROM dungeon_rooms WHERE id = ?", (room_id,))
+
 
 class QuestRepository:
     """Repository for quest operations."""
@@ -510,24 +675,29 @@ class QuestRepository:
     @staticmethod
     def create(quest: Quest) -> Quest:
         """Create a new quest."""
-        db = get_db()
-        cursor = db.execute(
-            """
-            INSERT INTO quests (world_id, source_type, source_number, title, difficulty, status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (
-                quest.world_id,
-                quest.source_type,
-                quest.source_number,
-                quest.title,
-                quest.difficulty,
-                quest.status,
-            ),
-        )
-        db.commit()
-        quest.id = cursor.lastrowid
-        return quest
+        return QuestRepository.create_many([quest])[0]
+
+    @staticmethod
+    def create_many(quests: List[Quest]) -> List[Quest]:
+        """Create several quests in a single transaction."""
+        with get_db().transaction() as db:
+            for quest in quests:
+                cursor = db.execute(
+                    """
+                    INSERT INTO quests (world_id, source_type, source_number, title, difficulty, status)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        quest.world_id,
+                        quest.source_type,
+                        quest.source_number,
+                        quest.title,
+                        quest.difficulty,
+                        quest.status,
+                    ),
+                )
+                quest.id = cursor.lastrowid
+        return quests
 
     @staticmethod
     def get_by_id(quest_id: int) -> Optional[Quest]:
@@ -579,6 +749,27 @@ class QuestRepository:
         db.commit()
         return quest
 
+    @staticmethod
+    def update_many(quests: List[Quest]) -> List[Quest]:
+        """Update the title, difficulty and status of several quests."""
+        with get_db().transaction() as db:
+            for quest in quests:
+                db.execute(
+                    """
+                    UPDATE quests SET title=?, difficulty=?, status=?
+                    WHERE id=?
+                """,
+                    (quest.title, quest.difficulty, quest.status, quest.id),
+                )
+        return quests
+
+    @staticmethod
+    def delete_many(quest_ids: List[int]):
+        """Delete several quests in a single transaction."""
+        with get_db().transaction() as db:
+            for quest_id in quest_ids:
+                db.execute("DELETE FROM quests WHERE id = ?", (quest_id,))
+
 
 class ItemRepository:
     """Repository for item operations."""
@@ -920,3 +1111,197 @@ class PlayerStatsRepository:
             (value, player_id),
         )
         db.commit()
+
+
+class RepoBranchRepository:
+    """Repository for cached default branch operations."""
+
+    @staticmethod
+    def get(full_name: str) -> Optional[Tuple[str, str]]:
+        """Get (branch, detected_at) for a repository, if known."""
+        db = get_db()
+        cursor = db.execute(
+            "SELECT branch, detected_at FROM repo_branches WHERE full_name = ?",
+            (full_name,),
+        )
+        row = cursor.fetchone()
+        if row:
+            return row["branch"], row["detected_at"]
+        return None
+
+    @staticmethod
+    def set(full_name: str, branch: str, detected_at: str):
+        """Store the default branch for a repository."""
+        db = get_db()
+        db.execute(
+            """
+            INSERT OR REPLACE INTO repo_branches (full_name, branch, detected_at)
+            VALUES (?, ?, ?)
+        """,
+            (full_name, branch, detected_at),
+        )
+        db.commit()
+
+
+class ImportJobRepository:
+    """Repository for bulk import queue operations."""
+
+    @staticmethod
+    def _from_row(row) -> ImportJob:
+        """Build an import job from a database row."""
+        return ImportJob(
+            id=row["id"],
+            owner=row["owner"],
+            repo=row["repo"],
+            full_name=row["full_name"],
+            status=row["status"],
+            attempts=row["attempts"],
+            error=row["error"],
+            world_id=row["world_id"],
+            added_at=row["added_at"],
+            updated_at=row["updated_at"],
+            next_attempt_at=row["next_attempt_at"],
+        )
+
+    @staticmethod
+    def enqueue(owner: str, repo: str) -> bool:
+        """
+        Add a repository to the queue. Finished or failed entries are queued
+        again; returns False if it is already pending or running.
+        """
+        db = get_db()
+        now = datetime.now().isoformat()
+        full_name = f"{owner}/{repo}"
+        cursor = db.execute(
+            """
+            INSERT INTO import_queue (owner, repo, full_name, status, attempts, added_at, updated_at)
+            VALUES (?, ?, ?, 'pending', 0, ?, ?)
+            ON CONFLICT(full_name) DO UPDATE SET status = 'pending', attempts = 0,
+                error = NULL, updated_at = excluded.updated_at, next_attempt_at = NULL
+            WHERE import_queue.status IN ('done', 'failed')
+        """,
+            (owner, repo, full_name, now, now),
+        )
+        db.commit()
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def claim_next() -> Optional[ImportJob]:
+        """
+        Mark the oldest pending job that is due (see requeue) as running and
+        return it.
+        """
+        with get_db().transaction() as db:
+            cursor = db.execute(
+                """
+                SELECT * FROM import_queue WHERE status = 'pending'
+                    AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+                ORDER BY updated_at, id LIMIT 1
+            """,
+                (datetime.now().isoformat(),),
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            job = ImportJobRepository._from_row(row)
+            job.status = "running"
+            job.attempts += 1
+            job.updated_at = datetime.now().isoformat()
+            db.execute(
+                "UPDATE import_queue SET status = ?, attempts = ?, updated_at = ? WHERE id = ?",
+                (job.status, job.attempts, job.updated_at, job.id),
+            )
+        return job
+
+    @staticmethod
+    def finish(job: ImportJob, world_id: Optional[int], error: Optional[str] = None):
+        """Record the outcome of a job."""
+        db = get_db()
+        job.status = "done" if world_id else "failed"
+        job.world_id = world_id
+        job.error = error
+        job.updated_at = datetime.now().isoformat()
+        db.execute(
+            """
+            UPDATE import_queue SET status = ?, world_id = ?, error = ?, updated_at = ?
+            WHERE id = ?
+        """,
+            (job.status, job.world_id, job.error, job.updated_at, job.id),
+        )
+        db.commit()
+
+    @staticmethod
+    def requeue(job: ImportJob, delay: float = 0.0):
+        """
+        Put a job back in the queue (e.g. after a transient failure), to be
+        claimed no sooner than ``delay`` seconds from now.
+        """
+        db = get_db()
+        now = datetime.now()
+        job.status = "pending"
+        job.updated_at = now.isoformat()
+        job.next_attempt_at = (now + timedelta(seconds=delay)).isoformat()
+        db.execute(
+            """
+            UPDATE import_queue SET status = ?, updated_at = ?, next_attempt_at = ?
+            WHERE id = ?
+        """,
+            (job.status, job.updated_at, job.next_attempt_at, job.id),
+        )
+        db.commit()
+
+    @staticmethod
+    def seconds_until_due() -> Optional[float]:
+        """
+        Seconds until the next pending job can be claimed (0 if one can be
+        now), or None if there are no pending jobs.
+        """
+        db = get_db()
+        cursor = db.execute("""
+            SELECT COUNT(*) AS count, MIN(COALESCE(next_attempt_at, '')) AS due
+            FROM import_queue WHERE status = 'pending'
+        """)
+        row = cursor.fetchone()
+        if not row["count"]:
+            return None
+        if not row["due"]:
+            return 0.0
+        delay = datetime.fromisoformat(row["due"]) - datetime.now()
+        return max(delay.total_seconds(), 0.0)
+
+    @staticmethod
+    def reset_running() -> int:
+        """Return jobs interrupted by a shutdown to the queue."""
+        db = get_db()
+        cursor = db.execute(
+            "UPDATE import_queue SET status = 'pending' WHERE status = 'running'"
+        )
+        db.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def get_counts() -> Dict[str, int]:
+        """Get the number of jobs per status."""
+        db = get_db()
+        cursor = db.execute(
+            "SELECT status, COUNT(*) AS count FROM import_queue GROUP BY status"
+        )
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        for row in cursor.fetchall():
+            counts[row["status"]] = row["count"]
+        return counts
+
+    @staticmethod
+    def get_all() -> List[ImportJob]:
+        """Get all jobs in queue order."""
+        db = get_db()
+        cursor = db.execute("SELECT * FROM import_queue ORDER BY id")
+        return [ImportJobRepository._from_row(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def clear_finished() -> int:
+        """Remove completed jobs from the queue."""
+        db = get_db()
+        cursor = db.execute("DELETE FROM import_queue WHERE status = 'done'")
+        db.commit()
+        return cursor.rowcount
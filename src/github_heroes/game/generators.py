@@ -4,14 +4,25 @@ Procedural generation of game content from GitHub data.
 
 import json
 import random
-from typing import List, Optional
-
-from github_heroes.core.config import ENEMY_PREFIXES, ENEMY_SUFFIXES
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from github_heroes.core.config import (
+    COMMIT_BUDGET,
+    ENEMY_PREFIXES,
+    ENEMY_SUFFIXES,
+    FETCH_MAX_WORKERS,
+    ISSUE_QUEST_BUDGET,
+    LIST_MAX_PAGES,
+    PR_QUEST_BUDGET,
+)
 from github_heroes.core.logging_utils import get_logger
-from github_heroes.data.database import get_db
 from github_heroes.data.models import (
     DungeonRoom,
     Enemy,
+    PullRequestData,
     Quest,
     ReadmeFeatures,
     RepoWorld,
@@ -22,24 +33,27 @@ from github_heroes.data.repositories import (
     QuestRepository,
     RepoWorldRepository,
 )
+from github_heroes.game.similarity import get_similarity_index
 from github_heroes.github.analyzers import (
     compute_activity_features,
     compute_issue_difficulty,
     compute_pr_boss_level,
     compute_readme_features,
+    compute_readme_features_batch,
     compute_structure_features,
+    compute_structure_features_batch,
 )
-from github_heroes.github.parsers import (
-    parse_commits,
-    parse_issues,
-    parse_pulls,
-    parse_repo_metadata,
-    parse_tree,
-)
+from github_heroes.github.api_parsers import API_PAGE_PARSERS
+from github_heroes.github.parse_pool import get_parse_pool, parse_page
+from github_heroes.github.parsers import HTML_PAGE_PARSERS
 from github_heroes.github.scraper import GitHubScraper
 
 logger = get_logger(__name__)
 
+# Locks serializing the builds of each world, by lowercased full name
+_world_build_locks: Dict[str, threading.Lock] = {}
+_world_build_locks_lock = threading.Lock()
+
 
 def generate_room_enemy(
     danger_level: int, world_id: int, base_enemy: Optional[Enemy] = None
@@ -366,17 +380,485 @@ def generate_dungeon_rooms(
     return rooms
 
 
-def build_repo_world(
+# PR boss enemies are named "PR #<number>: <title>"
+_PR_BOSS_NAME = re.compile(r"^PR #(\d+):")
+
+# Quests the player has started or finished survive their source going away
+KEPT_QUEST_STATUSES = ("in_progress", "completed")
+
+
+def sync_dungeon_rooms(
+    world_id: int, rooms: List[DungeonRoom], remove_stale: bool = True
+) -> Dict[str, int]:
+    """
+    Bring the stored rooms of a world in line with freshly generated ones.
+
+    Rooms are matched by file path. Matched rooms keep their id, loot quality
+    and visited flag and are only written when their zone or danger level
+    changed; new files become new rooms and, with ``remove_stale``, rooms for
+    files that are gone (and duplicate rows) are deleted.
+
+    Returns:
+        Dict with the number of "created", "updated" and "deleted" rooms.
+    """
+    stored = {}
+    stale_ids = []
+    for room in DungeonRoomRepository.get_by_world_id(world_id):
+        if room.file_path in stored:
+            stale_ids.append(room.id)
+        else:
+            stored[room.file_path] = room
+
+    created, updated, seen = [], [], set()
+    for room in rooms:
+        if room.file_path in seen:
+            continue
+        seen.add(room.file_path)
+        old = stored.pop(room.file_path, None)
+        if old is None:
+            created.append(room)
+            continue
+        room.id = old.id
+        room.loot_quality = old.loot_quality
+        room.visited = old.visited
+        if room != old:
+            updated.append(room)
+
+    if remove_stale:
+        stale_ids.extend(room.id for room in stored.values())
+    else:
+        stale_ids = []
+
+    if created:
+        DungeonRoomRepository.create_many(created)
+    if updated:
+        DungeonRoomRepository.update_many(updated)
+    if stale_ids:
+        DungeonRoomRepository.delete_many(stale_ids)
+    return {
+        "created": len(created),
+        "updated": len(updated),
+        "deleted": len(stale_ids),
+    }
+
+
+class QuestSync:
+    """
+    Diffs the quests of one source type ("issue" or "pr") against the stored
+    ones, batch by batch.
+
+    Quests are matched by source number and keep their id and status; only
+    new quests are inserted and only quests whose title or difficulty changed
+    are updated. ``finish`` deletes quests whose source was not seen again
+    (completed and in-progress ones are kept for the player) and duplicate
+    rows.
+    """
+
+    def __init__(self, stored_quests: Iterable[Quest], source_type: str):
+        self.source_type = source_type
+        self.stored: Dict[int, Quest] = {}
+        self.duplicate_ids: List[int] = []
+        self.seen = set()
+        for quest in stored_quests:
+            if quest.source_type != source_type:
+                continue
+            kept = self.stored.get(quest.source_number)
+            if kept is None:
+                self.stored[quest.source_number] = quest
+            elif self._progress(quest) > self._progress(kept):
+                self.stored[quest.source_number] = quest
+                self.duplicate_ids.append(kept.id)
+            else:
+                self.duplicate_ids.append(quest.id)
+
+    @staticmethod
+    def _progress(quest: Quest) -> int:
+        """How far the player got with a quest: 0 new, 1 started, 2 completed."""
+        if quest.status in KEPT_QUEST_STATUSES:
+            return KEPT_QUEST_STATUSES.index(quest.status) + 1
+        return 0
+
+    def apply(self, quests: List[Quest]) -> List[Quest]:
+        """Store a batch of generated quests, returning them with ids and status."""
+        created, updated = [], []
+        for quest in quests:
+            self.seen.add(quest.source_number)
+            old = self.stored.get(quest.source_number)
+            if old is None:
+                created.append(quest)
+                continue
+            quest.id = old.id
+            quest.status = old.status
+            if quest != old:
+                updated.append(quest)
+        if created:
+            QuestRepository.create_many(created)
+        if updated:
+            QuestRepository.update_many(updated)
+        return quests
+
+    def finish(self, remove_stale: bool = True) -> List[int]:
+        """Delete stale and duplicate quests; returns the deleted source numbers."""
+        stale = [
+            quest
+            for number, quest in self.stored.items()
+            if number not in self.seen and quest.status not in KEPT_QUEST_STATUSES
+        ]
+        if not remove_stale:
+            stale = []
+        deleted_ids = self.duplicate_ids + [quest.id for quest in stale]
+        if deleted_ids:
+            QuestRepository.delete_many(deleted_ids)
+        return [quest.source_number for quest in stale]
+
+
+def sync_enemies(
+    world: RepoWorld,
+    main_enemy: Enemy,
+    bosses: List[Enemy],
+    remove_stale_bosses: bool = True,
+) -> Enemy:
+    """
+    Store the main enemy and PR bosses of a world, reusing existing rows.
+
+    The main enemy replaces the world's current one in place, PR bosses are
+    matched by the PR number in their name, and only enemies whose stats
+    changed are written. Bosses for PRs that were not seen again (when
+    ``remove_stale_bosses``), duplicate bosses and main enemies left behind
+    by earlier builds are deleted.
+
+    Returns:
+        The stored main enemy.
+    """
+    stored_bosses: Dict[int, Enemy] = {}
+    stale_ids = []
+    old_main = None
+    for enemy in EnemyRepository.get_by_world_id(world.id):
+        match = _PR_BOSS_NAME.match(enemy.name) if enemy.is_boss else None
+        if enemy.id == world.main_enemy_id:
+            old_main = enemy
+        elif match and int(match.group(1)) not in stored_bosses:
+            stored_bosses[int(match.group(1))] = enemy
+        else:
+            stale_ids.append(enemy.id)
+
+    created, updated = [], []
+    for enemy, old in [(main_enemy, old_main)] + [
+        (boss, stored_bosses.pop(int(_PR_BOSS_NAME.match(boss.name).group(1)), None))
+        for boss in bosses
+    ]:
+        if old is None:
+            created.append(enemy)
+            continue
+        enemy.id = old.id
+        if enemy != old:
+            updated.append(enemy)
+
+    if remove_stale_bosses:
+        stale_ids.extend(boss.id for boss in stored_bosses.values())
+
+    if created:
+        EnemyRepository.create_many(created)
+    if updated:
+        EnemyRepository.update_many(updated)
+    if stale_ids:
+        EnemyRepository.delete_many(stale_ids)
+    return main_enemy
+
+
+# Human readable names for the pages fetched while building a world
+_PAGE_LABELS = {
+    "home": "repository information",
+    "branch": "default branch",
+    "readme": "README",
+    "tree": "repository structure",
+    "commits": "commit history",
+    "issues": "issues",
+    "pulls": "pull requests",
+}
+
+
+def get_page_parsers(scraper: GitHubScraper) -> Dict[str, Callable]:
+    """
+    Get the page name -> parser mapping matching the scraper's backend.
+    """
+    return API_PAGE_PARSERS if scraper.backend == "api" else HTML_PAGE_PARSERS
+
+
+def fetch_repo_pages(
     owner: str, repo: str, scraper: GitHubScraper, progress_callback=None
+) -> Dict[str, Any]:
+    """
+    Fetch every raw page needed to build a world, issuing requests concurrently.
+
+    Pages that do not depend on anything (home, issues, pulls) are requested
+    at once. Branch-dependent pages (README, tree, commits) are requested as
+    soon as the default branch is known: immediately if it is cached,
+    otherwise from the fetched home page, falling back to branch detection.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        scraper: GitHub scraper instance
+        progress_callback: Optional callback function(value: int, status: str),
+            always invoked from the calling thread
+
+    Returns:
+        Dict mapping page name ("home", "readme", "commits", "issues", "pulls",
+        "branch") to its raw content, plus "tree" to the list of TreeEntry
+        items; values are None when they could not be fetched.
+    """
+    pages: Dict[str, Any] = {name: None for name in _PAGE_LABELS}
+    fetchers = scraper.page_fetchers()
+    page_parsers = get_page_parsers(scraper)
+    completed = 0
+
+    with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(fetchers[page_name], owner, repo): page_name
+            for page_name in ("home", "issues", "pulls")
+        }
+        pending = set(futures)
+
+        def submit_branch_pages(branch: str):
+            """Queue the pages that need the default branch."""
+            for page_name in ("readme", "tree", "commits"):
+                future = executor.submit(fetchers[page_name], owner, repo, branch)
+                futures[future] = page_name
+                pending.add(future)
+
+        def complete(name: str):
+            """Report progress for a finished page."""
+            nonlocal completed
+            completed += 1
+            if progress_callback:
+                progress_callback(
+                    10 + completed * 50 // len(_PAGE_LABELS),
+                    f"Fetched {_PAGE_LABELS[name]}...",
+                )
+
+        pages["branch"] = scraper.get_known_branch(owner, repo)
+        if pages["branch"]:
+            submit_branch_pages(pages["branch"])
+            complete("branch")
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    pages[name] = future.result()
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to fetch {_PAGE_LABELS[name]} for {owner}/{repo}: {e}"
+                    )
+
+                if name == "home" and not pages["branch"]:
+                    # Learn the branch from the page we already have
+                    branch = (
+                        page_parsers["branch"](pages["home"]) if pages["home"] else None
+                    )
+                    if branch:
+                        scraper.remember_branch(owner, repo, branch)
+                        pages["branch"] = branch
+                        submit_branch_pages(branch)
+                        complete("branch")
+                    else:
+                        future = executor.submit(scraper.detect_branch, owner, repo)
+                        futures[future] = "branch"
+                        pending.add(future)
+                elif name == "branch" and pages["branch"]:
+                    submit_branch_pages(pages["branch"])
+
+                complete(name)
+
+    return pages
+
+
+class PagedList:
+    """
+    A paginated list (issues, pull requests or commits) whose first page has
+    already been fetched and parsed.
+
+    Creating the list immediately requests, in parallel, as many follow-up
+    pages as are needed to fill ``budget``, judging by how full the first
+    page is; each page is parsed as soon as it arrives. ``batches`` then
+    yields the new items of each page in page order and stops at the budget,
+    at the first short page, or at a page that repeats earlier items; pages
+    that are no longer needed are cancelled.
+
+    Whether a page is full is judged by ``entries(raw, items)``, the number
+    of entries GitHub sent, which can exceed the parsed items (the API's
+    issue pages also hold pull requests); by default the parsed items.
+
+    After ``batches`` is exhausted, ``complete`` tells whether the whole list
+    was read: it is false when the budget or ``max_pages`` cut the list short
+    or a page could not be fetched.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        fetch_page: Callable[[int], Optional[str]],
+        parse: Callable[[str], List],
+        first_raw: Optional[str],
+        first_items: List,
+        page_size: int,
+        budget: int,
+        key: Callable[[Any], Any],
+        max_pages: int = LIST_MAX_PAGES,
+        entries: Optional[Callable[[str, List], int]] = None,
+    ):
+        self.fetch_page = fetch_page
+        self.parse = parse
+        self.page_size = page_size
+        self.budget = budget
+        self.key = key
+        self.entries = entries or (lambda raw, items: len(items))
+        self.complete = False
+        self.first_page = (
+            (first_items, self.entries(first_raw, first_items)) if first_raw else None
+        )
+        self.futures = []
+        if (
+            self.first_page
+            and self.first_page[1] >= page_size
+            and len(first_items) < budget
+        ):
+            per_page = max(len(first_items), 1)
+            wanted = min(max_pages, -(-budget // per_page))
+            self.futures = [
+                executor.submit(self._fetch_page, page) for page in range(2, wanted + 1)
+            ]
+
+    def _fetch_page(self, page: int) -> Optional[Tuple[List, int]]:
+        """Fetch and parse a page: its items and number of entries, if any."""
+        raw = self.fetch_page(page)
+        if not raw:
+            return None
+        items = self.parse(raw)
+        return items, self.entries(raw, items)
+
+    def batches(self) -> Iterator[List]:
+        """Yield the new items of each page, at most ``budget`` in total."""
+        seen = set()
+        remaining = self.budget
+        self.complete = False
+        try:
+            for page in range(len(self.futures) + 1):
+                fetched = self.futures[page - 1].result() if page else self.first_page
+                if fetched is None:
+                    return  # The page could not be fetched
+                items, entries = fetched
+                new_items = []
+                for item in items:
+                    if self.key(item) not in seen:
+                        seen.add(self.key(item))
+                        new_items.append(item)
+                if items and not new_items:
+                    self.complete = True  # The page repeats earlier ones
+                    return
+                batch = new_items[:remaining]
+                remaining -= len(batch)
+                if batch:
+                    yield batch
+                if len(batch) < len(new_items):
+                    return  # Cut short by the budget
+                if entries < self.page_size:
+                    self.complete = True
+                    return
+                if remaining <= 0:
+                    return
+        finally:
+            for future in self.futures:
+                future.cancel()
+
+    def items(self) -> List:
+        """All items, up to the budget."""
+        return [item for batch in self.batches() for item in batch]
+
+
+def add_pull_details(
+    scraper: GitHubScraper,
+    executor: Executor,
+    owner: str,
+    repo: str,
+    pulls: List[PullRequestData],
+):
+    """
+    Fill in the comment and diff counts of pull requests listed by the API
+    backend, whose list pages lack them, fetching each pull request on
+    ``executor``. Pull requests whose details can't be fetched keep the
+    counts of the list.
+    """
+    parse_pool = get_parse_pool()
+
+    def fetch_details(pr: PullRequestData) -> Optional[PullRequestData]:
+        raw = scraper.fetch_pull_json(owner, repo, pr.pr_number)
+        return parse_pool.parse("api", "pull", raw) if raw else None
+
+    for pr, details in zip(pulls, executor.map(fetch_details, pulls)):
+        if details is not None:
+            pr.comment_count = details.comment_count
+            pr.additions = details.additions
+            pr.deletions = details.deletions
+
+
+def _world_build_lock(full_name: str) -> threading.Lock:
+    """The lock serializing builds of a world."""
+    with _world_build_locks_lock:
+        return _world_build_locks.setdefault(full_name.lower(), threading.Lock())
+
+
+def analyze_pages_batch(page_sets: List[Dict[str, Any]]):
+    """
+    Compute the README and structure features of several repositories at
+    once, from their pages as returned by fetch_repo_pages, and add them to
+    the pages as "readme_features" and "structure_features" (see
+    build_repo_world). The batch analysis runs in a parser process.
+    """
+    parse_pool = get_parse_pool()
+    jobs = {
+        "readme": (
+            compute_readme_features_batch,
+            [pages["readme"] for pages in page_sets],
+        ),
+        "structure": (
+            compute_structure_features_batch,
+            [pages["tree"] or [] for pages in page_sets],
+        ),
+    }
+    futures = {name: parse_pool.submit(*job) for name, job in jobs.items()}
+    results = {
+        name: parse_pool.result(futures[name], *job) for name, job in jobs.items()
+    }
+    for pages, readme_features, structure_features in zip(
+        page_sets, results["readme"], results["structure"]
+    ):
+        pages["readme_features"] = readme_features
+        pages["structure_features"] = structure_features
+
+
+def build_repo_world(
+    owner: str,
+    repo: str,
+    scraper: GitHubScraper,
+    progress_callback=None,
+    pages: Optional[Dict[str, Any]] = None,
 ) -> Optional[RepoWorld]:
     """
     Build a complete RepoWorld from GitHub repository.
 
+    Builds of the same repository (e.g. a manual one and a background
+    refresh) run one after the other.
+
     Args:
         owner: Repository owner
         repo: Repository name
         scraper: GitHub scraper instance
         progress_callback: Optional callback function(value: int, status: str) for progress updates
+        pages: Pages already fetched by fetch_repo_pages, possibly with
+            features from analyze_pages_batch; fetched here if None
     """
 
     def update_progress(value: int, status: str):
@@ -384,6 +866,25 @@ def build_repo_world(
         if progress_callback:
             progress_callback(value, status)
 
+    lock = _world_build_lock(f"{owner}/{repo}")
+    if not lock.acquire(blocking=False):
+        update_progress(2, "Waiting for another update of this repository...")
+        lock.acquire()
+    try:
+        return _build_repo_world(owner, repo, scraper, update_progress, pages)
+    finally:
+        lock.release()
+
+
+def _build_repo_world(
+    owner: str,
+    repo: str,
+    scraper: GitHubScraper,
+    update_progress: Callable[[int, str], None],
+    pages: Optional[Dict[str, Any]] = None,
+) -> Optional[RepoWorld]:
+    """Build a RepoWorld; the caller holds the world's build lock."""
+    list_executor = None
     try:
         logger.info(f"Building repo world for {owner}/{repo}")
 
@@ -393,42 +894,101 @@ def build_repo_world(
         full_name = f"{owner}/{repo}"
         existing_world = RepoWorldRepository.get_by_full_name(full_name)
 
-        # Process data
-        update_progress(10, "Fetching repository information...")
-        repo_html = scraper.fetch_repo_home(owner, repo)
+        # Fetch all pages concurrently
+        if pages is None:
+            update_progress(10, "Fetching repository data...")
+            pages = fetch_repo_pages(owner, repo, scraper, update_progress)
+
+        repo_html = pages["home"]
         if not repo_html:
             logger.error(f"Failed to fetch repo home for {owner}/{repo}")
             return None
 
-        update_progress(20, "Parsing repository metadata...")
-        repo_meta = parse_repo_metadata(repo_html)
+        # Parse the fetched pages and analyze the README in parser processes.
+        # The README is analyzed once it has downloaded rather than fed to a
+        # ReadmeAnalyzer as it streams in: that would overlap the download,
+        # but run the analysis in this (GUI) process, and the whole body is
+        # kept anyway for the response cache.
+        update_progress(60, "Parsing repository metadata...")
+        parse_pool = get_parse_pool()
+        parse_jobs = {
+            name: (parse_page, scraper.backend, name, pages[name])
+            for name in ("home", "commits", "issues", "pulls")
+            if pages[name]
+        }
+        parse_futures = {
+            name: parse_pool.submit(*job, cache_kind=name)
+            for name, job in parse_jobs.items()
+        }
+        readme_features = pages.get("readme_features")
+        if readme_features is None and pages["readme"]:
+            parse_jobs["readme"] = (compute_readme_features, pages["readme"])
+            parse_futures["readme"] = parse_pool.submit(*parse_jobs["readme"])
+
+        def parsed(name: str, default=None):
+            """Wait for the parse result of a page."""
+            if name not in parse_futures:
+                return default
+            return parse_pool.result(parse_futures[name], *parse_jobs[name])
+
+        repo_meta = parsed("home")
         if not repo_meta:
             logger.error(f"Failed to parse repo metadata for {owner}/{repo}")
             return None
 
-        # Fetch README
-        update_progress(30, "Fetching README...")
-        readme_text = scraper.fetch_readme(owner, repo)
-        update_progress(40, "Analyzing README features...")
-        readme_features = (
-            compute_readme_features(readme_text) if readme_text else ReadmeFeatures()
+        update_progress(62, "Analyzing README features...")
+        if readme_features is None:
+            readme_features = parsed("readme", ReadmeFeatures())
+
+        update_progress(64, "Parsing file structure...")
+        tree_entries = pages["tree"] or []
+        structure_features = pages.get("structure_features")
+        if structure_features is None:
+            structure_features = compute_structure_features(tree_entries)
+
+        # Request the remaining pages of every list at once, then consume them
+        update_progress(66, "Parsing commit history...")
+        fetchers = scraper.page_fetchers()
+        list_executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS)
+        branch = pages["branch"]
+        commit_list = PagedList(
+            list_executor,
+            lambda page: fetchers["commits"](owner, repo, branch, page),
+            lambda raw: parse_pool.parse(scraper.backend, "commits", raw),
+            pages["commits"],
+            parsed("commits", []),
+            scraper.list_page_size("commits"),
+            COMMIT_BUDGET,
+            key=lambda commit: commit.short_hash,
+            entries=scraper.list_page_entries,
         )
-
-        # Fetch tree
-        update_progress(50, "Fetching repository structure...")
-        tree_html = scraper.fetch_tree_html(owner, repo)
-        update_progress(55, "Parsing file structure...")
-        tree_entries = parse_tree(tree_html) if tree_html else []
-        structure_features = compute_structure_features(tree_entries)
-
-        # Fetch commits
-        update_progress(60, "Fetching commit history...")
-        commits_html = scraper.fetch_commits_html(owner, repo)
-        commits = parse_commits(commits_html) if commits_html else []
+        issue_list = PagedList(
+            list_executor,
+            lambda page: fetchers["issues"](owner, repo, page),
+            lambda raw: parse_pool.parse(scraper.backend, "issues", raw),
+            pages["issues"],
+            parsed("issues", []),
+            scraper.list_page_size("issues"),
+            ISSUE_QUEST_BUDGET,
+            key=lambda issue: issue.issue_number,
+            entries=scraper.list_page_entries,
+        )
+        pull_list = PagedList(
+            list_executor,
+            lambda page: fetchers["pulls"](owner, repo, page),
+            lambda raw: parse_pool.parse(scraper.backend, "pulls", raw),
+            pages["pulls"],
+            parsed("pulls", []),
+            scraper.list_page_size("pulls"),
+            PR_QUEST_BUDGET,
+            key=lambda pr: pr.pr_number,
+            entries=scraper.list_page_entries,
+        )
+        commits = commit_list.items()
         activity_features = compute_activity_features(commits, repo_meta)
 
         # Create or update RepoWorld
-        update_progress(65, "Creating repository world...")
+        update_progress(68, "Creating repository world...")
         if existing_world:
             world = existing_world
             world.stars = repo_meta.stars
@@ -439,8 +999,6 @@ def build_repo_world(
             world.health_state = activity_features["health_state"]
             world.readme_features_json = json.dumps(readme_features.__dict__)
             world.structure_features_json = json.dumps(structure_features)
-            world.last_scraped_at = None  # Will be set by update
-            RepoWorldRepository.update(world)
         else:
             world = RepoWorld(
                 owner=owner,
@@ -457,8 +1015,42 @@ def build_repo_world(
             )
             world = RepoWorldRepository.create(world)
 
+        # Generate dungeon rooms; an existing world only gets the differences
+        update_progress(75, "Generating dungeon rooms...")
+        rooms = generate_dungeon_rooms(
+            tree_entries, world.id, world.stars, world.health_state or "Unknown"
+        )
+        # An empty tree means the structure could not be fetched
+        room_changes = sync_dungeon_rooms(
+            world.id, rooms, remove_stale=bool(tree_entries)
+        )
+        logger.debug(f"Dungeon rooms for {full_name}: {room_changes}")
+
+        # Generate quests from issues, one batch per page
+        update_progress(88, "Processing issues...")
+        stored_quests = QuestRepository.get_by_world_id(world.id)
+        issue_sync = QuestSync(stored_quests, "issue")
+        issue_count = 0
+        for issues in issue_list.batches():
+            issue_sync.apply(
+                [
+                    Quest(
+                        world_id=world.id,
+                        source_type="issue",
+                        source_number=issue.issue_number,
+                        title=issue.title,
+                        difficulty=compute_issue_difficulty(issue),
+                        status="new",
+                    )
+                    for issue in issues
+                ]
+            )
+            issue_count += len(issues)
+            update_progress(88, f"Processed {issue_count} issues...")
+        issue_sync.finish(remove_stale=issue_list.complete)
+
         # Generate main enemy
-        update_progress(70, "Generating main enemy...")
+        update_progress(92, "Generating main enemy...")
         main_enemy = generate_enemy_from_readme(
             readme_features,
             world.id,
@@ -468,69 +1060,20 @@ def build_repo_world(
             total_files=structure_features.get("total_files", 0),
             commit_count=len(commits),
         )
-        main_enemy = EnemyRepository.create(main_enemy)
-        world.main_enemy_id = main_enemy.id
-        RepoWorldRepository.update(world)
-
-        # Generate dungeon rooms
-        update_progress(75, "Generating dungeon rooms...")
-
-        # Delete existing rooms for this world if refreshing
-        if existing_world:
-            existing_rooms = DungeonRoomRepository.get_by_world_id(world.id)
-            db = get_db()
-            for old_room in existing_rooms:
-                db.execute("DELETE FROM dungeon_rooms WHERE id = ?", (old_room.id,))
-            db.commit()
-
-        rooms = generate_dungeon_rooms(
-            tree_entries, world.id, world.stars, world.health_state or "Unknown"
-        )
-
-        # Deduplicate rooms by file_path before creating
-        seen_paths = {}
-        unique_rooms = []
-        for room in rooms:
-            if room.file_path not in seen_paths:
-                seen_paths[room.file_path] = room
-                unique_rooms.append(room)
-
-        for i, room in enumerate(unique_rooms):
-            DungeonRoomRepository.create(room)
-            if i % 10 == 0 and progress_callback and len(unique_rooms) > 0:
-                progress_callback(
-                    75 + (i * 5 // len(unique_rooms)),
-                    f"Creating room {i + 1}/{len(unique_rooms)}...",
-                )
 
-        # Fetch and generate quests from issues
-        update_progress(85, "Fetching issues...")
-        issues_html = scraper.fetch_issues_html(owner, repo)
-        if issues_html:
-            update_progress(88, "Processing issues...")
-            issues = parse_issues(issues_html)
-            for issue in issues[:20]:  # Limit to first 20 issues
-                quest = Quest(
-                    world_id=world.id,
-                    source_type="issue",
-                    source_number=issue.issue_number,
-                    title=issue.title,
-                    difficulty=compute_issue_difficulty(issue),
-                    status="new",
-                )
-                QuestRepository.create(quest)
-
-        # Fetch and generate boss quests from PRs
-        update_progress(92, "Fetching pull requests...")
-        pulls_html = scraper.fetch_pulls_html(owner, repo)
-        if pulls_html:
-            update_progress(95, "Processing pull requests...")
-            pulls = parse_pulls(pulls_html)
-            # Use main enemy level as base for PR boss scaling
-            base_repo_level = main_enemy.level
-            for pr in pulls[:10]:  # Limit to first 10 PRs
+        # Generate boss quests from PRs
+        update_progress(95, "Processing pull requests...")
+        # Use main enemy level as base for PR boss scaling
+        base_repo_level = main_enemy.level
+        pr_sync = QuestSync(stored_quests, "pr")
+        bosses = []
+        for pulls in pull_list.batches():
+            if scraper.backend == "api":
+                add_pull_details(scraper, list_executor, owner, repo, pulls)
+            quests = []
+            for pr in pulls:
                 pr_level = compute_pr_boss_level(pr, base_repo_level)
-                # Create boss enemy for PR
+                # Boss enemy for PR
                 boss = Enemy(
                     world_id=world.id,
                     name=f"PR #{pr.pr_number}: {pr.title[:30]}",
@@ -542,18 +1085,31 @@ def build_repo_world(
                     is_boss=True,
                 )
                 boss.set_tags(["pull-request", "boss"])
-                boss = EnemyRepository.create(boss)
+                bosses.append(boss)
 
                 # Create quest
-                quest = Quest(
-                    world_id=world.id,
-                    source_type="pr",
-                    source_number=pr.pr_number,
-                    title=pr.title,
-                    difficulty=pr_level,
-                    status="new",
+                quests.append(
+                    Quest(
+                        world_id=world.id,
+                        source_type="pr",
+                        source_number=pr.pr_number,
+                        title=pr.title,
+                        difficulty=pr_level,
+                        status="new",
+                    )
                 )
-                QuestRepository.create(quest)
+            pr_sync.apply(quests)
+        # A truncated or partly failed list says nothing about unseen PRs
+        pr_sync.finish(remove_stale=pull_list.complete)
+
+        main_enemy = sync_enemies(
+            world, main_enemy, bosses, remove_stale_bosses=pull_list.complete
+        )
+        world.main_enemy_id = main_enemy.id
+        RepoWorldRepository.update(world)
+        get_similarity_index().update_world(
+            world.id, readme_features.__dict__, structure_features
+        )
 
         update_progress(100, "Complete!")
         logger.info(f"Successfully built repo world for {full_name}")
@@ -564,3 +1120,6 @@ def build_repo_world(
             f"Error building repo world for {owner}/{repo}: {e}", exc_info=True
         )
         return None
+    finally:
+        if list_executor:
+            list_executor.shutdown(wait=False, cancel_futures=True)
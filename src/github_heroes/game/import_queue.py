@@ -0,0 +1,179 @@
+"""
+Bulk repository import queue.
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from github_heroes.core.config import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_MAX_ATTEMPTS,
+    IMPORT_RETRY_DELAY,
+    IMPORT_WORKERS,
+)
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.models import ImportJob
+from github_heroes.data.repositories import ImportJobRepository
+from github_heroes.game.generators import (
+    analyze_pages_batch,
+    build_repo_world,
+    fetch_repo_pages,
+)
+from github_heroes.github.scraper import GitHubScraper
+
+logger = get_logger(__name__)
+
+# "owner/repo", optionally as a github.com URL and with a trailing .git
+_REPO_NAME_PATTERN = re.compile(
+    r"^(?:https?://)?(?:www\.)?(?:github\.com/)?([\w.-]+)/([\w.-]+?)(?:\.git)?/?$"
+)
+
+
+def parse_repo_names(text: str) -> List[Tuple[str, str]]:
+    """
+    Parse repository names, one per line. Blank lines and lines starting with
+    "#" are ignored, duplicates are dropped.
+    """
+    names = []
+    seen = set()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _REPO_NAME_PATTERN.match(line)
+        if not match:
+            logger.warning(f"Ignoring invalid repository name: {line}")
+            continue
+        owner, repo = match.groups()
+        if (owner.lower(), repo.lower()) not in seen:
+            seen.add((owner.lower(), repo.lower()))
+            names.append((owner, repo))
+    return names
+
+
+def enqueue_repos(names: List[Tuple[str, str]]) -> int:
+    """Add repositories to the import queue, returning how many were added."""
+    return sum(1 for owner, repo in names if ImportJobRepository.enqueue(owner, repo))
+
+
+class ImportQueue:
+    """
+    Runs queued imports on a pool of workers.
+
+    The queue lives in the ``import_queue`` table, so jobs left pending or
+    interrupted by a shutdown are picked up again by the next run. All
+    workers share one scraper and therefore the process-wide request
+    scheduler, which keeps the import rate within GitHub's limits.
+
+    Jobs are processed in rounds of up to IMPORT_BATCH_SIZE: the pages of
+    all of them are fetched, their READMEs and file trees analyzed in one
+    batch (see analyze_pages_batch), then their worlds built. A round waits
+    for its slowest repository, but the analysis is done once per round.
+    """
+
+    def __init__(
+        self,
+        scraper: GitHubScraper,
+        workers: int = IMPORT_WORKERS,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ):
+        self.scraper = scraper
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Ask the queue to stop once the current round of jobs is done."""
+        self._stop.set()
+
+    def _claim_batch(self) -> List[ImportJob]:
+        """Claim up to ``batch_size`` due jobs."""
+        jobs = []
+        while len(jobs) < self.batch_size:
+            job = ImportJobRepository.claim_next()
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+
+    def run(self, progress_callback: Optional[Callable[[dict], None]] = None):
+        """
+        Process the queue until it is empty or ``stop`` is called.
+
+        Args:
+            progress_callback: Optional callback receiving a dict with the job
+                counts per status plus "current" (full name of the job that
+                just started or finished); called from worker threads.
+        """
+        self._stop.clear()
+        ImportJobRepository.reset_running()
+
+        def report(current: str):
+            if progress_callback:
+                counts = ImportJobRepository.get_counts()
+                counts["current"] = current
+                progress_callback(counts)
+
+        def fetch(job: ImportJob) -> Optional[Dict[str, Any]]:
+            report(job.full_name)
+            try:
+                return fetch_repo_pages(job.owner, job.repo, self.scraper)
+            except Exception as e:
+                logger.error(f"Error fetching {job.full_name}: {e}", exc_info=True)
+                return None
+
+        def build(job: ImportJob, pages: Optional[Dict[str, Any]]):
+            world, error = None, "Failed to fetch repository"
+            if pages is not None:
+                try:
+                    world = build_repo_world(
+                        job.owner, job.repo, self.scraper, pages=pages
+                    )
+                    error = None if world else "Failed to build world"
+                except Exception as e:
+                    logger.error(f"Error importing {job.full_name}: {e}", exc_info=True)
+                    error = str(e)
+
+            if world is None and job.attempts < IMPORT_MAX_ATTEMPTS:
+                delay = IMPORT_RETRY_DELAY * 2 ** (job.attempts - 1)
+                logger.info(f"Retrying {job.full_name} in {delay:.0f}s")
+                ImportJobRepository.requeue(job, delay)
+            else:
+                ImportJobRepository.finish(job, world.id if world else None, error)
+            report(job.full_name)
+
+        logger.info(f"Import queue started with {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set():
+                jobs = self._claim_batch()
+                if not jobs:
+                    # Wait for failed jobs to become due again
+                    delay = ImportJobRepository.seconds_until_due()
+                    if delay is None:
+                        break
+                    self._stop.wait(delay)
+                    continue
+
+                page_sets = list(executor.map(fetch, jobs))
+                fetched = [pages for pages in page_sets if pages and pages["home"]]
+                if fetched:
+                    try:
+                        analyze_pages_batch(fetched)
+                    except Exception as e:
+                        # Each build then analyzes its own pages
+                        logger.error(f"Batch analysis failed: {e}", exc_info=True)
+
+                futures = {
+                    executor.submit(build, job, pages): job
+                    for job, pages in zip(jobs, page_sets)
+                }
+                for future, job in futures.items():
+                    error = future.exception()
+                    if error is not None:
+                        logger.error(
+                            f"Import of {job.full_name} failed: {error}",
+                            exc_info=(type(error), error, error.__traceback__),
+                        )
+        logger.info("Import queue finished")
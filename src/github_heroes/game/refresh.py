@@ -0,0 +1,131 @@
+"""
+Background refresh of stale repository worlds.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from github_heroes.core.config import (
+    REFRESH_BATCH_SIZE,
+    REFRESH_CHECK_INTERVAL,
+    REFRESH_MAX_AGE_HOURS,
+    REFRESH_WORKERS,
+)
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.models import RepoWorld
+from github_heroes.data.repositories import RepoWorldRepository
+from github_heroes.game.generators import build_repo_world
+from github_heroes.game.state import get_game_state
+from github_heroes.github.scraper import get_scraper
+
+logger = get_logger(__name__)
+
+
+class RefreshScheduler:
+    """
+    Decides which worlds to refresh and refreshes them on a worker pool.
+
+    A world is due once its data is within one check interval of
+    ``max_age_hours``, so that periodic passes refresh it before it gets too
+    old. Worlds asked for with ``prioritize`` (e.g. a dungeon the player just
+    entered) go first, then recently visited worlds, then the rest by age.
+    The world the player is fighting in is left alone until the fight ends.
+    """
+
+    def __init__(
+        self,
+        max_age_hours: float = REFRESH_MAX_AGE_HOURS,
+        workers: int = REFRESH_WORKERS,
+        batch_size: int = REFRESH_BATCH_SIZE,
+        check_interval: int = REFRESH_CHECK_INTERVAL,
+    ):
+        self.max_age_hours = max_age_hours
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.check_interval = check_interval
+        self._priority: List[int] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def is_stale(self, world: RepoWorld) -> bool:
+        """Check whether a world's data is due for a refresh."""
+        return not world.last_scraped_at or world.last_scraped_at < self._due_before()
+
+    def prioritize(self, world_id: int):
+        """Refresh a world ahead of the others in the next pass."""
+        with self._lock:
+            if world_id in self._priority:
+                self._priority.remove(world_id)
+            self._priority.insert(0, world_id)
+
+    def stop(self):
+        """Ask a running pass to stop after the refreshes in progress."""
+        self._stop.set()
+
+    def due_worlds(self) -> List[RepoWorld]:
+        """Worlds to refresh in the next pass, in priority order."""
+        with self._lock:
+            priority_ids, self._priority = self._priority, []
+
+        worlds = []
+        for world_id in priority_ids:
+            world = RepoWorldRepository.get_by_id(world_id)
+            if world and self.is_stale(world):
+                worlds.append(world)
+
+        seen = {world.id for world in worlds}
+        for world in RepoWorldRepository.get_stale(self._due_before(), self.batch_size):
+            if world.id not in seen:
+                worlds.append(world)
+        return worlds[: self.batch_size]
+
+    def run_once(self, on_refreshed: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Refresh the worlds that are due, returning how many were refreshed.
+
+        Args:
+            on_refreshed: Optional callback receiving the id of each refreshed
+                world; called from worker threads.
+        """
+        self._stop.clear()
+        worlds = self.due_worlds()
+        if not worlds:
+            return 0
+
+        refreshed = 0
+        refreshed_lock = threading.Lock()
+
+        def refresh(world: RepoWorld):
+            nonlocal refreshed
+            if self._stop.is_set() or self._in_combat(world):
+                return
+            logger.info(f"Refreshing stale world {world.full_name}")
+            if build_repo_world(world.owner, world.repo, get_scraper()):
+                with refreshed_lock:
+                    refreshed += 1
+                if on_refreshed:
+                    on_refreshed(world.id)
+
+        logger.info(f"Background refresh of {len(worlds)} worlds")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(refresh, worlds))
+        return refreshed
+
+    def _due_before(self) -> str:
+        """Timestamp before which world data counts as stale."""
+        age = timedelta(hours=self.max_age_hours) - timedelta(
+            seconds=self.check_interval
+        )
+        return (datetime.now() - max(age, timedelta(0))).isoformat()
+
+    @staticmethod
+    def _in_combat(world: RepoWorld) -> bool:
+        """Check whether the player is fighting inside a world."""
+        state = get_game_state()
+        return bool(
+            state.in_combat
+            and state.current_room
+            and state.current_room.world_id == world.id
+        )
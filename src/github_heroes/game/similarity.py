@@ -0,0 +1,242 @@
+"""
+Similarity index of repo worlds, for finding related dungeons.
+"""
+
+import hashlib
+import json
+import operator
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from github_heroes.core.config import (
+    RELATED_WORLDS_COUNT,
+    SIMILARITY_BANDS,
+    SIMILARITY_HASHES,
+)
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.repositories import (
+    RepoWorldRepository,
+    WorldSignatureRepository,
+)
+
+logger = get_logger(__name__)
+
+# Bump when the tokens or hashing change, so stored signatures are rebuilt
+SIGNATURE_VERSION = 1
+
+_HASHES_PER_DIGEST = 16  # 32-bit words in a 64-byte BLAKE2b digest
+# Words most READMEs share, which say nothing about what a project is
+_STOP_WORDS = frozenset("""
+    a about all also an and any are as at be but by can com do for from get
+    github has have how http https if in into is it its more may must new no
+    not of on one or org our see so some such that the their then there these
+    this to true false use used uses using via want was we when which will
+    with www you your
+    """.split())
+# File count classes of an extension are capped, so a huge folder of one
+# file type doesn't drown out everything else
+_MAX_EXTENSION_WEIGHT = 8
+
+
+def world_tokens(readme_features: Dict, structure_features: Dict) -> Set[str]:
+    """
+    The token set a world is compared by: its most frequent README words
+    (except stop words and numbers), the keyword groups its README hits, and
+    its file extensions, each once per doubling of its file count (a coarse
+    extension histogram).
+    """
+    tokens = {
+        f"word:{word}"
+        for word in readme_features.get("word_frequencies", {})
+        if word not in _STOP_WORDS and not word.isdigit()
+    }
+    tokens.update(
+        f"topic:{group}"
+        for group, hits in readme_features.get("keyword_hits", {}).items()
+        if hits
+    )
+    for extension, count in structure_features.get("files_by_extension", {}).items():
+        weight = min(int(count).bit_length(), _MAX_EXTENSION_WEIGHT)
+        tokens.update(f"ext:{extension}:{level}" for level in range(weight))
+    return tokens
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures: for each of ``hashes`` hash functions, the
+    smallest hash of any token. The fraction of equal positions in two
+    signatures estimates the Jaccard similarity of the token sets.
+
+    The hash functions are the 32-bit words of salted BLAKE2b digests of a
+    token (16 per digest), which are stable across runs, unlike hash().
+    """
+
+    def __init__(self, hashes: int = SIMILARITY_HASHES):
+        self.hashes = hashes
+        self.salts = [
+            f"minhash{index}".encode("ascii")
+            for index in range(-(-hashes // _HASHES_PER_DIGEST))
+        ]
+        self.scheme = f"minhash-v{SIGNATURE_VERSION}-{hashes}"
+
+    def token_hashes(self, token: str) -> array:
+        """The ``hashes`` hash values of a token."""
+        data = token.encode("utf-8")
+        values = array("I")
+        for salt in self.salts:
+            values.frombytes(hashlib.blake2b(data, salt=salt).digest())
+        del values[self.hashes :]
+        return values
+
+    def signature(self, tokens: Set[str]) -> Optional[array]:
+        """Signature of a token set, None for an empty one."""
+        if not tokens:
+            return None
+        return array("I", map(min, zip(*map(self.token_hashes, tokens))))
+
+
+class SimilarityIndex:
+    """
+    In-memory index of world signatures with locality-sensitive hashing.
+
+    Signatures are split into ``bands`` bands; worlds sharing any whole band
+    land in the same bucket and are candidates for each other, so a query
+    only looks at likely matches. With 32 bands of 2 hashes, worlds sharing
+    a fifth of their tokens are candidates 3 times out of 4, a tenth only 1
+    time out of 4. Candidates are ranked by shared bands and the best ones
+    by estimated similarity.
+    """
+
+    def __init__(
+        self, hasher: Optional[MinHasher] = None, bands: int = SIMILARITY_BANDS
+    ):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.hashes % bands:
+            raise ValueError("The signature size must be a multiple of the band count")
+        self.bands = bands
+        self.rows = self.hasher.hashes // bands
+        self.signatures: Dict[int, array] = {}
+        self.buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: array) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, world_id: int, signature: array):
+        """Index a world's signature, replacing any previous one."""
+        with self._lock:
+            self._remove(world_id)
+            self.signatures[world_id] = signature
+            for key in self._band_keys(signature):
+                self.buckets.setdefault(key, set()).add(world_id)
+
+    def remove(self, world_id: int):
+        """Drop a world from the index."""
+        with self._lock:
+            self._remove(world_id)
+
+    def _remove(self, world_id: int):
+        signature = self.signatures.pop(world_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(world_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def related(
+        self, world_id: int, count: int = RELATED_WORLDS_COUNT
+    ) -> List[Tuple[int, float]]:
+        """
+        The ``count`` worlds most similar to a world, as (world ID,
+        estimated similarity) pairs, most similar first.
+        """
+        with self._lock:
+            signature = self.signatures.get(world_id)
+            if signature is None:
+                return []
+            shared_bands = Counter()
+            for key in self._band_keys(signature):
+                shared_bands.update(self.buckets.get(key, ()))
+            del shared_bands[world_id]
+
+            scored = []
+            for other_id, _ in shared_bands.most_common(count * 4):
+                other = self.signatures[other_id]
+                same = sum(map(operator.eq, signature, other))
+                scored.append((other_id, same / self.hasher.hashes))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:count]
+
+    def update_world(
+        self, world_id: int, readme_features: Dict, structure_features: Dict
+    ):
+        """(Re)index a world from its features and store its signature."""
+        signature = self.hasher.signature(
+            world_tokens(readme_features, structure_features)
+        )
+        if signature is None:
+            self.remove_world(world_id)
+            return
+        WorldSignatureRepository.save(world_id, self.hasher.scheme, signature.tobytes())
+        self.add(world_id, signature)
+
+    def remove_world(self, world_id: int):
+        """Drop a world from the index and its stored signature."""
+        self.remove(world_id)
+        WorldSignatureRepository.delete(world_id)
+
+    def load(self):
+        """
+        Index the stored signatures of all worlds. Worlds without a current
+        one (built before the index existed, or with other signature
+        settings) are signed from their stored features, once.
+        """
+        stored = WorldSignatureRepository.get_all(self.hasher.scheme)
+        computed = {}
+        for world in RepoWorldRepository.get_all():
+            data = stored.pop(world.id, None)
+            if data is not None:
+                signature = array("I")
+                signature.frombytes(data)
+                self.add(world.id, signature)
+                continue
+            try:
+                readme_features = json.loads(world.readme_features_json or "{}")
+                structure_features = json.loads(world.structure_features_json or "{}")
+            except ValueError:
+                continue
+            signature = self.hasher.signature(
+                world_tokens(readme_features, structure_features)
+            )
+            if signature is not None:
+                self.add(world.id, signature)
+                computed[world.id] = signature.tobytes()
+
+        if computed:
+            WorldSignatureRepository.save_many(self.hasher.scheme, computed)
+            logger.info(f"Computed similarity signatures of {len(computed)} worlds")
+        # Signatures of deleted worlds
+        WorldSignatureRepository.delete_many(list(stored))
+
+
+# Global similarity index instance
+_similarity_index: Optional[SimilarityIndex] = None
+_similarity_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Get the global similarity index, loading it on first use."""
+    global _similarity_index
+    with _similarity_index_lock:
+        if _similarity_index is None:
+            _similarity_index = SimilarityIndex()
+            _similarity_index.load()
+        return _similarity_index
@@ -9,6 +9,7 @@ from github_heroes.data.repositories import (
     PlayerRepository,
     RepoWorldRepository,
 )
+from github_heroes.game.similarity import get_similarity_index
 
 
 class GameState:
@@ -66,6 +67,7 @@ class GameState:
         world = RepoWorldRepository.get_by_id(world_id)
         if world and self.current_world == world:
             self.current_world = None
+        get_similarity_index().remove_world(world_id)
         return RepoWorldRepository.remove_by_id(world_id)
 
 
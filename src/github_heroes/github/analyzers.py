@@ -3,12 +3,14 @@ Analysis and feature extraction from processed GitHub data.
 """
 
 import hashlib
+import heapq
 import re
-from collections import Counter
-from typing import Dict, List
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from github_heroes.core.config import (
     KEYWORD_GROUPS,
+    README_TOP_WORDS,
 )
 from github_heroes.core.logging_utils import get_logger
 from github_heroes.data.models import (
@@ -19,52 +21,225 @@ from github_heroes.data.models import (
     TreeEntry,
 )
 
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
 logger = get_logger(__name__)
 
+# Batch analysis uses array operations when NumPy is installed
+NUMPY_AVAILABLE = np is not None
+
+
+# Markdown headings, and text split into alternating word runs and separators
+_HEADING_PATTERN = re.compile(r"^#+\s", re.MULTILINE)
+_WORD_SPLIT = re.compile(r"(\W+)")
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class KeywordMatcher:
+    """
+    Counts the keyword hits of every group from a single tokenization of the
+    text, however many keywords there are.
+
+    A hit is a whole-word match, like ``\\bkeyword\\b``: a one-word
+    keyword is looked up in the token counts, a multi-word one ("machine
+    learning", "command-line") is matched as a run of tokens with the same
+    separators. Keywords shorter than 3 characters are skipped to avoid
+    false positives (e.g., "ai" matching in "main", "said"), and so are
+    keywords spanning lines, since text is matched line by line.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        # group -> keywords, as ("word", token), ("phrase", tokens and
+        # separators) or ("regex", pattern) for keywords not starting and
+        # ending with a word character
+        self.groups: Dict[str, List[Tuple[str, Any]]] = {}
+        # First token -> phrases starting with it
+        self.phrases: Dict[str, List[Tuple[str, ...]]] = {}
+        # Phrase -> equivalent pattern, for texts not split into tokens
+        self.phrase_patterns: Dict[Tuple[str, ...], re.Pattern] = {}
+        self.patterns = []
+        for group_name, keywords in groups.items():
+            matchers = []
+            for keyword in keywords:
+                keyword_lower = keyword.lower()
+                if len(keyword_lower) < 3:
+                    continue
+                if "\n" in keyword_lower:
+                    logger.warning(f"Skipping keyword spanning lines: {keyword!r}")
+                    continue
+                parts = tuple(_WORD_SPLIT.split(keyword_lower))
+                if not parts[0] or not parts[-1]:
+                    pattern = re.compile(r"\b" + re.escape(keyword_lower) + r"\b")
+                    matchers.append(("regex", pattern))
+                    self.patterns.append(pattern)
+                elif len(parts) == 1:
+                    matchers.append(("word", keyword_lower))
+                else:
+                    matchers.append(("phrase", parts))
+                    phrases = self.phrases.setdefault(parts[0], [])
+                    if parts not in phrases:
+                        phrases.append(parts)
+                        self.phrase_patterns[parts] = re.compile(
+                            r"\b" + re.escape(keyword_lower) + r"\b"
+                        )
+            self.groups[group_name] = matchers
+
+    def scan(
+        self, text_lower: str, words: List[str], separators: List[str], found: Counter
+    ):
+        """
+        Add the multi-word and regex keyword matches in a lowercased text,
+        given its word runs and the separators following each of them, to
+        ``found``. The text must end at a line break or at the end of input.
+        """
+        if self.phrases:
+            next_start = {}  # Matches of one phrase don't overlap
+            for index, word in enumerate(words):
+                for parts in self.phrases.get(word, ()):
+                    length = len(parts) // 2 + 1
+                    if (
+                        index >= next_start.get(parts, 0)
+                        and tuple(words[index : index + length]) == parts[0::2]
+                        and tuple(separators[index : index + length - 1]) == parts[1::2]
+                    ):
+                        found[parts] += 1
+                        next_start[parts] = index + length
+        for pattern in self.patterns:
+            found[pattern] += len(pattern.findall(text_lower))
+
+    def search(self, text_lower: str, found: Counter):
+        """
+        Like ``scan``, for a text that was not split into tokens: phrases
+        are matched with their patterns, which find the same non-overlapping
+        token runs.
+        """
+        for parts, pattern in self.phrase_patterns.items():
+            if "".join(parts) in text_lower:
+                found[parts] += len(pattern.findall(text_lower))
+        for pattern in self.patterns:
+            found[pattern] += len(pattern.findall(text_lower))
+
+    def hits(self, counts: Dict[str, int], found: Counter) -> Dict[str, int]:
+        """Hits per group, given the count of each word run and ``scan``'s matches."""
+        hits = {}
+        for group_name, matchers in self.groups.items():
+            total = 0
+            for kind, keyword in matchers:
+                if kind == "word":
+                    total += counts.get(keyword, 0)
+                else:
+                    total += found[keyword]
+            hits[group_name] = total
+        return hits
+
+
+_KEYWORD_MATCHER = KeywordMatcher(KEYWORD_GROUPS)
+
+
+def top_counts(counts: Dict[str, int], k: int) -> Dict[str, int]:
+    """
+    The ``k`` highest counts, highest first; equal counts keep their order
+    in ``counts``.
+    """
+    return dict(heapq.nlargest(k, counts.items(), key=lambda item: item[1]))
+
 
-def compute_readme_features(text: str) -> ReadmeFeatures:
+class ReadmeAnalyzer:
     """
-    Compute features from README text.
+    Computes README features from text fed in chunks of any size.
+
+    Chunks are analyzed a line at a time (no feature spans lines), so only
+    the current incomplete line is held; the seed hash is updated with
+    every chunk. ``finish`` returns the same features as
+    compute_readme_features on the whole text.
     """
-    features = ReadmeFeatures()
 
-    if not text:
+    def __init__(self, top_words: int = README_TOP_WORDS):
+        self.top_words = top_words
+        self.char_count = 0
+        self.word_count = 0
+        self.heading_count = 0
+        self.counts = Counter()
+        self.found = Counter()
+        self.pending = ""  # Text after the last line break fed
+        self.sha256 = hashlib.sha256()
+
+    def feed(self, chunk: str):
+        """Analyze the next chunk of text."""
+        if not chunk:
+            return
+        self.char_count += len(chunk)
+        self.sha256.update(chunk.encode("utf-8"))
+        cut = chunk.rfind("\n") + 1
+        if cut == 0:
+            self.pending += chunk
+            return
+        lines = self.pending + chunk[:cut]
+        self.pending = chunk[cut:]
+        self._analyze(lines)
+
+    def _analyze(self, text: str):
+        """Analyze complete lines (or the final one)."""
+        self.word_count += len(text.split())
+
+        # Count headings (Markdown headers)
+        self.heading_count += len(_HEADING_PATTERN.findall(text))
+
+        # Tokenize once: word runs at even indices, the separators between
+        # them at odd ones
+        text_lower = text.lower()
+        parts = _WORD_SPLIT.split(text_lower)
+        words = parts[0::2]
+        self.counts.update(words)
+        _KEYWORD_MATCHER.scan(text_lower, words, parts[1::2], self.found)
+
+    def finish(self) -> ReadmeFeatures:
+        """Analyze the rest of the text and return the features."""
+        features = ReadmeFeatures()
+        if not self.char_count:
+            return features
+
+        if self.pending:
+            self._analyze(self.pending)
+            self.pending = ""
+
+        features.char_count = self.char_count
+        features.word_count = self.word_count
+        features.heading_count = self.heading_count
+
+        # Most frequent words (lowercase, alphanumeric only): the word runs
+        # made of ASCII letters and digits only, as matched by \b[a-zA-Z0-9]+\b
+        features.word_frequencies = top_counts(
+            {
+                word: count
+                for word, count in self.counts.items()
+                if word.isascii() and word.isalnum()
+            },
+            self.top_words,
+        )
+
+        # Keyword hits
+        features.keyword_hits = _KEYWORD_MATCHER.hits(self.counts, self.found)
+
+        # Generate deterministic seed from README hash
+        features.seed = int(self.sha256.hexdigest()[:16], 16)
+
         return features
 
-    # Basic counts
-    features.char_count = len(text)
-    features.word_count = len(text.split())
-
-    # Count headings (Markdown headers)
-    heading_pattern = re.compile(r"^#+\s", re.MULTILINE)
-    features.heading_count = len(heading_pattern.findall(text))
-
-    # Word frequencies (lowercase, alphanumeric only)
-    words = re.findall(r"\b[a-zA-Z0-9]+\b", text.lower())
-    features.word_frequencies = dict(Counter(words))
-
-    # Keyword hits
-    # Only match keywords with 3+ characters to avoid false positives (e.g., "ai" matching in "main", "said")
-    text_lower = text.lower()
-    for group_name, keywords in KEYWORD_GROUPS.items():
-        hits = 0
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            # Skip keywords shorter than 3 characters
-            if len(keyword_lower) < 3:
-                continue
-            # Use word boundaries to match whole words only
-            # This prevents "ai" from matching in "main", "said", "again", etc.
-            pattern = r"\b" + re.escape(keyword_lower) + r"\b"
-            matches = re.findall(pattern, text_lower)
-            hits += len(matches)
-        features.keyword_hits[group_name] = hits
-
-    # Generate deterministic seed from README hash
-    seed_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
-    features.seed = int(seed_hash[:16], 16)
 
-    return features
+def compute_readme_features(
+    text: str, top_words: int = README_TOP_WORDS
+) -> ReadmeFeatures:
+    """
+    Compute features from README text, keeping the ``top_words`` most
+    frequent words.
+    """
+    analyzer = ReadmeAnalyzer(top_words)
+    analyzer.feed(text)
+    return analyzer.finish()
 
 
 def compute_structure_features(tree_entries: List[TreeEntry]) -> Dict:
@@ -106,6 +281,227 @@ def compute_structure_features(tree_entries: List[TreeEntry]) -> Dict:
     return features
 
 
+def _vocabulary() -> defaultdict:
+    """A token -> id mapping giving new tokens the next id on lookup."""
+    vocabulary = defaultdict()
+    vocabulary.default_factory = vocabulary.__len__
+    return vocabulary
+
+
+def _count_pairs(groups, token_ids, vocabulary_size: int):
+    """
+    Count the (group, token) pairs of concatenated id arrays.
+
+    Returns the group, token, count and index of the first occurrence of
+    every distinct pair, sorted by group then token.
+    """
+    keys = groups.astype(np.int64) * vocabulary_size + token_ids
+    pairs, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    return pairs // vocabulary_size, pairs % vocabulary_size, counts, first
+
+
+def _ranked(groups, counts, first, group_count: int, limit: Optional[int] = None):
+    """
+    Order pair indices by group, then highest count (``counts`` None: by
+    first occurrence only), then first occurrence, keeping at most ``limit``
+    per group.
+    """
+    keys = (first,) if counts is None else (first, -counts)
+    order = np.lexsort(keys + (groups,))
+    if limit is not None:
+        sorted_groups = groups[order]
+        starts = np.searchsorted(sorted_groups, np.arange(group_count))
+        rank = np.arange(len(order)) - starts[sorted_groups]
+        order = order[rank < limit]
+    return order
+
+
+def compute_readme_features_batch(
+    texts: Sequence[Optional[str]], top_words: int = README_TOP_WORDS
+) -> List[ReadmeFeatures]:
+    """
+    Compute the features of many READMEs (None for a missing one), keeping
+    the ``top_words`` most frequent words of each; the same as calling
+    compute_readme_features on each.
+
+    With NumPy, words are mapped to ids in a vocabulary shared by the whole
+    batch and word counts, top words and keyword hits are computed with
+    array operations over all the READMEs at once.
+    """
+    if np is None:
+        return [compute_readme_features(text or "", top_words) for text in texts]
+
+    results = [ReadmeFeatures() for _ in texts]
+    vocabulary = _vocabulary()
+    token_ids = []
+    lengths = []
+    phrase_hits = []
+    for features, text in zip(results, texts):
+        if not text:
+            lengths.append(0)
+            phrase_hits.append(None)
+            continue
+        features.char_count = len(text)
+        features.word_count = len(text.split())
+        features.heading_count = len(_HEADING_PATTERN.findall(text))
+        features.seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16)
+
+        # Only word runs are needed here, phrases are searched for directly
+        text_lower = text.lower()
+        words = _WORD_PATTERN.findall(text_lower)
+        token_ids.extend(map(vocabulary.__getitem__, words))
+        lengths.append(len(words))
+        found = Counter()
+        _KEYWORD_MATCHER.search(text_lower, found)
+        phrase_hits.append(found)
+
+    if not token_ids:
+        return results
+
+    tokens = list(vocabulary)
+    documents = np.repeat(np.arange(len(texts)), lengths)
+    ids = np.fromiter(token_ids, dtype=np.int64, count=len(token_ids))
+    docs, words, counts, first = _count_pairs(documents, ids, len(tokens))
+
+    # Most frequent words (lowercase, alphanumeric only): ASCII letters and
+    # digits only, as matched by \b[a-zA-Z0-9]+\b
+    alphanumeric = np.fromiter(
+        (token.isascii() and token.isalnum() for token in tokens),
+        dtype=bool,
+        count=len(tokens),
+    )
+    kept = np.flatnonzero(alphanumeric[words])
+    order = kept[_ranked(docs[kept], counts[kept], first[kept], len(texts), top_words)]
+    for doc, word, count in zip(
+        docs[order].tolist(), words[order].tolist(), counts[order].tolist()
+    ):
+        results[doc].word_frequencies[tokens[word]] = count
+
+    # Keyword hits: one-word keywords from the counts, as a documents x
+    # keywords count matrix times a keywords x groups incidence matrix
+    group_names = list(_KEYWORD_MATCHER.groups)
+    keyword_ids = []
+    keyword_groups = []
+    for group_index, matchers in enumerate(_KEYWORD_MATCHER.groups.values()):
+        for kind, keyword in matchers:
+            if kind == "word" and keyword in vocabulary:
+                keyword_ids.append(vocabulary[keyword])
+                keyword_groups.append(group_index)
+    hits = np.zeros((len(texts), len(group_names)), dtype=np.int64)
+    if keyword_ids:
+        pairs = docs * len(tokens) + words
+        wanted = (
+            np.arange(len(texts))[:, None] * len(tokens) + np.array(keyword_ids)
+        ).ravel()
+        positions = np.minimum(np.searchsorted(pairs, wanted), len(pairs) - 1)
+        keyword_counts = np.where(pairs[positions] == wanted, counts[positions], 0)
+        incidence = np.zeros((len(keyword_ids), len(group_names)), dtype=np.int64)
+        incidence[np.arange(len(keyword_ids)), keyword_groups] = 1
+        hits = keyword_counts.reshape(len(texts), len(keyword_ids)) @ incidence
+
+    # Multi-word and regex keywords were matched per text
+    for index, (features, found) in enumerate(zip(results, phrase_hits)):
+        if found is None:
+            continue
+        features.keyword_hits = _KEYWORD_MATCHER.hits({}, found)
+        for group_index, group_name in enumerate(group_names):
+            features.keyword_hits[group_name] += int(hits[index, group_index])
+
+    return results
+
+
+def compute_structure_features_batch(
+    tree_listings: Sequence[List[TreeEntry]],
+) -> List[Dict]:
+    """
+    Compute the structure features of many repositories' tree listings; the
+    same as calling compute_structure_features on each, with NumPy counting
+    extensions and zones over all the listings at once.
+    """
+    if np is None:
+        return [compute_structure_features(entries) for entries in tree_listings]
+
+    zone_ids = _vocabulary()
+    extension_ids = _vocabulary()
+    zone_tokens = []
+    is_dir = []
+    zone_lengths = []
+    extension_tokens = []
+    extension_lengths = []
+    for entries in tree_listings:
+        # Directories and files in subdirectories are in the zone of their
+        # top-level directory, other files in "root"
+        zones = [
+            (
+                entry.path.partition("/")[0]
+                if entry.is_dir or "/" in entry.path
+                else "root"
+            )
+            for entry in entries
+        ]
+        zone_tokens.extend(map(zone_ids.__getitem__, zones))
+        is_dir.extend([entry.is_dir for entry in entries])
+        extensions = [
+            entry.file_type for entry in entries if entry.file_type and not entry.is_dir
+        ]
+        extension_tokens.extend(map(extension_ids.__getitem__, extensions))
+        zone_lengths.append(len(entries))
+        extension_lengths.append(len(extensions))
+
+    results = [
+        {"total_files": 0, "total_dirs": 0, "files_by_extension": {}, "zones": {}}
+        for _ in tree_listings
+    ]
+    if not zone_tokens:
+        return results
+
+    listing_count = len(tree_listings)
+    documents = np.repeat(np.arange(listing_count), zone_lengths)
+    dirs = np.array(is_dir, dtype=bool)
+    dir_totals = np.bincount(documents, weights=dirs, minlength=listing_count)
+    for features, length, dir_total in zip(
+        results, zone_lengths, dir_totals.astype(np.int64).tolist()
+    ):
+        features["total_dirs"] = dir_total
+        features["total_files"] = length - dir_total
+
+    if extension_tokens:
+        extensions = list(extension_ids)
+        docs, ids, counts, first = _count_pairs(
+            np.repeat(np.arange(listing_count), extension_lengths),
+            np.array(extension_tokens, dtype=np.int64),
+            len(extensions),
+        )
+        order = _ranked(docs, None, first, listing_count)
+        for doc, extension, count in zip(
+            docs[order].tolist(), ids[order].tolist(), counts[order].tolist()
+        ):
+            results[doc]["files_by_extension"][extensions[extension]] = count
+
+    zones = list(zone_ids)
+    keys = documents.astype(np.int64) * len(zones) + np.array(
+        zone_tokens, dtype=np.int64
+    )
+    pairs, first, inverse, counts = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True
+    )
+    zone_dirs = np.bincount(inverse, weights=dirs, minlength=len(pairs))
+    docs = pairs // len(zones)
+    order = _ranked(docs, None, first, listing_count)
+    for doc, zone, count, zone_dir_count in zip(
+        docs[order].tolist(),
+        (pairs[order] % len(zones)).tolist(),
+        counts[order].tolist(),
+        zone_dirs[order].astype(np.int64).tolist(),
+    ):
+        results[doc]["zones"][zones[zone]] = {
+            "files": count - zone_dir_count,
+            "dirs": zone_dir_count,
+        }
+
+    return results
+
+
 def compute_activity_features(commits: List[CommitData], repo_meta) -> Dict:
     """
     Compute activity and reputation features.
@@ -0,0 +1,202 @@
+"""
+Parsers for GitHub REST API (JSON) responses.
+
+These produce the same models as the HTML parsers in ``parsers.py`` so the
+rest of the pipeline does not care which backend fetched the data.
+"""
+
+import json
+from typing import List, Optional
+
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.models import (
+    CommitData,
+    IssueData,
+    PullRequestData,
+    RepoMeta,
+    TreeEntry,
+)
+
+logger = get_logger(__name__)
+
+
+def parse_repo_json(text: str) -> Optional[RepoMeta]:
+    """
+    Parse repository metadata from a ``/repos/{owner}/{repo}`` response.
+    """
+    try:
+        data = json.loads(text)
+        meta = RepoMeta()
+        meta.name = data.get("name") or ""
+        meta.description = data.get("description") or ""
+        meta.primary_language = data.get("language")
+        meta.stars = data.get("stargazers_count") or 0
+        meta.forks = data.get("forks_count") or 0
+        # watchers_count mirrors stars in the API; subscribers are the real watchers
+        meta.watchers = data.get("subscribers_count") or 0
+        meta.last_update = data.get("pushed_at")
+        return meta
+    except Exception as e:
+        logger.error(f"Error parsing repo JSON: {e}")
+        return None
+
+
+def parse_default_branch_json(text: str) -> Optional[str]:
+    """
+    Parse the default branch from a ``/repos/{owner}/{repo}`` response.
+    """
+    try:
+        return json.loads(text).get("default_branch") or None
+    except Exception as e:
+        logger.error(f"Error parsing default branch JSON: {e}")
+        return None
+
+
+def parse_tree_json(text: str) -> List[TreeEntry]:
+    """
+    Parse repository tree from a ``/git/trees/{branch}`` response.
+    """
+    entries = []
+    try:
+        data = json.loads(text)
+        for item in data.get("tree", []):
+            path = item.get("path", "")
+            if not path:
+                continue
+
+            entry = TreeEntry()
+            entry.path = path
+            entry.is_dir = item.get("type") == "tree"
+            entry.size = item.get("size")
+            name = path.split("/")[-1]
+            if not entry.is_dir and "." in name:
+                entry.file_type = name.split(".")[-1].lower()
+            entries.append(entry)
+
+        return entries
+    except Exception as e:
+        logger.error(f"Error parsing tree JSON: {e}")
+        return []
+
+
+def count_json_entries(text: str) -> int:
+    """Number of entries in a JSON array response (0 if it is not one)."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return 0
+    return len(data) if isinstance(data, list) else 0
+
+
+def parse_issues_json(text: str) -> List[IssueData]:
+    """
+    Parse issues from an ``/issues`` response (pull requests are skipped).
+    """
+    issues = []
+    try:
+        for item in json.loads(text):
+            if "pull_request" in item:
+                continue
+
+            issue = IssueData()
+            issue.issue_number = item.get("number") or 0
+            issue.title = item.get("title") or ""
+            issue.labels = [label.get("name", "") for label in item.get("labels", [])]
+            issue.comment_count = item.get("comments") or 0
+            issue.is_open = item.get("state") == "open"
+            issue.created_at = item.get("created_at")
+            issue.author = (item.get("user") or {}).get("login")
+
+            if issue.issue_number > 0:
+                issues.append(issue)
+
+        return issues
+    except Exception as e:
+        logger.error(f"Error parsing issues JSON: {e}")
+        return []
+
+
+def _pull_from_json(item: dict) -> PullRequestData:
+    """A pull request model from one pull request object."""
+    pr = PullRequestData()
+    pr.pr_number = item.get("number") or 0
+    pr.title = item.get("title") or ""
+    pr.is_merged = bool(item.get("merged_at"))
+    pr.is_open = item.get("state") == "open"
+    pr.comment_count = item.get("comments") or 0
+    pr.additions = item.get("additions")
+    pr.deletions = item.get("deletions")
+    return pr
+
+
+def parse_pulls_json(text: str) -> List[PullRequestData]:
+    """
+    Parse pull requests from a ``/pulls`` response.
+
+    The list endpoint has no comment or diff counts, so comment_count is 0
+    and additions/deletions are None; parse_pull_json reads them from a
+    single pull request.
+    """
+    pulls = []
+    try:
+        for item in json.loads(text):
+            pr = _pull_from_json(item)
+            if pr.pr_number > 0:
+                pulls.append(pr)
+
+        return pulls
+    except Exception as e:
+        logger.error(f"Error parsing pulls JSON: {e}")
+        return []
+
+
+def parse_pull_json(text: str) -> Optional[PullRequestData]:
+    """
+    Parse a pull request with its comment and diff counts from a
+    ``/pulls/{number}`` response.
+    """
+    try:
+        pr = _pull_from_json(json.loads(text))
+        return pr if pr.pr_number > 0 else None
+    except Exception as e:
+        logger.error(f"Error parsing pull request JSON: {e}")
+        return None
+
+
+def parse_commits_json(text: str) -> List[CommitData]:
+    """
+    Parse commits from a ``/commits`` response.
+    """
+    commits = []
+    try:
+        for item in json.loads(text):
+            commit = CommitData()
+            commit.short_hash = (item.get("sha") or "")[:7]
+            details = item.get("commit") or {}
+            message = details.get("message") or ""
+            commit.message = message.splitlines()[0] if message else ""
+            author = details.get("author") or {}
+            commit.author = (item.get("author") or {}).get("login") or author.get(
+                "name", ""
+            )
+            commit.date = author.get("date")
+
+            if commit.short_hash:
+                commits.append(commit)
+
+        return commits
+    except Exception as e:
+        logger.error(f"Error parsing commits JSON: {e}")
+        return []
+
+
+# Page name -> parser, mirroring HTML_PAGE_PARSERS in parsers.py; "pull" is
+# the details of one pull request, which HTML pull lists already include
+API_PAGE_PARSERS = {
+    "home": parse_repo_json,
+    "branch": parse_default_branch_json,
+    "issues": parse_issues_json,
+    "pulls": parse_pulls_json,
+    "pull": parse_pull_json,
+    "commits": parse_commits_json,
+}
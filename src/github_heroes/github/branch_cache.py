@@ -0,0 +1,81 @@
+"""
+Default branch cache shared by all scrapers.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from github_heroes.core.config import BRANCH_CACHE_TTL
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.repositories import RepoBranchRepository
+
+logger = get_logger(__name__)
+
+
+class BranchCache:
+    """
+    Per-repository default branch cache.
+
+    Entries are kept in memory and persisted to the database; both expire
+    after ``ttl`` seconds so renamed default branches are eventually noticed.
+    """
+
+    def __init__(self, ttl: int = BRANCH_CACHE_TTL):
+        self.ttl = timedelta(seconds=ttl)
+        self._entries: Dict[str, Tuple[str, datetime]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(owner: str, repo: str) -> str:
+        """GitHub names are case-insensitive, so normalize the key."""
+        return f"{owner}/{repo}".lower()
+
+    def get(self, owner: str, repo: str) -> Optional[str]:
+        """Get the cached branch for a repository, or None if unknown or expired."""
+        key = self._key(owner, repo)
+        now = datetime.now()
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and now - entry[1] < self.ttl:
+            return entry[0]
+
+        stored = RepoBranchRepository.get(key)
+        if stored:
+            branch, detected_at = stored
+            try:
+                detected = datetime.fromisoformat(detected_at)
+            except ValueError:
+                return None
+            if now - detected < self.ttl:
+                with self._lock:
+                    self._entries[key] = (branch, detected)
+                return branch
+
+        return None
+
+    def set(self, owner: str, repo: str, branch: str):
+        """Remember the default branch for a repository."""
+        key = self._key(owner, repo)
+        now = datetime.now()
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = (branch, now)
+        if previous and previous[0] == branch and now - previous[1] < self.ttl / 2:
+            return  # Fresh enough in the database already
+        RepoBranchRepository.set(key, branch, now.isoformat())
+
+
+# Global branch cache instance
+_branch_cache: Optional[BranchCache] = None
+_branch_cache_lock = threading.Lock()
+
+
+def get_branch_cache() -> BranchCache:
+    """Get the global branch cache instance."""
+    global _branch_cache
+    with _branch_cache_lock:
+        if _branch_cache is None:
+            _branch_cache = BranchCache()
+        return _branch_cache
@@ -0,0 +1,201 @@
+"""
+Record/replay of HTTP traffic for offline world builds and benchmarks.
+"""
+
+import gzip
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from github_heroes.core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+
+# Response headers worth keeping; everything else is noise for replays
+RECORDED_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Location",
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+)
+
+# Simulated network conditions for replays:
+# name -> (round trip seconds, bytes per second or 0 for unlimited, jitter fraction)
+LATENCY_PROFILES: Dict[str, Tuple[float, float, float]] = {
+    "none": (0.0, 0, 0.0),
+    "lan": (0.005, 50_000_000, 0.1),
+    "broadband": (0.08, 5_000_000, 0.2),
+    "mobile": (0.25, 500_000, 0.3),
+}
+
+
+class CassetteMiss(requests.RequestException):
+    """A replayed request that is not on the cassette."""
+
+
+class Cassette:
+    """
+    Gzip-compressed JSON file of recorded HTTP interactions.
+
+    In "record" mode requests go to the network and every response is kept
+    (the last one wins for repeated requests); ``save`` writes the file. In
+    "replay" mode responses come from the file only and unknown requests raise
+    CassetteMiss. Replays can be slowed down with a latency profile; the
+    delay for each URL is derived from the URL itself, so it is the same on
+    every run.
+    """
+
+    def __init__(self, path: Path, mode: str = "replay", latency: str = "none"):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency not in LATENCY_PROFILES:
+            raise ValueError(f"Unknown latency profile: {latency}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.interactions: Dict[str, dict] = {}
+        self.replayed = 0
+        self.missed = 0
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self.load()
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.mode == "record":
+            self.save()
+
+    @staticmethod
+    def _key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def load(self):
+        """Load interactions from the cassette file."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}")
+        self.interactions = data["interactions"]
+        logger.info(f"Loaded {len(self.interactions)} interactions from {self.path}")
+
+    def save(self):
+        """Write the recorded interactions to the cassette file."""
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        logger.info(f"Saved {len(self.interactions)} interactions to {self.path}")
+
+    def record(self, method: str, url: str, response: requests.Response):
+        """Keep a live response."""
+        entry = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            # The raw bytes, so replays decode them as the live response was
+            "body": response.content.decode("utf-8", errors="surrogateescape"),
+        }
+        with self._lock:
+            self.interactions[self._key(method, url)] = entry
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        """Build the recorded response for a request, after the simulated delay."""
+        with self._lock:
+            entry = self.interactions.get(self._key(request.method, request.url))
+            if entry is None:
+                self.missed += 1
+            else:
+                self.replayed += 1
+        if entry is None:
+            raise CassetteMiss(
+                f"No recorded response for {request.method} {request.url}"
+            )
+
+        body = entry["body"].encode("utf-8", errors="surrogateescape")
+        delay = self.delay_for(request.url, len(body))
+        if delay:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason") or ""
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = body if request.method != "HEAD" else b""
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def delay_for(self, url: str, size: int) -> float:
+        """Simulated transfer time for a response, stable for a given URL."""
+        rtt, bandwidth, jitter = LATENCY_PROFILES[self.latency]
+        delay = rtt + (size / bandwidth if bandwidth else 0.0)
+        if jitter:
+            rng = random.Random(zlib.crc32(url.encode("utf-8")))
+            delay *= 1 + rng.uniform(-jitter, jitter)
+        return delay
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter that records to or replays from a cassette.
+
+    Mounted on a requests session, it sees every request the session sends
+    (GET and HEAD alike) below the scheduler, retry and cache layers.
+    """
+
+    def __init__(self, cassette: Cassette, adapter: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == "replay":
+            return self.cassette.replay(request)
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(request.method, request.url, response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+# Cassette used by scrapers that are not given one explicitly
+_active_cassette: Optional[Cassette] = None
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """Get the process-wide cassette, if one is active."""
+    return _active_cassette
+
+
+def set_active_cassette(cassette: Optional[Cassette]):
+    """Make new scrapers record to or replay from a cassette (None to stop)."""
+    global _active_cassette
+    _active_cassette = cassette
@@ -0,0 +1,112 @@
+"""
+Persistent HTTP response cache with ETag/Last-Modified revalidation.
+"""
+
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from github_heroes.core.config import HTTP_CACHE_MAX_BYTES, HTTP_CACHE_PATH
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.lru_store import SQLiteLRUStore
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body and its validators."""
+
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that ask the server to answer 304 if the body is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache(SQLiteLRUStore):
+    """
+    On-disk response cache keyed by URL.
+
+    Bodies are stored zlib-compressed in a dedicated SQLite file. Only responses
+    carrying an ETag or Last-Modified header are stored, since those are the
+    only ones that can be revalidated. When the total stored size exceeds
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    table = "responses"
+    key_column = "url"
+    columns = ("body BLOB NOT NULL", "etag TEXT", "last_modified TEXT")
+
+    def __init__(
+        self, path: Optional[Path] = None, max_bytes: int = HTTP_CACHE_MAX_BYTES
+    ):
+        super().__init__(path or HTTP_CACHE_PATH, max_bytes)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Get the cached response for a URL, if any."""
+        row = self._load(url, "body, etag, last_modified")
+        if not row:
+            return None
+        try:
+            body = zlib.decompress(row[0]).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Dropping corrupt cache entry for {url}: {e}")
+            self.remove(url)
+            return None
+        return CachedResponse(url=url, body=body, etag=row[1], last_modified=row[2])
+
+    def record_hit(self, url: str):
+        """Count a successful revalidation and mark the entry as recently used."""
+        with self._lock:
+            self.hits += 1
+            self._touch(url)
+
+    def record_miss(self):
+        """Count a response that had to be downloaded in full."""
+        with self._lock:
+            self.misses += 1
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Store a response body, evicting old entries if the cache is full."""
+        if not etag and not last_modified:
+            return  # Cannot be revalidated, not worth keeping
+
+        data = zlib.compress(body.encode("utf-8"))
+        self._save(
+            url, {"body": data, "etag": etag, "last_modified": last_modified}, len(data)
+        )
+
+
+# Global response cache instance
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache instance."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            from github_heroes.data.database import get_db
+
+            max_mb = get_db().get_setting("http_cache_max_mb")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else HTTP_CACHE_MAX_BYTES
+            _response_cache = ResponseCache(max_bytes=max_bytes)
+        return _response_cache
@@ -0,0 +1,177 @@
+"""
+Precompiled regexes and CSS selectors for the HTML parsers.
+
+The CSS selectors form a versioned set. The built-in one matches GitHub's
+current markup; when GitHub changes its pages, a ``selectors.json`` file in
+the data directory can replace any of them without a code change:
+
+    {
+        "version": 2,
+        "selectors": {"issue_labels": ".IssueLabel, .Label, .gh-label"},
+        "row_classes": {"issues": ["js-issue-row", "Box-row", "ListItem"]}
+    }
+"""
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import soupsieve
+from bs4 import SoupStrainer
+
+from github_heroes.core.config import SELECTORS_PATH
+from github_heroes.core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Numbers in links and texts
+ISSUE_NUMBER = re.compile(r"/issues/(\d+)")
+PULL_NUMBER = re.compile(r"/pull/(\d+)")
+COMMIT_HASH = re.compile(r"/commit/([a-f0-9]+)")
+FIRST_NUMBER = re.compile(r"(\d+)")
+ADDITIONS = re.compile(r"\+(\d+)")
+DELETIONS = re.compile(r"-(\d+)")
+# Number with optional k/M suffix (e.g., "23.7k", "104k", "1.5k"), lowercased
+COUNT_WITH_SUFFIX = re.compile(r"([\d]+\.?[\d]*)\s*([km])?")
+# Embedded React payload of the current GitHub UI
+DEFAULT_BRANCH_JSON = re.compile(r'"defaultBranch"\s*:\s*"([^"]+)"')
+# Link targets
+TREE_HREF = re.compile(r"/(?:blob|tree)/")
+SITE_HREF = re.compile(r"^/")
+
+DEFAULT_SELECTORS = {
+    "version": 1,
+    "selectors": {
+        "tree_links": 'a[href*="/blob/"], a[href*="/tree/"]',
+        "issue_title": 'a[href*="/issues/"]',
+        "issue_labels": ".IssueLabel, .Label",
+        "issue_open": ".State--open, .octicon-issue-opened",
+        "issue_closed": ".State--closed, .octicon-issue-closed",
+        "comment_link": 'a[href*="#issuecomment"]',
+        "pull_title": 'a[href*="/pull/"]',
+        "pull_open": ".State--open, .octicon-git-pull-request",
+        "pull_merged": ".State--merged, .octicon-git-merge",
+        "pull_closed": ".State--closed",
+        "pull_diffstat": ".text-green, .text-red",
+        "commit_link": 'a[href*="/commit/"]',
+        "commit_message": '.commit-message, a[href*="/commit/"]',
+        "commit_author": ".commit-author, .user-mention",
+        "commit_time": "time-ago, relative-time, time",
+        "site_links": 'a[href^="/"]',
+    },
+    # Classes of the list rows of each page; only these rows are parsed
+    "row_classes": {
+        "issues": ["js-issue-row", "Box-row"],
+        "pulls": ["js-issue-row", "Box-row"],
+        "commits": ["commit-group-item", "Box-row"],
+    },
+}
+
+# Strainers building only the elements the built-in link selectors can
+# match. An overridden link selector may need any part of the page, so the
+# page is then built whole.
+_LINK_STRAINERS = {
+    "tree_links": SoupStrainer("a", href=TREE_HREF),
+    "site_links": SoupStrainer("a", href=SITE_HREF),
+}
+
+
+def class_strainer(*class_names: str) -> SoupStrainer:
+    """Strainer for elements having any of the given CSS classes."""
+    # A regex, since strainers may see the class attribute as one string
+    names = "|".join(re.escape(name) for name in class_names)
+    return SoupStrainer(class_=re.compile(rf"(?:^|\s)(?:{names})(?:\s|$)"))
+
+
+class SelectorSet:
+    """
+    A versioned set of CSS selectors, compiled once.
+
+    ``selectors[name]`` is a compiled soupsieve pattern (use its ``select``
+    and ``select_one``). For each page in ``row_classes`` there is also a
+    "<page>_rows" selector and a strainer building only those rows;
+    ``strainers`` also has one for each link selector ("tree_links",
+    "site_links"), None when it is overridden.
+    """
+
+    def __init__(
+        self, version: int, selectors: Dict[str, str], row_classes: Dict[str, List]
+    ):
+        self.version = version
+        self.selectors = {
+            name: soupsieve.compile(selector) for name, selector in selectors.items()
+        }
+        self.strainers = {}
+        for page, classes in row_classes.items():
+            self.selectors[f"{page}_rows"] = soupsieve.compile(
+                ", ".join(f".{name}" for name in classes)
+            )
+            self.strainers[page] = class_strainer(*classes)
+        for name, strainer in _LINK_STRAINERS.items():
+            default = DEFAULT_SELECTORS["selectors"][name]
+            self.strainers[name] = strainer if selectors.get(name) == default else None
+        # Identifies the exact set, e.g. for caching parse results
+        self.fingerprint = hashlib.sha256(
+            json.dumps([version, selectors, row_classes], sort_keys=True).encode(
+                "utf-8"
+            )
+        ).hexdigest()[:16]
+
+    def __getitem__(self, name: str):
+        return self.selectors[name]
+
+
+def load_selector_set(path: Optional[Path] = None) -> SelectorSet:
+    """
+    Build the selector set from the defaults and the overrides file, if
+    any. An invalid file is ignored with an error in the log.
+    """
+    path = path or SELECTORS_PATH
+    selectors = dict(DEFAULT_SELECTORS["selectors"])
+    row_classes = dict(DEFAULT_SELECTORS["row_classes"])
+    default_set = SelectorSet(DEFAULT_SELECTORS["version"], selectors, row_classes)
+    if not path.exists():
+        return default_set
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        version = int(overrides["version"])
+        for name, selector in overrides.get("selectors", {}).items():
+            if name not in selectors:
+                logger.warning(f"Ignoring unknown selector {name!r} in {path}")
+            elif not isinstance(selector, str):
+                raise ValueError(f"selector {name!r} is not a string")
+            else:
+                selectors[name] = selector
+        for page, classes in overrides.get("row_classes", {}).items():
+            if page not in row_classes:
+                logger.warning(f"Ignoring unknown row classes {page!r} in {path}")
+            elif not classes or not all(isinstance(c, str) for c in classes):
+                raise ValueError(f"row classes of {page!r} are not a list of names")
+            else:
+                row_classes[page] = list(classes)
+        selector_set = SelectorSet(version, selectors, row_classes)
+    except Exception as e:
+        logger.error(f"Invalid selector overrides in {path}, using defaults: {e}")
+        return default_set
+
+    logger.info(f"Using HTML selector set version {version} from {path}")
+    return selector_set
+
+
+# Global selector set
+_selector_set: Optional[SelectorSet] = None
+_selector_set_lock = threading.Lock()
+
+
+def get_selector_set() -> SelectorSet:
+    """Get the selector set used by the parsers, loading it on first use."""
+    global _selector_set
+    with _selector_set_lock:
+        if _selector_set is None:
+            _selector_set = load_selector_set()
+        return _selector_set
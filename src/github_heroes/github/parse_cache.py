@@ -0,0 +1,131 @@
+"""
+Persistent cache of parse results, keyed by a hash of the parsed page.
+"""
+
+import hashlib
+import json
+import threading
+import zlib
+from dataclasses import astuple, fields
+from pathlib import Path
+from typing import Any, Optional
+
+from github_heroes.core.config import PARSE_CACHE_MAX_BYTES, PARSE_CACHE_PATH
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.lru_store import SQLiteLRUStore
+from github_heroes.data.models import (
+    CommitData,
+    IssueData,
+    PullRequestData,
+    RepoMeta,
+    TreeEntry,
+)
+from github_heroes.github.markup import get_selector_set
+
+logger = get_logger(__name__)
+
+# Bump when a parser's output changes for the same input, so results cached
+# by older code are no longer used
+PARSER_VERSION = 1
+
+# Model of the parse result of each kind of page; "home" parses to a single
+# model, the others to lists
+PARSE_RESULT_MODELS = {
+    "home": RepoMeta,
+    "issues": IssueData,
+    "pulls": PullRequestData,
+    "commits": CommitData,
+    "tree": TreeEntry,
+}
+
+
+def _encode(kind: str, result: Any) -> bytes:
+    """Compress a parse result; models are stored as rows of field values."""
+    if kind == "home":
+        payload = astuple(result)
+    else:
+        payload = [astuple(item) for item in result]
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(kind: str, data: bytes) -> Any:
+    model = PARSE_RESULT_MODELS[kind]
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    if kind == "home":
+        return model(*payload)
+    return [model(*row) for row in payload]
+
+
+class ParseCache(SQLiteLRUStore):
+    """
+    On-disk cache of parse results.
+
+    A result is keyed by a SHA-256 hash of the parser version, the HTML
+    selector set's version and contents, the fields of the result model,
+    the parser and all of its arguments, the page body included, so a
+    byte-identical page is never parsed twice. Results are stored
+    zlib-compressed in a dedicated SQLite file; when the total stored size
+    exceeds ``max_bytes`` the least recently used entries are evicted.
+
+    Empty results are not stored: the parsers catch their own errors and
+    return None or an empty list, so an empty result may be a failed parse
+    that would otherwise be served for the page for good.
+    """
+
+    table = "parse_results"
+    key_column = "key"
+    columns = ("kind TEXT NOT NULL", "result BLOB NOT NULL")
+
+    def __init__(
+        self, path: Optional[Path] = None, max_bytes: int = PARSE_CACHE_MAX_BYTES
+    ):
+        super().__init__(path or PARSE_CACHE_PATH, max_bytes)
+
+    @staticmethod
+    def key(kind: str, parser_name: str, args: tuple) -> str:
+        """Cache key of parsing with ``parser_name(*args)``."""
+        digest = hashlib.sha256()
+        schema = ",".join(f.name for f in fields(PARSE_RESULT_MODELS[kind]))
+        selector_set = get_selector_set()
+        digest.update(
+            f"{PARSER_VERSION}\0{selector_set.version}\0{selector_set.fingerprint}"
+            f"\0{kind}\0{schema}\0{parser_name}".encode()
+        )
+        for arg in args:
+            digest.update(b"\0")
+            digest.update(str(arg).encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str, kind: str) -> Optional[Any]:
+        """Get a cached parse result, if any."""
+        row = self._load(key, "result", lookup=True)
+        if not row:
+            return None
+        try:
+            return _decode(kind, row[0])
+        except (zlib.error, ValueError, TypeError) as e:
+            logger.warning(f"Dropping corrupt parse cache entry {key}: {e}")
+            self.remove(key)
+            return None
+
+    def store(self, key: str, kind: str, result: Any):
+        """Store a parse result, evicting old entries if the cache is full."""
+        if not result:
+            return  # Possibly a failed parse; empty pages are cheap to redo
+
+        data = _encode(kind, result)
+        self._save(key, {"kind": kind, "result": data}, len(data))
+
+
+# Global parse cache instance
+_parse_cache: Optional[ParseCache] = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the global parse cache instance."""
+    global _parse_cache
+    with _parse_cache_lock:
+        if _parse_cache is None:
+            _parse_cache = ParseCache()
+        return _parse_cache
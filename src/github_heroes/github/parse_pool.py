@@ -0,0 +1,204 @@
+"""
+Process pool for the CPU-bound stage of world builds: page parsing and README
+analysis.
+
+Workers receive raw HTML/JSON/text and return plain model objects, so
+parsing doesn't hold the GUI process' GIL and bulk imports scale with cores.
+Page parse results are cached, so unchanged pages are not parsed again.
+"""
+
+import multiprocessing
+import sqlite3
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from github_heroes.core.config import PARSE_WORKERS
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.github.api_parsers import API_PAGE_PARSERS
+from github_heroes.github.parse_cache import (
+    PARSE_RESULT_MODELS,
+    ParseCache,
+    get_parse_cache,
+)
+from github_heroes.github.parsers import HTML_PAGE_PARSERS
+
+logger = get_logger(__name__)
+
+
+def parse_page(backend: str, page_name: str, raw: str) -> Any:
+    """Parse a raw page with the backend's parser for ``page_name``."""
+    page_parsers = API_PAGE_PARSERS if backend == "api" else HTML_PAGE_PARSERS
+    return page_parsers[page_name](raw)
+
+
+class ParsePool:
+    """
+    Runs parse and analysis functions in ``workers`` processes.
+
+    Functions must be module-level and their arguments and results
+    picklable. The processes are started on first use, with the "spawn"
+    method since forking a process running Qt and worker threads is unsafe.
+    With ``workers`` 0, or after the pool broke (a worker died), functions
+    run in the calling thread instead. Given a ``cache``, parse results can
+    be reused for identical input (see ``submit``).
+    """
+
+    def __init__(
+        self, workers: int = PARSE_WORKERS, cache: Optional[ParseCache] = None
+    ):
+        self.workers = workers
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"Started {self.workers} parser processes")
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor; the next call starts a fresh one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn: Callable, *args, cache_kind: Optional[str] = None) -> Future:
+        """
+        Start ``fn(*args)`` in a worker process. With a ``cache_kind`` (a
+        key of PARSE_RESULT_MODELS naming the result type) the cached result
+        of an identical earlier call is used instead, and new results are
+        cached.
+        """
+        if cache_kind is None or self.cache is None:
+            return self._submit(fn, *args)
+
+        key = ParseCache.key(cache_kind, fn.__qualname__, args)
+        cached = self.cache.get(key, cache_kind)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        future = self._submit(fn, *args)
+        future.add_done_callback(lambda done: self._store_result(done, key, cache_kind))
+        return future
+
+    def _store_result(self, future: Future, key: str, kind: str):
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self.cache.store(key, kind, future.result())
+        except sqlite3.Error as e:
+            logger.warning(f"Could not cache parse result: {e}")
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(fn, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.warning(f"Parser processes unavailable, parsing inline: {e}")
+                self._discard(executor)
+
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def result(self, future: Future, fn: Callable, *args) -> Any:
+        """
+        Wait for a future from ``submit(fn, *args)``; if its worker died,
+        the call is repeated in the calling thread.
+        """
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            logger.warning(f"Parser process failed, parsing inline: {e}")
+            with self._lock:
+                executor = self._executor
+            if executor is not None:
+                self._discard(executor)
+            return fn(*args)
+
+    def run(self, fn: Callable, *args, cache_kind: Optional[str] = None) -> Any:
+        """Run ``fn(*args)`` in a worker process and wait for the result."""
+        future = self.submit(fn, *args, cache_kind=cache_kind)
+        return self.result(future, fn, *args)
+
+    def parse(self, backend: str, page_name: str, raw: str) -> Any:
+        """
+        Parse a raw page in a worker process (see ``parse_page``), or take
+        the result from the cache.
+        """
+        cache_kind = page_name if page_name in PARSE_RESULT_MODELS else None
+        return self.run(parse_page, backend, page_name, raw, cache_kind=cache_kind)
+
+    def shutdown(self, wait: bool = False, cancel_pending: bool = True):
+        """Stop the worker processes, dropping queued work unless told not to."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+
+# Global parse pool instance
+_parse_pool: Optional[ParsePool] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _create_parse_pool() -> ParsePool:
+    """Create a parse pool sized from settings."""
+    from github_heroes.data.database import get_db
+
+    try:
+        workers = int(get_db().get_setting("parse_workers", str(PARSE_WORKERS)))
+    except ValueError:
+        workers = PARSE_WORKERS
+    return ParsePool(max(0, workers), cache=get_parse_cache())
+
+
+def get_parse_pool() -> ParsePool:
+    """Get the global parse pool."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = _create_parse_pool()
+        return _parse_pool
+
+
+def reload_parse_pool() -> ParsePool:
+    """
+    Recreate the global parse pool after its worker count changed. Parses
+    already submitted to the old pool still finish there.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        old_pool, _parse_pool = _parse_pool, _create_parse_pool()
+    if old_pool is not None:
+        old_pool.shutdown(cancel_pending=False)
+    return _parse_pool
+
+
+def set_parse_pool(pool: Optional[ParsePool]):
+    """Replace the global parse pool (e.g. with one of a given size)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        _parse_pool = pool
+
+
+def shutdown_parse_pool():
+    """Stop the global parse pool's processes (at application exit)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -2,10 +2,11 @@
 HTML parsers for GitHub pages.
 """
 
-import re
 from typing import List, Optional
+from urllib.parse import unquote
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 
 from github_heroes.core.logging_utils import get_logger
 from github_heroes.data.models import (
@@ -15,18 +16,53 @@ from github_heroes.data.models import (
     RepoMeta,
     TreeEntry,
 )
+from github_heroes.github.markup import (
+    ADDITIONS,
+    COMMIT_HASH,
+    COUNT_WITH_SUFFIX,
+    DEFAULT_BRANCH_JSON,
+    DELETIONS,
+    FIRST_NUMBER,
+    ISSUE_NUMBER,
+    PULL_NUMBER,
+    get_selector_set,
+)
 
 logger = get_logger(__name__)
 
 
+# Parts of a page each parser needs; everything else is skipped while parsing.
+# Matched elements keep their whole subtree. List rows and links are strained
+# by the selector set (see markup.py).
+# Branch selector menus of the classic UI
+_BRANCH_MENUS = (
+    (SoupStrainer(id="branch-select-menu"), "#branch-select-menu .css-truncate-target"),
+    (
+        SoupStrainer("summary", title="Switch branches or tags"),
+        'summary[title="Switch branches or tags"] .css-truncate-target',
+    ),
+)
+
+
+def _make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML with lxml, building only the elements matched by
+    ``parse_only``, or the whole page without it. Falls back to Python's
+    html.parser if lxml fails.
+    """
+    try:
+        return BeautifulSoup(html, "lxml", parse_only=parse_only)
+    except Exception as e:
+        logger.warning(f"lxml failed to parse page, using html.parser: {e}")
+        return BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+
 def _parse_count_with_suffix(text: str) -> int:
     """Parse count text that may have k (thousands) or M (millions) suffix."""
     if not text:
         return 0
     text = text.replace(",", "").strip().lower()
-    # Match number with optional k/M suffix (e.g., "23.7k", "104k", "1.5k")
-    # Pattern: optional digits, optional decimal point and digits, optional k/M suffix
-    match = re.search(r"([\d]+\.?[\d]*)\s*([km])?", text)
+    match = COUNT_WITH_SUFFIX.search(text)
     if match:
         number_str = match.group(1)
         suffix = match.group(2) if len(match.groups()) >= 2 and match.group(2) else None
@@ -43,118 +79,188 @@ def _parse_count_with_suffix(text: str) -> int:
     return 0
 
 
+# Elements whose strings BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Ancestor flags tracked while walking a repository home page
+_IN_NAME_STRONG = 1  # strong[itemprop="name"]
+_IN_H1 = 2
+_IN_H1_STRONG = 4  # h1 strong
+_IN_LANGUAGE_BOX = 8  # .d-inline-block.mb-3
+
+# Link targets of the star, fork and watcher counters
+_SOCIAL_LINK_PARTS = ("/stargazers", "/watchers", "/network/members", "/forks")
+
+
+def _element_text(element) -> str:
+    """
+    Text of an lxml element, the same as BeautifulSoup's get_text(strip=True):
+    stripped strings joined together, without comments, scripts, styles and
+    template contents.
+    """
+    parts = []
+    stack = [(element, False)]
+    while stack:
+        node, closing = stack.pop()
+        if closing:
+            if node is not element and node.tail:
+                parts.append(node.tail)
+            continue
+        stack.append((node, True))
+        if not isinstance(node.tag, str) or node.tag in _NON_TEXT_TAGS:
+            continue
+        if node.text:
+            parts.append(node.text)
+        stack.extend((child, False) for child in reversed(node))
+    return "".join(part.strip() for part in parts if part.strip())
+
+
+def _last_count(elements: List, get_text) -> int:
+    """Count of the last element with a positive one."""
+    for element in reversed(elements):
+        count = _parse_count_with_suffix(get_text(element))
+        if count > 0:
+            return count
+    return 0
+
+
+def _first_count(elements: List, get_text) -> int:
+    """Count of the first element with a positive one, falling back from its
+    text to its aria-label or title."""
+    for element in elements:
+        text = get_text(element) or element.get("aria-label", "")
+        count = _parse_count_with_suffix(text or element.get("title", ""))
+        if count > 0:
+            return count
+    return 0
+
+
 def parse_repo_metadata(html: str) -> Optional[RepoMeta]:
     """
     Parse repository metadata from home page HTML.
+
+    The page is walked once and candidate elements are classified as they are
+    met. Counts are resolved in order of preference: the last social button
+    with a positive count, overridden by the last matching link, and only if
+    still unknown the first positive fallback (hrefs, button data and
+    aria-label/title attributes mentioning the count).
     """
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        root = etree.fromstring(html, etree.HTMLParser())
         meta = RepoMeta()
-
-        # Extract name
-        name_elem = soup.select_one('strong[itemprop="name"] a, h1 strong a')
-        if name_elem:
-            meta.name = name_elem.get_text(strip=True)
-
-        # Extract description
-        desc_elem = soup.select_one('p[itemprop="about"], .f4.mb-3')
-        if desc_elem:
-            meta.description = desc_elem.get_text(strip=True)
-
-        # Extract primary language
-        lang_elem = soup.select_one(".d-inline-block.mb-3 .color-fg-default.text-bold")
-        if lang_elem:
-            meta.primary_language = lang_elem.get_text(strip=True)
-
-        # Extract stars, forks, watchers - try multiple selectors
-        # Look for social count buttons/links with various patterns
-        # Try button elements first (GitHub's newer UI)
-        for button in soup.select('button[data-view-component*="true"]'):
-            text = button.get_text(strip=True)
-            aria_label = button.get("aria-label", "")
-            # Check aria-label for type
-            if "star" in aria_label.lower() or "stargazer" in aria_label.lower():
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.stars = count
-            elif "fork" in aria_label.lower():
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.forks = count
-            elif "watch" in aria_label.lower() and "fork" not in aria_label.lower():
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.watchers = count
-
-        # Try link elements
-        for link in soup.select(
-            'a[href*="/stargazers"], a[href*="/watchers"], a[href*="/network/members"], a[href*="/forks"]'
-        ):
-            text = link.get_text(strip=True)
-            href = link.get("href", "")
-            if "/stargazers" in href or "stargazers" in href:
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.stars = count
-            elif "/network/members" in href or "/forks" in href or "forks" in href:
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.forks = count
-            elif "/watchers" in href or "watchers" in href:
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.watchers = count
-
-        # Try alternative selectors for stats - look for button text patterns
-        if meta.stars == 0:
-            for elem in soup.select(
-                'a[href*="stargazers"], button[data-view-component*="stargazers"], [aria-label*="star"]'
+        if root is None:
+            return meta
+
+        name_elem = desc_elem = lang_elem = None
+        buttons = {"stars": [], "forks": [], "watchers": []}
+        links = {"stars": [], "forks": [], "watchers": []}
+        fallbacks = {"stars": [], "forks": [], "watchers": [], "forks_attr": []}
+
+        stack = [(root, 0)]
+        while stack:
+            node, flags = stack.pop()
+            tag = node.tag
+            if not isinstance(tag, str):
+                continue  # Comment or processing instruction
+            get = node.get
+            classes = get("class", "").split()
+            aria_label = get("aria-label", "")
+            href = get("href", "") if tag == "a" else ""
+            view_component = get("data-view-component", "") if tag == "button" else ""
+
+            if (
+                tag == "a"
+                and name_elem is None
+                and flags & (_IN_NAME_STRONG | _IN_H1_STRONG)
             ):
-                text = elem.get_text(strip=True)
-                if not text:
-                    text = elem.get("aria-label", "") or elem.get("title", "")
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.stars = count
-                    break
-
-        if meta.forks == 0:
-            # Try multiple fork-related selectors
-            for elem in soup.select(
-                'a[href*="network"], a[href*="forks"], button[data-view-component*="fork"], [aria-label*="fork"]'
+                name_elem = node
+            if desc_elem is None and (
+                (tag == "p" and get("itemprop") == "about")
+                or ("f4" in classes and "mb-3" in classes)
             ):
-                text = elem.get_text(strip=True)
-                if not text:
-                    text = elem.get("aria-label", "") or elem.get("title", "")
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.forks = count
-                    break
-
-        # Try finding by aria-label or title attributes
-        if meta.forks == 0:
-            for elem in soup.select('[aria-label*="fork"], [title*="fork"]'):
-                text = (
-                    elem.get_text(strip=True)
-                    or elem.get("aria-label", "")
-                    or elem.get("title", "")
-                )
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.forks = count
-                    break
-
-        if meta.watchers == 0:
-            for elem in soup.select(
-                'a[href*="watchers"], button[data-view-component*="watch"], [aria-label*="watch"]'
+                desc_elem = node
+            if (
+                lang_elem is None
+                and flags & _IN_LANGUAGE_BOX
+                and "color-fg-default" in classes
+                and "text-bold" in classes
             ):
-                text = elem.get_text(strip=True)
-                if not text:
-                    text = elem.get("aria-label", "") or elem.get("title", "")
-                count = _parse_count_with_suffix(text)
-                if count > 0:
-                    meta.watchers = count
-                    break
+                lang_elem = node
+
+            # Social count buttons (GitHub's newer UI)
+            if "true" in view_component:
+                label = aria_label.lower()
+                if "star" in label or "stargazer" in label:
+                    buttons["stars"].append(node)
+                elif "fork" in label:
+                    buttons["forks"].append(node)
+                elif "watch" in label:
+                    buttons["watchers"].append(node)
+
+            # Social count links
+            if any(part in href for part in _SOCIAL_LINK_PARTS):
+                if "stargazers" in href:
+                    links["stars"].append(node)
+                elif "/network/members" in href or "forks" in href:
+                    links["forks"].append(node)
+                elif "watchers" in href:
+                    links["watchers"].append(node)
+
+            # Fallback candidates, in document order
+            if (
+                "stargazers" in href
+                or "stargazers" in view_component
+                or "star" in aria_label
+            ):
+                fallbacks["stars"].append(node)
+            if (
+                "network" in href
+                or "forks" in href
+                or "fork" in view_component
+                or "fork" in aria_label
+            ):
+                fallbacks["forks"].append(node)
+            if "fork" in aria_label or "fork" in get("title", ""):
+                fallbacks["forks_attr"].append(node)
+            if "watchers" in href or "watch" in view_component or "watch" in aria_label:
+                fallbacks["watchers"].append(node)
+
+            # Descend, passing down the ancestor flags
+            child_flags = flags
+            if tag == "strong":
+                if get("itemprop") == "name":
+                    child_flags |= _IN_NAME_STRONG
+                if flags & _IN_H1:
+                    child_flags |= _IN_H1_STRONG
+            elif tag == "h1":
+                child_flags |= _IN_H1
+            if "d-inline-block" in classes and "mb-3" in classes:
+                child_flags |= _IN_LANGUAGE_BOX
+            stack.extend((child, child_flags) for child in reversed(node))
+
+        texts = {}
+
+        def get_text(element) -> str:
+            if element not in texts:
+                texts[element] = _element_text(element)
+            return texts[element]
+
+        if name_elem is not None:
+            meta.name = get_text(name_elem)
+        if desc_elem is not None:
+            meta.description = get_text(desc_elem)
+        if lang_elem is not None:
+            meta.primary_language = get_text(lang_elem)
+
+        for kind in ("stars", "forks", "watchers"):
+            count = _last_count(links[kind], get_text) or _last_count(
+                buttons[kind], get_text
+            )
+            if count == 0:
+                count = _first_count(fallbacks[kind], get_text)
+            if count == 0 and kind == "forks":
+                count = _first_count(fallbacks["forks_attr"], get_text)
+            setattr(meta, kind, count)
 
         return meta
     except Exception as e:
@@ -162,6 +268,32 @@ def parse_repo_metadata(html: str) -> Optional[RepoMeta]:
         return None
 
 
+def parse_default_branch(html: str) -> Optional[str]:
+    """
+    Parse the default branch name from repository home page HTML.
+    """
+    try:
+        # Embedded React payload (current GitHub UI)
+        match = DEFAULT_BRANCH_JSON.search(html)
+        if match:
+            return match.group(1)
+
+        # Branch selector button (classic UI)
+        if "css-truncate-target" not in html:
+            return None
+        for strainer, selector in _BRANCH_MENUS:
+            branch_elem = _make_soup(html, strainer).select_one(selector)
+            if branch_elem:
+                branch = branch_elem.get_text(strip=True)
+                if branch:
+                    return branch
+
+        return None
+    except Exception as e:
+        logger.error(f"Error parsing default branch: {e}")
+        return None
+
+
 def parse_tree(html: str) -> List[TreeEntry]:
     """
     Parse repository tree structure.
@@ -170,10 +302,12 @@ def parse_tree(html: str) -> List[TreeEntry]:
     seen_paths = set()  # Track seen paths to avoid duplicates
 
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        # Only links are parsed (unless the link selector is overridden)
+        selectors = get_selector_set()
+        soup = _make_soup(html, selectors.strainers["tree_links"])
 
         # Find all file/directory links in the tree
-        for link in soup.select('a[href*="/blob/"], a[href*="/tree/"]'):
+        for link in selectors["tree_links"].select(soup):
             href = link.get("href", "")
             text = link.get_text(strip=True)
 
@@ -194,69 +328,99 @@ def parse_tree(html: str) -> List[TreeEntry]:
 
                 entries.append(entry)
 
-        # Alternative: look for table rows or list items
-        if not entries:
-            for row in soup.select("tr, .js-navigation-item"):
-                link = row.select_one('a[href*="/blob/"], a[href*="/tree/"]')
-                if link:
-                    href = link.get("href", "")
-                    text = link.get_text(strip=True)
-
-                    # Skip if we've already seen this path
-                    if text in seen_paths:
-                        continue
-                    seen_paths.add(text)
-
-                    entry = TreeEntry()
-                    entry.path = text
-                    entry.is_dir = "/tree/" in href
-                    if not entry.is_dir and "." in text:
-                        entry.file_type = text.split(".")[-1].lower()
-                    entries.append(entry)
-
         return entries
     except Exception as e:
         logger.error(f"Error parsing tree: {e}")
         return []
 
 
+def parse_tree_page(
+    html: str, owner: str, repo: str, branch: str, dir_path: str = ""
+) -> List[TreeEntry]:
+    """
+    Parse the direct children of one directory page of the repository tree.
+
+    Unlike parse_tree, full paths are taken from the link targets, so entries
+    of nested directories get their complete path and unrelated links
+    (breadcrumbs, parent directories) are ignored.
+    """
+    entries = []
+    seen_paths = set()
+    prefixes = {
+        kind: f"/{owner}/{repo}/{kind}/{branch}/".lower() for kind in ("blob", "tree")
+    }
+
+    try:
+        selectors = get_selector_set()
+        soup = _make_soup(html, selectors.strainers["tree_links"])
+
+        for link in selectors["tree_links"].select(soup):
+            href = unquote(link.get("href", "")).split("?")[0].split("#")[0]
+            for kind, prefix in prefixes.items():
+                if href.lower().startswith(prefix):
+                    path = href[len(prefix) :].strip("/")
+                    break
+            else:
+                continue
+
+            # Only direct children of this directory
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            if not path or parent != dir_path or path in seen_paths:
+                continue
+            seen_paths.add(path)
+
+            entry = TreeEntry()
+            entry.path = path
+            entry.is_dir = kind == "tree"
+            name = path.split("/")[-1]
+            if not entry.is_dir and "." in name:
+                entry.file_type = name.split(".")[-1].lower()
+            entries.append(entry)
+
+        return entries
+    except Exception as e:
+        logger.error(f"Error parsing tree page: {e}")
+        return []
+
+
 def parse_issues(html: str) -> List[IssueData]:
     """
     Parse issues from issues page HTML.
     """
     issues = []
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        selectors = get_selector_set()
+        soup = _make_soup(html, selectors.strainers["issues"])
 
         # Find issue list items
-        for item in soup.select(".js-issue-row, .Box-row"):
+        for item in selectors["issues_rows"].select(soup):
             issue = IssueData()
 
             # Extract issue number and title
-            title_link = item.select_one('a[href*="/issues/"]')
+            title_link = selectors["issue_title"].select_one(item)
             if title_link:
                 href = title_link.get("href", "")
-                match = re.search(r"/issues/(\d+)", href)
+                match = ISSUE_NUMBER.search(href)
                 if match:
                     issue.issue_number = int(match.group(1))
                 issue.title = title_link.get_text(strip=True)
 
             # Extract labels
-            for label in item.select(".IssueLabel, .Label"):
+            for label in selectors["issue_labels"].select(item):
                 issue.labels.append(label.get_text(strip=True))
 
             # Extract comment count
-            comment_link = item.select_one('a[href*="#issuecomment"]')
+            comment_link = selectors["comment_link"].select_one(item)
             if comment_link:
                 text = comment_link.get_text(strip=True)
-                match = re.search(r"(\d+)", text)
+                match = FIRST_NUMBER.search(text)
                 if match:
                     issue.comment_count = int(match.group(1))
 
             # Check if open or closed
-            if item.select_one(".State--open, .octicon-issue-opened"):
+            if selectors["issue_open"].select_one(item):
                 issue.is_open = True
-            elif item.select_one(".State--closed, .octicon-issue-closed"):
+            elif selectors["issue_closed"].select_one(item):
                 issue.is_open = False
 
             if issue.issue_number > 0:
@@ -274,47 +438,48 @@ def parse_pulls(html: str) -> List[PullRequestData]:
     """
     pulls = []
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        selectors = get_selector_set()
+        soup = _make_soup(html, selectors.strainers["pulls"])
 
         # Find PR list items
-        for item in soup.select(".js-issue-row, .Box-row"):
+        for item in selectors["pulls_rows"].select(soup):
             pr = PullRequestData()
 
             # Extract PR number and title
-            title_link = item.select_one('a[href*="/pull/"]')
+            title_link = selectors["pull_title"].select_one(item)
             if title_link:
                 href = title_link.get("href", "")
-                match = re.search(r"/pull/(\d+)", href)
+                match = PULL_NUMBER.search(href)
                 if match:
                     pr.pr_number = int(match.group(1))
                 pr.title = title_link.get_text(strip=True)
 
             # Extract comment count
-            comment_link = item.select_one('a[href*="#issuecomment"]')
+            comment_link = selectors["comment_link"].select_one(item)
             if comment_link:
                 text = comment_link.get_text(strip=True)
-                match = re.search(r"(\d+)", text)
+                match = FIRST_NUMBER.search(text)
                 if match:
                     pr.comment_count = int(match.group(1))
 
             # Check if open, closed, or merged
-            if item.select_one(".State--open, .octicon-git-pull-request"):
+            if selectors["pull_open"].select_one(item):
                 pr.is_open = True
-            elif item.select_one(".State--merged, .octicon-git-merge"):
+            elif selectors["pull_merged"].select_one(item):
                 pr.is_merged = True
                 pr.is_open = False
-            elif item.select_one(".State--closed"):
+            elif selectors["pull_closed"].select_one(item):
                 pr.is_open = False
 
             # Try to extract additions/deletions
-            for text_elem in item.select(".text-green, .text-red"):
+            for text_elem in selectors["pull_diffstat"].select(item):
                 text = text_elem.get_text(strip=True)
                 if "+" in text:
-                    match = re.search(r"\+(\d+)", text)
+                    match = ADDITIONS.search(text)
                     if match:
                         pr.additions = int(match.group(1))
                 elif "-" in text:
-                    match = re.search(r"-(\d+)", text)
+                    match = DELETIONS.search(text)
                     if match:
                         pr.deletions = int(match.group(1))
 
@@ -333,32 +498,33 @@ def parse_commits(html: str) -> List[CommitData]:
     """
     commits = []
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        selectors = get_selector_set()
+        soup = _make_soup(html, selectors.strainers["commits"])
 
         # Find commit list items
-        for item in soup.select(".commit-group-item, .Box-row"):
+        for item in selectors["commits_rows"].select(soup):
             commit = CommitData()
 
             # Extract hash
-            hash_link = item.select_one('a[href*="/commit/"]')
+            hash_link = selectors["commit_link"].select_one(item)
             if hash_link:
                 href = hash_link.get("href", "")
-                match = re.search(r"/commit/([a-f0-9]+)", href)
+                match = COMMIT_HASH.search(href)
                 if match:
                     commit.short_hash = match.group(1)[:7]
 
             # Extract message
-            message_elem = item.select_one('.commit-message, a[href*="/commit/"]')
+            message_elem = selectors["commit_message"].select_one(item)
             if message_elem:
                 commit.message = message_elem.get_text(strip=True)
 
             # Extract author
-            author_elem = item.select_one(".commit-author, .user-mention")
+            author_elem = selectors["commit_author"].select_one(item)
             if author_elem:
                 commit.author = author_elem.get_text(strip=True)
 
             # Extract date
-            time_elem = item.select_one("time-ago, relative-time, time")
+            time_elem = selectors["commit_time"].select_one(item)
             if time_elem:
                 commit.date = time_elem.get("datetime") or time_elem.get_text(
                     strip=True
@@ -371,3 +537,38 @@ def parse_commits(html: str) -> List[CommitData]:
     except Exception as e:
         logger.error(f"Error parsing commits: {e}")
         return []
+
+
+def parse_search_results(html: str) -> List[str]:
+    """
+    Parse "owner/repo" names from a repository search results page, in page
+    order and without duplicates.
+    """
+    try:
+        selectors = get_selector_set()
+        soup = _make_soup(html, selectors.strainers["site_links"])
+        names = []
+        seen = set()
+        for link in selectors["site_links"].select(soup):
+            href = link.get("href", "")
+            if href.count("/") != 2:
+                continue
+            owner_repo = href.strip("/")
+            owner, _, repo = owner_repo.partition("/")
+            if owner and repo and owner_repo not in seen:
+                seen.add(owner_repo)
+                names.append(owner_repo)
+        return names
+    except Exception as e:
+        logger.error(f"Error parsing search results: {e}")
+        return []
+
+
+# Page name -> parser, mirroring API_PAGE_PARSERS in api_parsers.py
+HTML_PAGE_PARSERS = {
+    "home": parse_repo_metadata,
+    "branch": parse_default_branch,
+    "issues": parse_issues,
+    "pulls": parse_pulls,
+    "commits": parse_commits,
+}
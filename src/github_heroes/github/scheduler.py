@@ -0,0 +1,250 @@
+"""
+Rate-limit aware request scheduling shared by all scrapers.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+from urllib.parse import urlparse
+
+import requests
+
+from github_heroes.core.config import (
+    MAX_IN_FLIGHT_REQUESTS,
+    REQUEST_BACKOFF_BASE,
+    REQUEST_BACKOFF_MAX,
+    REQUEST_BURST,
+    REQUEST_MAX_RETRIES,
+    REQUEST_RATE_PER_HOST,
+)
+from github_heroes.core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: rate limited or transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    ``acquire`` blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting as long as needed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while (e.g. after a 429)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class RequestScheduler:
+    """
+    Schedules HTTP requests for all scrapers in the process.
+
+    Each host gets its own token bucket, the total number of requests in
+    flight is bounded, and rate limited (429, or 403 with an exhausted
+    rate limit) or failed (5xx, connection errors) requests are retried with
+    exponential backoff and full jitter, honouring ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUEST_RATE_PER_HOST,
+        burst: int = REQUEST_BURST,
+        max_in_flight: int = MAX_IN_FLIGHT_REQUESTS,
+        max_retries: int = REQUEST_MAX_RETRIES,
+        backoff_base: float = REQUEST_BACKOFF_BASE,
+        backoff_max: float = REQUEST_BACKOFF_MAX,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Get the token bucket for a host."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def request(
+        self,
+        url: str,
+        send: Callable[[], requests.Response],
+        consume: Optional[Callable[[requests.Response], T]] = None,
+    ) -> Any:
+        """
+        Run ``send`` (which performs the request for ``url``) under the
+        scheduler's limits, retrying when appropriate.
+
+        Returns the last response; raises the last exception if every attempt
+        failed at the connection level. With ``consume`` (needed for streamed
+        responses) the final response is passed to it while the request
+        still counts as in flight, then closed, and its result is returned.
+        """
+        bucket = self._bucket(urlparse(url).netloc)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            with self._in_flight:
+                try:
+                    response = send()
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    logger.info(f"Retrying {url} in {delay:.1f}s after error: {e}")
+                else:
+                    if not self._should_retry(response) or attempt >= self.max_retries:
+                        if consume is None:
+                            return response
+                        with response:
+                            return consume(response)
+                    # Release the connection of a streamed response we won't read
+                    response.close()
+                    retry_after = self._retry_after(response)
+                    delay = (
+                        retry_after
+                        if retry_after is not None
+                        else self._backoff(attempt)
+                    )
+                    if response.status_code in (403, 429):
+                        bucket.pause(delay)
+                    logger.info(
+                        f"Retrying {url} in {delay:.1f}s after HTTP "
+                        f"{response.status_code}"
+                    )
+            time.sleep(delay)
+            attempt += 1
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    @staticmethod
+    def _should_retry(response: requests.Response) -> bool:
+        """Check whether a response signals a retryable condition."""
+        if response.status_code in RETRY_STATUSES:
+            return True
+        # GitHub reports an exhausted primary rate limit as 403
+        return (
+            response.status_code == 403
+            and response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Server-requested delay from Retry-After or X-RateLimit-Reset, capped."""
+        value = response.headers.get("Retry-After")
+        delay = None
+        if value:
+            try:
+                delay = float(value)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(value).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+        elif response.headers.get("X-RateLimit-Reset"):
+            try:
+                delay = float(response.headers["X-RateLimit-Reset"]) - time.time()
+            except ValueError:
+                delay = None
+        if delay is None:
+            return None
+        return min(max(delay, 0.0), self.backoff_max)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and get the same result (or exception) instead
+    of running it again. Once the call finishes the key is forgotten, so
+    later calls run afresh.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless a call for ``key`` is already in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                leader = True
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight call {key}")
+            return future.result()
+
+        try:
+            result: Any = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# Global scheduler instance
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Get the global request scheduler instance."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
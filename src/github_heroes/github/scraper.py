@@ -2,182 +2,721 @@
 GitHub processor for fetching repository data via HTTP.
 """
 
-from typing import Optional
+import codecs
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote_plus
 
 import requests
+from requests.adapters import BaseAdapter
 
 from github_heroes.core.config import (
+    API_PAGE_SIZE,
     DEFAULT_BRANCHES,
+    FETCH_MAX_WORKERS,
+    GITHUB_API_BASE,
     GITHUB_BASE,
     GITHUB_RAW_BASE,
     GITHUB_SEARCH_BASE,
+    HTML_LIST_PAGE_SIZES,
+    HTTP_TRANSPORT,
+    PREFETCH_TTL,
     REQUEST_HEADERS,
     REQUEST_TIMEOUT,
+    RESPONSE_BYTE_LIMITS,
+    RESPONSE_CHUNK_SIZE,
+    TREE_MAX_DEPTH,
+    TREE_MAX_ENTRIES,
 )
 from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.models import TreeEntry
+from github_heroes.github.api_parsers import (
+    count_json_entries,
+    parse_default_branch_json,
+    parse_tree_json,
+)
+from github_heroes.github.branch_cache import get_branch_cache
+from github_heroes.github.cassette import Cassette, CassetteAdapter, get_active_cassette
+from github_heroes.github.http_cache import ResponseCache, get_response_cache
+from github_heroes.github.parse_pool import get_parse_pool
+from github_heroes.github.parsers import parse_default_branch, parse_tree_page
+from github_heroes.github.scheduler import RequestScheduler, SingleFlight, get_scheduler
+from github_heroes.github.transport import create_transport
 
 logger = get_logger(__name__)
 
 
+# Available backends: scrape HTML pages, or use the JSON REST API
+BACKENDS = ("html", "api")
+
+
+def _read_body(
+    response: requests.Response,
+    limit: int,
+) -> Tuple[str, bool]:
+    """
+    Read a streamed response body, decoding it incrementally and stopping once
+    ``limit`` bytes have been read.
+
+    Returns the text and whether it was truncated.
+    """
+    # Without an explicit charset requests would guess; GitHub serves UTF-8
+    content_type = response.headers.get("Content-Type", "").lower()
+    encoding = response.encoding if "charset=" in content_type else "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    parts = []
+    size = 0
+    truncated = False
+    for chunk in response.iter_content(chunk_size=RESPONSE_CHUNK_SIZE):
+        if size + len(chunk) > limit:
+            chunk = chunk[: limit - size]
+            truncated = True
+        size += len(chunk)
+        text = decoder.decode(chunk)
+        if text:
+            parts.append(text)
+        if truncated:
+            break
+
+    # After a cut, a partial multi-byte sequence is dropped instead of replaced
+    if not truncated:
+        text = decoder.decode(b"", final=True)
+        if text:
+            parts.append(text)
+    return "".join(parts), truncated
+
+
+def _with_page(url: str, page: int) -> str:
+    """Add a page parameter to a list page URL (page 1 keeps the plain URL)."""
+    return url if page <= 1 else f"{url}?page={page}"
+
+
 class GitHubScraper:
     """
     Processor for GitHub repository data via HTTP.
+
+    The "html" backend scrapes github.com pages; the "api" backend uses the
+    REST API, whose JSON payloads are much smaller and need no HTML parsing.
+    The API backend is used by default when a token is configured. Base URLs
+    can be overridden to point the scraper at a local stand-in server, and a
+    cassette records or replays all traffic for offline builds. Requests go
+    through a pluggable transport (see transport.py), tuned from config by
+    default.
     """
 
-    def __init__(self, api_token: Optional[str] = None):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        scheduler: Optional[RequestScheduler] = None,
+        backend: Optional[str] = None,
+        base_url: str = GITHUB_BASE,
+        raw_base_url: str = GITHUB_RAW_BASE,
+        api_base_url: str = GITHUB_API_BASE,
+        search_base_url: str = GITHUB_SEARCH_BASE,
+        cassette: Optional[Cassette] = None,
+        transport: Optional[BaseAdapter] = None,
+    ):
         self.api_token = api_token
+        self.backend = backend or ("api" if api_token else "html")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown scraper backend: {self.backend}")
+        self.base_url = base_url
+        self.raw_base_url = raw_base_url
+        self.api_base_url = api_base_url
+        self.search_base_url = search_base_url
         self.session = requests.Session()
         self.session.headers.update(REQUEST_HEADERS)
+        self.transport = transport or create_transport()
         if api_token:
             self.session.headers.update({"Authorization": f"token {api_token}"})
+        self.scheduler = scheduler or get_scheduler()
+        self.branch_cache = get_branch_cache()
+        self.single_flight = SingleFlight()
+        # URL -> (fetched at, body) of pages fetched ahead of a likely build
+        self._prefetched: Dict[str, Tuple[float, str]] = {}
+        self._prefetch_lock = threading.Lock()
+
+        # Recorded traffic must be complete bodies, so a cassette bypasses the
+        # response cache (a revalidated 304 has nothing worth recording)
+        self.cassette = cassette or get_active_cassette()
+        adapter = self.transport
+        if self.cassette:
+            adapter = CassetteAdapter(self.cassette, self.transport)
+            use_cache = False
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.response_cache = (
+            (response_cache or get_response_cache()) if use_cache else None
+        )
+
+        # Branch override from settings (re-read when the scraper is recreated)
+        from github_heroes.data.database import get_db
+
+        self.branch_override = get_db().get_setting("default_branch", "") or None
 
     def fetch_readme(
-        self, owner: str, repo: str, branch: Optional[str] = None
+        self,
+        owner: str,
+        repo: str,
+        branch: Optional[str] = None,
     ) -> Optional[str]:
         """
         Fetch README.md content from raw GitHub URL.
+
+        At most RESPONSE_BYTE_LIMITS["readme"] bytes are read.
         """
         if not branch:
-            branch = self._detect_branch(owner, repo)
+            branch = self.detect_branch(owner, repo)
 
         if not branch:
             return None
 
-        url = f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/README.md"
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            logger.info(f"Fetched README for {owner}/{repo}")
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch README for {owner}/{repo}: {e}")
-            return None
+        if self.backend == "api":
+            url = f"{self.api_base_url}/repos/{owner}/{repo}/readme?ref={branch}"
+            return self._fetch_text(
+                url,
+                f"README for {owner}/{repo}",
+                headers={"Accept": "application/vnd.github.raw"},
+                kind="readme",
+            )
+
+        url = f"{self.raw_base_url}/{owner}/{repo}/{branch}/README.md"
+        return self._fetch_text(url, f"README for {owner}/{repo}", kind="readme")
 
-    def fetch_repo_home(self, owner: str, repo: str) -> Optional[str]:
+    def fetch_repo_home(
+        self, owner: str, repo: str, prefetch: bool = False
+    ) -> Optional[str]:
         """
         Fetch repository home page HTML.
+
+        With ``prefetch`` the page is also kept for the next fetch of it.
         """
-        url = f"{GITHUB_BASE}/{owner}/{repo}"
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            logger.info(f"Fetched repo home for {owner}/{repo}")
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch repo home for {owner}/{repo}: {e}")
-            return None
+        url = f"{self.base_url}/{owner}/{repo}"
+        return self._fetch_text(url, f"repo home for {owner}/{repo}", prefetch=prefetch)
 
     def fetch_tree_html(
-        self, owner: str, repo: str, branch: Optional[str] = None
+        self, owner: str, repo: str, branch: Optional[str] = None, dir_path: str = ""
     ) -> Optional[str]:
         """
-        Fetch repository tree HTML.
+        Fetch repository tree HTML, for the root or a subdirectory.
         """
         if not branch:
-            branch = self._detect_branch(owner, repo)
+            branch = self.detect_branch(owner, repo)
 
         if not branch:
             return None
 
-        url = f"{GITHUB_BASE}/{owner}/{repo}/tree/{branch}"
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            logger.info(f"Fetched tree for {owner}/{repo}")
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch tree for {owner}/{repo}: {e}")
-            return None
+        url = f"{self.base_url}/{owner}/{repo}/tree/{branch}"
+        if dir_path:
+            url = f"{url}/{dir_path}"
+        return self._fetch_text(url, f"tree for {owner}/{repo}/{dir_path}")
 
-    def fetch_issues_html(self, owner: str, repo: str) -> Optional[str]:
+    def fetch_issues_html(self, owner: str, repo: str, page: int = 1) -> Optional[str]:
         """
-        Fetch issues page HTML.
+        Fetch one page of the issues list HTML.
         """
-        url = f"{GITHUB_BASE}/{owner}/{repo}/issues"
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            logger.info(f"Fetched issues for {owner}/{repo}")
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch issues for {owner}/{repo}: {e}")
-            return None
+        url = _with_page(f"{self.base_url}/{owner}/{repo}/issues", page)
+        return self._fetch_text(url, f"issues page {page} for {owner}/{repo}")
 
-    def fetch_pulls_html(self, owner: str, repo: str) -> Optional[str]:
+    def fetch_pulls_html(self, owner: str, repo: str, page: int = 1) -> Optional[str]:
         """
-        Fetch pull requests page HTML.
+        Fetch one page of the pull requests list HTML.
         """
-        url = f"{GITHUB_BASE}/{owner}/{repo}/pulls"
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            logger.info(f"Fetched pulls for {owner}/{repo}")
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch pulls for {owner}/{repo}: {e}")
-            return None
+        url = _with_page(f"{self.base_url}/{owner}/{repo}/pulls", page)
+        return self._fetch_text(url, f"pulls page {page} for {owner}/{repo}")
 
     def fetch_commits_html(
-        self, owner: str, repo: str, branch: Optional[str] = None
+        self, owner: str, repo: str, branch: Optional[str] = None, page: int = 1
     ) -> Optional[str]:
         """
-        Fetch commits page HTML.
+        Fetch one page of the commits list HTML.
         """
         if not branch:
-            branch = self._detect_branch(owner, repo)
+            branch = self.detect_branch(owner, repo)
 
         if not branch:
             return None
 
-        url = f"{GITHUB_BASE}/{owner}/{repo}/commits/{branch}"
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            logger.info(f"Fetched commits for {owner}/{repo}")
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch commits for {owner}/{repo}: {e}")
-            return None
+        url = _with_page(f"{self.base_url}/{owner}/{repo}/commits/{branch}", page)
+        return self._fetch_text(url, f"commits page {page} for {owner}/{repo}")
 
     def search_repos_html(self, query: str) -> Optional[str]:
         """
         Search repositories via GitHub search page.
         """
-        url = f"{GITHUB_SEARCH_BASE}?q={query}&type=repositories"
+        url = f"{self.search_base_url}?q={quote_plus(query)}&type=repositories"
+        return self._fetch_text(url, f"search results for {query}")
+
+    def fetch_repo_json(
+        self, owner: str, repo: str, prefetch: bool = False
+    ) -> Optional[str]:
+        """
+        Fetch repository metadata from the REST API.
+
+        With ``prefetch`` the response is also kept for the next fetch of it.
+        """
+        url = f"{self.api_base_url}/repos/{owner}/{repo}"
+        return self._fetch_api(url, f"repo JSON for {owner}/{repo}", prefetch=prefetch)
+
+    def fetch_tree_json(
+        self,
+        owner: str,
+        repo: str,
+        branch: Optional[str] = None,
+        recursive: bool = False,
+    ) -> Optional[str]:
+        """
+        Fetch repository tree from the REST API, optionally the whole tree at once.
+        """
+        if not branch:
+            branch = self.detect_branch(owner, repo)
+
+        if not branch:
+            return None
+
+        url = f"{self.api_base_url}/repos/{owner}/{repo}/git/trees/{branch}"
+        if recursive:
+            url = f"{url}?recursive=1"
+        return self._fetch_api(url, f"tree JSON for {owner}/{repo}")
+
+    def iter_tree_entries(
+        self,
+        owner: str,
+        repo: str,
+        branch: Optional[str] = None,
+        max_depth: int = TREE_MAX_DEPTH,
+        max_entries: int = TREE_MAX_ENTRIES,
+    ) -> Iterator[TreeEntry]:
+        """
+        Yield repository tree entries down to ``max_depth`` directory levels,
+        stopping after ``max_entries`` entries.
+
+        The API backend gets the whole tree in a single recursive request. The
+        HTML backend crawls directory pages breadth-first, fetching up to
+        FETCH_MAX_WORKERS pages at a time; each page is parsed in the parse
+        pool as soon as it arrives and dropped before the next batch is
+        requested.
+        """
+        if not branch:
+            branch = self.detect_branch(owner, repo)
+
+        if not branch or max_entries <= 0:
+            return
+
+        if self.backend == "api":
+            tree_json = self.fetch_tree_json(
+                owner, repo, branch, recursive=max_depth > 1
+            )
+            entries = parse_tree_json(tree_json) if tree_json else []
+            yield from [
+                entry for entry in entries if entry.path.count("/") < max_depth
+            ][:max_entries]
+            return
+
+        parse_pool = get_parse_pool()
+
+        def fetch_entries(dir_path: str) -> List[TreeEntry]:
+            html = self.fetch_tree_html(owner, repo, branch, dir_path)
+            if not html:
+                return []
+            return parse_pool.run(
+                parse_tree_page,
+                html,
+                owner,
+                repo,
+                branch,
+                dir_path,
+                cache_kind="tree",
+            )
+
+        yielded = 0
+        level = [""]
+        executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS)
         try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            for _depth in range(max_depth):
+                next_level = []
+                for start in range(0, len(level), FETCH_MAX_WORKERS):
+                    batch = level[start : start + FETCH_MAX_WORKERS]
+                    for entries in executor.map(fetch_entries, batch):
+                        for entry in entries:
+                            yield entry
+                            yielded += 1
+                            if yielded >= max_entries:
+                                return
+                            if entry.is_dir:
+                                next_level.append(entry.path)
+                if not next_level:
+                    break
+                level = next_level
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_tree_entries(
+        self, owner: str, repo: str, branch: Optional[str] = None
+    ) -> List[TreeEntry]:
+        """
+        Fetch the (bounded) recursive repository tree as a list of entries.
+        """
+        entries = list(self.iter_tree_entries(owner, repo, branch))
+        logger.info(f"Fetched {len(entries)} tree entries for {owner}/{repo}")
+        return entries
+
+    def fetch_issues_json(self, owner: str, repo: str, page: int = 1) -> Optional[str]:
+        """
+        Fetch one page of open issues from the REST API.
+        """
+        url = (
+            f"{self.api_base_url}/repos/{owner}/{repo}/issues?state=open"
+            f"&per_page={API_PAGE_SIZE}&page={page}"
+        )
+        return self._fetch_api(url, f"issues JSON page {page} for {owner}/{repo}")
+
+    def fetch_pulls_json(self, owner: str, repo: str, page: int = 1) -> Optional[str]:
+        """
+        Fetch one page of open pull requests from the REST API.
+        """
+        url = (
+            f"{self.api_base_url}/repos/{owner}/{repo}/pulls?state=open"
+            f"&per_page={API_PAGE_SIZE}&page={page}"
+        )
+        return self._fetch_api(url, f"pulls JSON page {page} for {owner}/{repo}")
+
+    def fetch_pull_json(self, owner: str, repo: str, number: int) -> Optional[str]:
+        """
+        Fetch a single pull request from the REST API, which unlike the list
+        has its comment and diff counts.
+        """
+        url = f"{self.api_base_url}/repos/{owner}/{repo}/pulls/{number}"
+        return self._fetch_api(url, f"pull request #{number} JSON for {owner}/{repo}")
+
+    def fetch_commits_json(
+        self, owner: str, repo: str, branch: Optional[str] = None, page: int = 1
+    ) -> Optional[str]:
+        """
+        Fetch one page of recent commits from the REST API.
+        """
+        if not branch:
+            branch = self.detect_branch(owner, repo)
+
+        if not branch:
+            return None
+
+        url = (
+            f"{self.api_base_url}/repos/{owner}/{repo}/commits?sha={branch}"
+            f"&per_page={API_PAGE_SIZE}&page={page}"
+        )
+        return self._fetch_api(url, f"commits JSON page {page} for {owner}/{repo}")
+
+    def page_fetchers(self) -> Dict[str, Callable[..., Optional[str]]]:
+        """
+        Fetch functions for each page of a world build, for the active backend.
+
+        "home", "issues" and "pulls" take (owner, repo); "readme", "tree" and
+        "commits" take (owner, repo, branch). The list pages ("issues", "pulls",
+        "commits") also take a trailing 1-based page number. Raw results are
+        meant for the matching HTML_PAGE_PARSERS / API_PAGE_PARSERS entry,
+        except "tree", which is crawled and parsed as it is fetched and returns
+        TreeEntry items.
+        """
+        if self.backend == "api":
+            return {
+                "home": self.fetch_repo_json,
+                "issues": self.fetch_issues_json,
+                "pulls": self.fetch_pulls_json,
+                "readme": self.fetch_readme,
+                "tree": self.fetch_tree_entries,
+                "commits": self.fetch_commits_json,
+            }
+        return {
+            "home": self.fetch_repo_home,
+            "issues": self.fetch_issues_html,
+            "pulls": self.fetch_pulls_html,
+            "readme": self.fetch_readme,
+            "tree": self.fetch_tree_entries,
+            "commits": self.fetch_commits_html,
+        }
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics of the transport (see TransportStats)."""
+        return self.transport.stats.snapshot()
+
+    def list_page_size(self, page_name: str) -> int:
+        """
+        Number of items on a full page of a list page ("issues", "pulls" or
+        "commits"); a shorter page is the last one.
+        """
+        if self.backend == "api":
+            return API_PAGE_SIZE
+        return HTML_LIST_PAGE_SIZES[page_name]
+
+    def list_page_entries(self, raw: str, items: List) -> int:
+        """
+        Number of entries on a fetched list page, to compare with
+        list_page_size. API pages count the entries of the JSON array, as
+        the ``/issues`` endpoint also returns pull requests, which the issue
+        parser drops.
+        """
+        if self.backend == "api":
+            return count_json_entries(raw)
+        return len(items)
+
+    def _fetch_api(
+        self, url: str, description: str, prefetch: bool = False
+    ) -> Optional[str]:
+        """GET a REST API URL and return the raw JSON text."""
+        return self._fetch_text(
+            url,
+            description,
+            headers={"Accept": "application/vnd.github+json"},
+            kind="json",
+            prefetch=prefetch,
+        )
+
+    def prefetch_repo(self, owner: str, repo: str) -> bool:
+        """
+        Warm up a world build that is likely to follow (e.g. for a top search
+        result): fetch the repository's home page, keep it for PREFETCH_TTL
+        seconds and learn the default branch from it.
+
+        Returns whether the page could be fetched.
+        """
+        if self.backend == "api":
+            home = self.fetch_repo_json(owner, repo, prefetch=True)
+            parse_branch = parse_default_branch_json
+        else:
+            home = self.fetch_repo_home(owner, repo, prefetch=True)
+            parse_branch = parse_default_branch
+        if not home:
+            return False
+        if not self.get_known_branch(owner, repo):
+            branch = parse_branch(home)
+            if branch:
+                self.remember_branch(owner, repo, branch)
+        return True
+
+    def _take_prefetched(self, url: str) -> Optional[str]:
+        """Hand out (once) a prefetched body that is still fresh."""
+        with self._prefetch_lock:
+            entry = self._prefetched.pop(url, None)
+        if entry and time.monotonic() - entry[0] < PREFETCH_TTL:
+            return entry[1]
+        return None
+
+    def _fetch_text(
+        self,
+        url: str,
+        description: str,
+        headers: Optional[Dict[str, str]] = None,
+        kind: str = "html",
+        prefetch: bool = False,
+    ) -> Optional[str]:
+        """
+        GET a URL and return its body, revalidating against the response cache.
+
+        Concurrent fetches of the same URL (and Accept header) share a single
+        request. A cached body is sent back with If-None-Match/If-Modified-Since;
+        a 304 answer returns the cached body without downloading it again.
+
+        The body is streamed and read at most up to the byte limit for ``kind``
+        (see RESPONSE_BYTE_LIMITS).
+
+        A body fetched with ``prefetch`` is kept and served, without a request,
+        to the next fetch of the same URL within PREFETCH_TTL seconds.
+        """
+        if not prefetch:
+            text = self._take_prefetched(url)
+            if text is not None:
+                logger.info(f"Using prefetched {description}")
+                return text
+        key = ("GET", url, (headers or {}).get("Accept"))
+        text = self.single_flight.do(
+            key,
+            lambda: self._fetch_text_uncoalesced(url, description, headers, kind),
+        )
+        if prefetch and text is not None:
+            now = time.monotonic()
+            with self._prefetch_lock:
+                self._prefetched = {
+                    cached_url: entry
+                    for cached_url, entry in self._prefetched.items()
+                    if now - entry[0] < PREFETCH_TTL
+                }
+                self._prefetched[url] = (now, text)
+        return text
+
+    def _fetch_text_uncoalesced(
+        self,
+        url: str,
+        description: str,
+        headers: Optional[Dict[str, str]] = None,
+        kind: str = "html",
+    ) -> Optional[str]:
+        """Perform the request behind ``_fetch_text``."""
+        cached = self.response_cache.get(url) if self.response_cache else None
+        headers = dict(headers or {})
+        if cached:
+            headers.update(cached.conditional_headers())
+        limit = RESPONSE_BYTE_LIMITS[kind]
+
+        def read(
+            response: requests.Response,
+        ) -> Tuple[requests.Response, Optional[str], bool]:
+            """Read the body while the request holds its in-flight slot."""
+            if cached and response.status_code == 304:
+                return response, None, False
             response.raise_for_status()
-            logger.info(f"Searched repos: {query}")
-            return response.text
+
+            # Truncated JSON cannot be parsed, so don't even start reading it
+            length = response.headers.get("Content-Length", "")
+            if kind == "json" and length.isdigit() and int(length) > limit:
+                logger.warning(
+                    f"Skipping {description}: {length} bytes exceeds the "
+                    f"{limit} byte limit"
+                )
+                return response, None, False
+            text, truncated = _read_body(response, limit)
+            return response, text, truncated
+
+        try:
+            response, text, truncated = self.scheduler.request(
+                url,
+                lambda: self.session.get(
+                    url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True
+                ),
+                consume=read,
+            )
         except requests.RequestException as e:
-            logger.warning(f"Failed to search repos: {e}")
+            logger.warning(f"Failed to fetch {description}: {e}")
+            return None
+
+        if cached and response.status_code == 304:
+            self.response_cache.record_hit(url)
+            logger.info(f"Fetched {description} (not modified)")
+            return cached.body
+        if text is None:
             return None
 
-    def _detect_branch(self, owner: str, repo: str) -> Optional[str]:
+        if truncated:
+            if kind == "json":
+                logger.warning(
+                    f"Skipping {description}: exceeds the {limit} byte limit"
+                )
+                return None
+            logger.warning(f"Truncated {description} at {limit} bytes")
+        elif self.response_cache:
+            # Truncated bodies are not cached, so a larger limit takes effect
+            self.response_cache.record_miss()
+            self.response_cache.store(
+                url,
+                text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        logger.info(f"Fetched {description}")
+        return text
+
+    def get_known_branch(self, owner: str, repo: str) -> Optional[str]:
+        """
+        Get the default branch without any network access: the override from
+        settings, or a previously detected branch from the cache.
+        """
+        if self.branch_override:
+            return self.branch_override
+        return self.branch_cache.get(owner, repo)
+
+    def remember_branch(self, owner: str, repo: str, branch: str):
+        """
+        Record a default branch learned elsewhere (e.g. from the repo home page).
+        """
+        self.branch_cache.set(owner, repo, branch)
+
+    def detect_branch(self, owner: str, repo: str) -> Optional[str]:
         """
         Detect default branch by trying main, then master, or use override from settings.
+        Known branches are served from the branch cache without any request, and
+        concurrent detections for the same repository share one probe.
         """
-        # Check for branch override in settings
-        from github_heroes.data.database import get_db
+        known_branch = self.get_known_branch(owner, repo)
+        if known_branch:
+            return known_branch
 
-        db = get_db()
-        override_branch = db.get_setting("default_branch", "")
-        if override_branch:
-            logger.info(f"Using override branch {override_branch} for {owner}/{repo}")
-            return override_branch
+        return self.single_flight.do(
+            ("branch", owner.lower(), repo.lower()),
+            lambda: self._probe_branch(owner, repo),
+        )
+
+    def _probe_branch(self, owner: str, repo: str) -> Optional[str]:
+        """Find the default branch over the network."""
+        # The API reports the default branch directly
+        if self.backend == "api":
+            repo_json = self.fetch_repo_json(owner, repo)
+            branch = parse_default_branch_json(repo_json) if repo_json else None
+            if branch:
+                logger.info(f"Detected branch {branch} for {owner}/{repo}")
+                self.remember_branch(owner, repo, branch)
+                return branch
+            logger.warning(f"Could not detect branch for {owner}/{repo}")
+            return None
 
         # Try default branches
         for branch in DEFAULT_BRANCHES:
-            url = f"{GITHUB_BASE}/{owner}/{repo}/tree/{branch}"
+            url = f"{self.base_url}/{owner}/{repo}/tree/{branch}"
             try:
-                response = self.session.head(
-                    url, timeout=REQUEST_TIMEOUT, allow_redirects=True
+                response = self.scheduler.request(
+                    url,
+                    lambda: self.session.head(
+                        url, timeout=REQUEST_TIMEOUT, allow_redirects=True
+                    ),
                 )
                 if response.status_code == 200:
                     logger.info(f"Detected branch {branch} for {owner}/{repo}")
+                    self.remember_branch(owner, repo, branch)
                     return branch
             except requests.RequestException:
                 continue
 
         logger.warning(f"Could not detect branch for {owner}/{repo}")
         return None
+
+
+# Global scraper instance shared by the UI, world builds and imports
+_scraper: Optional[GitHubScraper] = None
+_scraper_lock = threading.Lock()
+
+
+def _create_scraper() -> GitHubScraper:
+    """Create a scraper from the token in settings."""
+    from github_heroes.data.database import get_db
+
+    db = get_db()
+    token = db.get_setting("github_token", "")
+    transport = create_transport(db.get_setting("http_transport", HTTP_TRANSPORT))
+    return GitHubScraper(api_token=token if token else None, transport=transport)
+
+
+def get_scraper() -> GitHubScraper:
+    """Get the global scraper instance."""
+    global _scraper
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = _create_scraper()
+        return _scraper
+
+
+def reload_scraper() -> GitHubScraper:
+    """
+    Recreate the global scraper after its settings (token, branch) changed.
+    Requests already running on the old instance finish normally.
+    """
+    global _scraper
+    with _scraper_lock:
+        _scraper = _create_scraper()
+        return _scraper
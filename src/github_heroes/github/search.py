@@ -0,0 +1,129 @@
+"""
+Repository search with cached results and speculative prefetching.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from github_heroes.core.config import (
+    PREFETCH_TTL,
+    SEARCH_CACHE_MAX_QUERIES,
+    SEARCH_CACHE_TTL,
+    SEARCH_PREFETCH_COUNT,
+    SEARCH_PREFETCH_WORKERS,
+)
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.github.parsers import parse_search_results
+from github_heroes.github.scraper import get_scraper
+
+logger = get_logger(__name__)
+
+
+class RepoSearch:
+    """
+    Repository search shared by the search panel.
+
+    Results ("owner/repo" names) are kept per query for ``ttl`` seconds, at
+    most ``max_queries`` of them. After a search the home pages of the first
+    ``prefetch_count`` results are fetched in the background through the
+    global scraper, so picking one of them starts its world build warm.
+    """
+
+    def __init__(
+        self,
+        ttl: int = SEARCH_CACHE_TTL,
+        max_queries: int = SEARCH_CACHE_MAX_QUERIES,
+        prefetch_count: int = SEARCH_PREFETCH_COUNT,
+    ):
+        self.ttl = ttl
+        self.max_queries = max_queries
+        self.prefetch_count = prefetch_count
+        self._results: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._prefetched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=SEARCH_PREFETCH_WORKERS)
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def cached(self, query: str) -> Optional[List[str]]:
+        """Get the results of a recent search, without any request."""
+        key = self._key(query)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self._results.move_to_end(key)
+                return list(entry[1])
+            self._results.pop(key, None)
+        return None
+
+    def search(self, query: str) -> Optional[List[str]]:
+        """
+        Search repositories, reusing recent results. Blocks on the network,
+        so call it off the GUI thread.
+
+        Returns the "owner/repo" names, or None if the search failed.
+        """
+        results = self.cached(query)
+        if results is not None:
+            return results
+
+        html = get_scraper().search_repos_html(query)
+        if html is None:
+            return None
+        results = parse_search_results(html)
+        with self._lock:
+            self._results[self._key(query)] = (time.monotonic(), results)
+            while len(self._results) > self.max_queries:
+                self._results.popitem(last=False)
+        return list(results)
+
+    def prefetch(self, names: List[str]):
+        """Fetch the home pages of the top results in the background."""
+        now = time.monotonic()
+        with self._lock:
+            # Pages prefetched within PREFETCH_TTL are still held by the scraper
+            self._prefetched = {
+                name: at
+                for name, at in self._prefetched.items()
+                if now - at < PREFETCH_TTL
+            }
+            wanted = [
+                name
+                for name in names[: self.prefetch_count]
+                if name not in self._prefetched
+            ]
+            for name in wanted:
+                self._prefetched[name] = now
+        for name in wanted:
+            owner, _, repo = name.partition("/")
+            self._executor.submit(self._prefetch_one, owner, repo)
+
+    @staticmethod
+    def _prefetch_one(owner: str, repo: str):
+        try:
+            get_scraper().prefetch_repo(owner, repo)
+        except Exception as e:
+            logger.debug(f"Prefetch of {owner}/{repo} failed: {e}")
+
+    def shutdown(self):
+        """Drop pending prefetches."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global search instance
+_repo_search: Optional[RepoSearch] = None
+_repo_search_lock = threading.Lock()
+
+
+def get_repo_search() -> RepoSearch:
+    """Get the global repository search instance."""
+    global _repo_search
+    with _repo_search_lock:
+        if _repo_search is None:
+            _repo_search = RepoSearch()
+        return _repo_search
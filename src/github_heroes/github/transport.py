@@ -0,0 +1,315 @@
+"""
+HTTP transports for the scraper's requests session.
+
+A transport is a requests transport adapter mounted for http:// and https://.
+The default one is a tuned urllib3 connection pool; with httpx installed
+(``pip install "httpx[http2]"``) an HTTP/2 capable client can be used instead.
+Both count requests per connection, so connection reuse can be inspected.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+from github_heroes.core.config import (
+    HTTP_TRANSPORT,
+    TRANSPORT_COMPRESSION,
+    TRANSPORT_KEEP_ALIVE,
+    TRANSPORT_POOL_CONNECTIONS,
+    TRANSPORT_POOL_MAXSIZE,
+)
+from github_heroes.core.logging_utils import get_logger
+
+try:
+    import httpx
+except ImportError:  # Optional dependency
+    httpx = None
+
+logger = get_logger(__name__)
+
+TRANSPORTS = ("requests", "http2")
+HTTP2_AVAILABLE = httpx is not None
+
+# Connections listed individually in the statistics (older ones only count
+# towards the totals)
+_MAX_TRACKED_CONNECTIONS = 256
+
+
+@dataclass
+class ConnectionStats:
+    """Requests sent over one connection."""
+
+    host: str
+    http_version: str
+    requests: int = 0
+
+
+class TransportStats:
+    """
+    Connection reuse statistics of a transport.
+
+    Every request is recorded with the connection it was sent on; a request
+    on a freshly opened connection starts a new entry, any other is a reuse.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self._connections: "OrderedDict[int, ConnectionStats]" = OrderedDict()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, connection_key: int, fresh: bool, http_version: str):
+        """Record a request sent on the connection identified by ``connection_key``."""
+        with self._lock:
+            self.requests += 1
+            host_totals = self._hosts.setdefault(
+                host, {"connections": 0, "requests": 0}
+            )
+            host_totals["requests"] += 1
+            entry = self._connections.get(connection_key)
+            if fresh or entry is None:
+                self.connections += 1
+                host_totals["connections"] += 1
+                entry = ConnectionStats(host, http_version)
+                self._connections.pop(connection_key, None)
+                self._connections[connection_key] = entry
+                while len(self._connections) > _MAX_TRACKED_CONNECTIONS:
+                    self._connections.popitem(last=False)
+            entry.requests += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Totals ("requests", "connections", "reused", "reuse_ratio") plus
+        "per_host" totals and "per_connection" entries, most recent last.
+        """
+        with self._lock:
+            connections = [
+                {
+                    "host": entry.host,
+                    "http_version": entry.http_version,
+                    "requests": entry.requests,
+                }
+                for entry in self._connections.values()
+            ]
+            per_host = {host: dict(totals) for host, totals in self._hosts.items()}
+            requests_sent, opened = self.requests, self.connections
+
+        reused = requests_sent - opened
+        return {
+            "requests": requests_sent,
+            "connections": opened,
+            "reused": reused,
+            "reuse_ratio": reused / requests_sent if requests_sent else 0.0,
+            "per_host": per_host,
+            "per_connection": connections,
+        }
+
+
+def _counting_pool(pool_class, stats: TransportStats):
+    """A urllib3 pool class that records every request in ``stats``."""
+
+    class CountingPool(pool_class):
+        def _make_request(self, conn, method, url, *args, **kwargs):
+            # A connection without a socket is (re)connected by this request
+            fresh = getattr(conn, "sock", None) is None
+            stats.record(self.host, id(conn), fresh, "HTTP/1.1")
+            return super()._make_request(conn, method, url, *args, **kwargs)
+
+    return CountingPool
+
+
+class RequestsTransport(HTTPAdapter):
+    """
+    urllib3 connection pool adapter with configurable sizes.
+
+    ``pool_connections`` hosts keep a pool each, of up to ``pool_maxsize``
+    idle connections (requests' default is 10, which leaves parallel
+    fetches to one host opening and dropping connections). Without
+    ``keep_alive`` every request closes its connection; ``compression``
+    advertises every content coding urllib3 can decode.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = TRANSPORT_POOL_CONNECTIONS,
+        pool_maxsize: int = TRANSPORT_POOL_MAXSIZE,
+        keep_alive: bool = TRANSPORT_KEEP_ALIVE,
+        compression: bool = TRANSPORT_COMPRESSION,
+    ):
+        self.stats = TransportStats()
+        self.keep_alive = keep_alive
+        self.accept_encoding = ACCEPT_ENCODING if compression else "identity"
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self.stats),
+            "https": _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request, **kwargs):
+        request.headers["Accept-Encoding"] = self.accept_encoding
+        if not self.keep_alive:
+            request.headers["Connection"] = "close"
+        return super().send(request, **kwargs)
+
+
+class _HTTPXBody:
+    """File-like view of a streamed httpx response, as requests reads it."""
+
+    def __init__(self, response):
+        self.response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b""
+
+    def read(self, amt: Optional[int] = None, **kwargs) -> bytes:
+        while self._chunks is not None and (amt is None or len(self._buffer) < amt):
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                self._chunks = None
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        self.response.close()
+
+
+class HTTPXTransport(BaseAdapter):
+    """
+    Adapter sending requests through an httpx client, over HTTP/2 where the
+    server supports it (GitHub does), so parallel fetches share one
+    multiplexed connection per host.
+
+    TLS verification, client certificates and proxies are fixed per httpx
+    client, so there is a client for each combination the session asks for
+    (usually just one), configured like requests would be.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = TRANSPORT_POOL_MAXSIZE,
+        keep_alive: bool = TRANSPORT_KEEP_ALIVE,
+        compression: bool = TRANSPORT_COMPRESSION,
+        http2: bool = True,
+    ):
+        if httpx is None:
+            raise RuntimeError(
+                'The HTTP/2 transport needs httpx: pip install "httpx[http2]"'
+            )
+        super().__init__()
+        self.stats = TransportStats()
+        self.accept_encoding = ACCEPT_ENCODING if compression else "identity"
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=None,
+            max_keepalive_connections=pool_maxsize if keep_alive else 0,
+        )
+        self._clients: Dict[Tuple[Any, Any, Optional[str]], "httpx.Client"] = {}
+        self._clients_lock = threading.Lock()
+
+    def _client(self, verify, cert, proxy: Optional[str]) -> "httpx.Client":
+        """The client for a TLS and proxy configuration, created on first use."""
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert, proxy)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                # requests already merged the environment's proxy and CA
+                # settings into the arguments, so httpx must not redo it
+                client = httpx.Client(
+                    http2=self.http2,
+                    limits=self.limits,
+                    verify=verify,
+                    cert=cert,
+                    proxy=proxy,
+                    trust_env=False,
+                    follow_redirects=False,
+                )
+                self._clients[key] = client
+            return client
+
+    @staticmethod
+    def _timeout(timeout: Union[None, float, Tuple[float, float]]):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        client = self._client(verify, cert, select_proxy(request.url, proxies or {}))
+        headers = dict(request.headers)
+        headers["Accept-Encoding"] = self.accept_encoding
+        connected = []
+        hx_request = client.build_request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=request.body,
+            timeout=self._timeout(timeout),
+            extensions={
+                "trace": lambda event, info: (
+                    connected.append(event)
+                    if event.startswith("connection.connect_tcp.complete")
+                    else None
+                )
+            },
+        )
+        try:
+            hx_response = client.send(hx_request, stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+
+        stream_id = id(hx_response.extensions.get("network_stream", hx_response))
+        self.stats.record(
+            hx_request.url.host, stream_id, bool(connected), hx_response.http_version
+        )
+
+        response = requests.Response()
+        response.status_code = hx_response.status_code
+        response.reason = hx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(hx_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _HTTPXBody(hx_response)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        with self._clients_lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+
+def create_transport(name: str = HTTP_TRANSPORT) -> BaseAdapter:
+    """
+    Create a transport by name ("requests" or "http2"). Without httpx the
+    HTTP/2 transport falls back to the requests one.
+    """
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {name}")
+    if name == "http2":
+        if HTTP2_AVAILABLE:
+            return HTTPXTransport()
+        logger.warning("httpx is not installed, using the requests transport")
+    return RequestsTransport()
@@ -2,7 +2,7 @@
 Main window for Github Heroes.
 """
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QIcon, QPixmap
 from PyQt6.QtWidgets import (
     QComboBox,
@@ -24,6 +24,8 @@ from github_heroes.core.config import (
     APP_VERSION,
     DEFAULT_WINDOW_HEIGHT,
     DEFAULT_WINDOW_WIDTH,
+    REFRESH_CHECK_INTERVAL,
+    REFRESH_MAX_AGE_HOURS,
 )
 from github_heroes.core.logging_utils import get_logger
 from github_heroes.data.database import get_db
@@ -31,13 +33,16 @@ from github_heroes.data.models import Player
 from github_heroes.data.repositories import (
     DungeonRoomRepository,
     EnemyRepository,
+    ImportJobRepository,
     PlayerRepository,
     QuestRepository,
     RepoWorldRepository,
 )
 from github_heroes.game.generators import build_repo_world
+from github_heroes.game.refresh import RefreshScheduler
 from github_heroes.game.state import get_game_state
-from github_heroes.github.scraper import GitHubScraper
+from github_heroes.github.parse_pool import reload_parse_pool, shutdown_parse_pool
+from github_heroes.github.scraper import GitHubScraper, get_scraper, reload_scraper
 from github_heroes.ui.widgets.combat_dialog import CombatDialog
 from github_heroes.ui.widgets.dungeon_view import DungeonView
 from github_heroes.ui.widgets.map_view import MapView
@@ -79,6 +84,27 @@ class ScrapingThread(QThread):
         self.progress.emit(value, status)
 
 
+class RefreshThread(QThread):
+    """Thread for refreshing stale worlds in background."""
+
+    world_refreshed = pyqtSignal(int)  # world id
+
+    def __init__(self, scheduler: RefreshScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
+    def run(self):
+        """Run one refresh pass in background."""
+        try:
+            self.scheduler.run_once(self.world_refreshed.emit)
+        except Exception as e:
+            logger.error(f"Error in refresh thread: {e}", exc_info=True)
+
+    def stop(self):
+        """Stop after the refreshes in progress."""
+        self.scheduler.stop()
+
+
 class NewPlayerDialog(QDialog):
     """Dialog for creating a new player."""
 
@@ -148,13 +174,20 @@ class MainWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
-        self.scraper = GitHubScraper()
         self.scraping_thread = None
         self.progress_dialog = None
+        self.import_dialog = None
+        self.refresh_thread = None
+        self.refreshed_worlds = 0
+        self.refresh_scheduler = RefreshScheduler(
+            max_age_hours=self.get_refresh_max_age()
+        )
         self.init_ui()
         self.load_settings()
         self.check_player()
         self.check_repositories()
+        self.check_import_queue()
+        self.start_refresh_timer()
 
     def init_ui(self):
         """Initialize UI."""
@@ -204,6 +237,7 @@ class MainWindow(QMainWindow):
         # Search panel (dockable)
         self.search_panel = SearchPanel()
         self.search_panel.repo_selected.connect(self.on_repo_selected)
+        self.search_panel.repos_queued.connect(self.on_repos_queued)
         self.addDockWidget(
             Qt.DockWidgetArea.RightDockWidgetArea,
             self.create_dock_widget("Add Repository", self.search_panel),
@@ -229,6 +263,10 @@ class MainWindow(QMainWindow):
         settings_action.triggered.connect(self.show_settings)
         file_menu.addAction(settings_action)
 
+        bulk_import_action = QAction("Bulk Import...", self)
+        bulk_import_action.triggered.connect(self.show_import_queue)
+        file_menu.addAction(bulk_import_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction("Exit", self)
@@ -335,6 +373,43 @@ class MainWindow(QMainWindow):
                 "Get started by adding your first repository now!",
             )
 
+    def check_import_queue(self):
+        """Report imports left over from a previous session."""
+        ImportJobRepository.reset_running()
+        pending = ImportJobRepository.get_counts()["pending"]
+        if pending:
+            self.status_bar.set_status(
+                f"{pending} repositories waiting in the import queue (File > Bulk Import)"
+            )
+
+    def show_import_queue(self):
+        """Show the bulk import dialog."""
+        if self.import_dialog is None:
+            from github_heroes.ui.widgets.import_queue_dialog import ImportQueueDialog
+
+            self.import_dialog = ImportQueueDialog(self)
+            self.import_dialog.imports_finished.connect(self.on_imports_finished)
+        self.import_dialog.show()
+        self.import_dialog.raise_()
+
+    def on_repos_queued(self, names: list):
+        """Handle repositories queued from the search panel."""
+        self.show_import_queue()
+        self.import_dialog.queue_repos(names)
+
+    def on_imports_finished(self):
+        """Refresh views after a bulk import."""
+        self.map_view.refresh_worlds()
+        self.quest_board.refresh_worlds()
+        self.dungeon_view.refresh_worlds()
+
+        game_state = get_game_state()
+        if game_state.current_player:
+            from github_heroes.game.achievements import check_achievements
+
+            check_achievements(game_state.current_player, {"repository_added": True})
+            self.player_view.refresh()
+
     def new_game(self):
         """Create a new game."""
         dialog = NewPlayerDialog(self)
@@ -399,7 +474,14 @@ class MainWindow(QMainWindow):
                 self.player_view.refresh()
 
     def on_repo_selected(self, owner: str, repo: str):
-        """Handle repository selection from search panel."""
+        """
+        Handle repository selection from search panel. A background refresh
+        or import of the same repository finishes first (see build_repo_world).
+        """
+        if self.scraping_thread and self.scraping_thread.isRunning():
+            self.status_bar.set_status("Another repository is still being processed")
+            return
+
         self.status_bar.set_status(f"Processing {owner}/{repo}...")
         self.status_bar.set_connection_status(False)
 
@@ -408,7 +490,7 @@ class MainWindow(QMainWindow):
         self.progress_dialog.show()
 
         # Start processing in background thread
-        self.scraping_thread = ScrapingThread(owner, repo, self.scraper)
+        self.scraping_thread = ScrapingThread(owner, repo, get_scraper())
         self.scraping_thread.finished.connect(self.on_scraping_finished)
         self.scraping_thread.error.connect(self.on_scraping_error)
         self.scraping_thread.progress.connect(self.on_scraping_progress)
@@ -481,14 +563,13 @@ class MainWindow(QMainWindow):
 
     def on_enter_dungeon(self, world_id: int):
         """Handle enter dungeon."""
-        # Auto-refresh if enabled
+        # Never wait for the network: stale data is refreshed in background
+        RepoWorldRepository.mark_visited(world_id)
         if self.should_auto_refresh():
             world = RepoWorldRepository.get_by_id(world_id)
-            if world:
-                self.on_repo_selected(world.owner, world.repo)
-                # Wait for processing to complete before switching view
-                # (This is a simple implementation - in production you'd use signals)
-                return
+            if world and self.refresh_scheduler.is_stale(world):
+                self.refresh_scheduler.prioritize(world_id)
+                self.run_background_refresh()
 
         self.stacked_widget.setCurrentIndex(2)  # Dungeon view
         self.dungeon_view.refresh_worlds()
@@ -527,6 +608,60 @@ class MainWindow(QMainWindow):
         auto_refresh = db.get_setting("auto_refresh", "false")
         return auto_refresh.lower() == "true"
 
+    def get_refresh_max_age(self) -> float:
+        """Get the maximum age of world data before it is refreshed (hours)."""
+        try:
+            return float(
+                get_db().get_setting(
+                    "refresh_max_age_hours", str(REFRESH_MAX_AGE_HOURS)
+                )
+            )
+        except ValueError:
+            return REFRESH_MAX_AGE_HOURS
+
+    def start_refresh_timer(self):
+        """Check for stale worlds periodically."""
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.run_background_refresh)
+        self.refresh_timer.start(REFRESH_CHECK_INTERVAL * 1000)
+        # First pass shortly after startup, once the window is up
+        QTimer.singleShot(60 * 1000, self.run_background_refresh)
+
+    def is_busy(self) -> bool:
+        """Check whether worlds are being built or refreshed."""
+        if self.scraping_thread and self.scraping_thread.isRunning():
+            return True
+        if self.import_dialog and self.import_dialog.is_running():
+            return True
+        return bool(self.refresh_thread and self.refresh_thread.isRunning())
+
+    def run_background_refresh(self):
+        """Refresh stale worlds in background when nothing else is running."""
+        if not self.should_auto_refresh() or self.is_busy():
+            return
+
+        self.refreshed_worlds = 0
+        self.refresh_thread = RefreshThread(self.refresh_scheduler)
+        self.refresh_thread.world_refreshed.connect(self.on_world_refreshed)
+        self.refresh_thread.finished.connect(self.on_refresh_finished)
+        self.refresh_thread.start()
+
+    def on_world_refreshed(self, world_id: int):
+        """Update the views showing a refreshed world."""
+        self.refreshed_worlds += 1
+        if self.dungeon_view.current_world_id == world_id:
+            self.dungeon_view.refresh_rooms(world_id)
+        if self.quest_board.current_world_id == world_id:
+            self.quest_board.refresh_quests(world_id)
+
+    def on_refresh_finished(self):
+        """Handle the end of a background refresh pass."""
+        if self.refreshed_worlds:
+            self.map_view.refresh_worlds()
+            self.status_bar.set_status(
+                f"Refreshed {self.refreshed_worlds} repositories in background"
+            )
+
     def on_start_quest(self, quest_id: int):
         """Handle quest start."""
         quest = QuestRepository.get_by_id(quest_id)
@@ -708,10 +843,10 @@ class MainWindow(QMainWindow):
 
         dialog = SettingsDialog(self)
         if dialog.exec():
-            # Reload scraper with new token if changed
-            db = get_db()
-            token = db.get_setting("github_token", "")
-            self.scraper = GitHubScraper(api_token=token if token else None)
+            # Reload the shared scraper with the new token if changed
+            reload_scraper()
+            reload_parse_pool()
+            self.refresh_scheduler.max_age_hours = self.get_refresh_max_age()
             logger.info("Settings updated, processor reloaded")
 
     def show_about(self):
@@ -769,5 +904,14 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event."""
+        if self.import_dialog and self.import_dialog.is_running():
+            # Unfinished jobs stay queued and resume next time
+            self.import_dialog.stop_imports()
+            self.import_dialog.import_thread.wait()
+        if self.refresh_thread and self.refresh_thread.isRunning():
+            self.refresh_thread.stop()
+            self.refresh_thread.wait()
+        self.search_panel.stop_search()
+        shutdown_parse_pool()
         self.save_settings()
         event.accept()
@@ -0,0 +1,222 @@
+"""
+Bulk import dialog for queueing many repositories at once.
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import (
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QPlainTextEdit,
+    QProgressBar,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
+
+from github_heroes.core.config import IMPORT_WORKERS
+from github_heroes.core.logging_utils import get_logger
+from github_heroes.data.database import get_db
+from github_heroes.data.repositories import ImportJobRepository
+from github_heroes.game.import_queue import ImportQueue, enqueue_repos, parse_repo_names
+from github_heroes.github.scraper import GitHubScraper, get_scraper
+
+logger = get_logger(__name__)
+
+
+class ImportQueueThread(QThread):
+    """Thread running the import queue workers."""
+
+    progress = pyqtSignal(dict)  # job counts per status + "current"
+
+    def __init__(self, scraper: GitHubScraper, workers: int):
+        super().__init__()
+        self.queue = ImportQueue(scraper, workers)
+
+    def run(self):
+        """Run the queue in background."""
+        try:
+            self.queue.run(self.progress.emit)
+        except Exception as e:
+            logger.error(f"Error in import queue thread: {e}", exc_info=True)
+
+    def stop(self):
+        """Stop after the jobs currently being built."""
+        self.queue.stop()
+
+
+class ImportQueueDialog(QDialog):
+    """
+    Dialog for adding repositories to the import queue and running it.
+    """
+
+    imports_finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.import_thread = None
+        self.setWindowTitle("Bulk Import")
+        self.setMinimumWidth(500)
+        self.setMinimumHeight(450)
+        self.init_ui()
+        self.refresh_counts()
+
+    def init_ui(self):
+        """Initialize UI."""
+        layout = QVBoxLayout()
+
+        info_label = QLabel(
+            "Enter one repository per line (owner/repo or GitHub URL), "
+            "or load them from a text file."
+        )
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        self.names_input = QPlainTextEdit()
+        self.names_input.setPlaceholderText("owner/repo\nhttps://github.com/owner/repo")
+        layout.addWidget(self.names_input)
+
+        input_buttons = QHBoxLayout()
+        load_btn = QPushButton("Load from File...")
+        load_btn.clicked.connect(self.load_from_file)
+        input_buttons.addWidget(load_btn)
+
+        add_btn = QPushButton("Add to Queue")
+        add_btn.clicked.connect(self.add_to_queue)
+        input_buttons.addWidget(add_btn)
+        layout.addLayout(input_buttons)
+
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Parallel imports:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setMinimum(1)
+        self.workers_spin.setMaximum(16)
+        self.workers_spin.setValue(
+            int(get_db().get_setting("import_workers", str(IMPORT_WORKERS)))
+        )
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+        layout.addLayout(workers_layout)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMinimum(0)
+        layout.addWidget(self.progress_bar)
+
+        run_buttons = QHBoxLayout()
+        self.start_btn = QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_imports)
+        run_buttons.addWidget(self.start_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_imports)
+        run_buttons.addWidget(self.stop_btn)
+
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.clear_finished)
+        run_buttons.addWidget(clear_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.hide)
+        run_buttons.addWidget(close_btn)
+        layout.addLayout(run_buttons)
+
+        self.setLayout(layout)
+
+    def load_from_file(self):
+        """Load repository names from a text file."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Repository List", "", "Text Files (*.txt);;All Files (*)"
+        )
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.names_input.setPlainText(f.read())
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not read file:\n{e}")
+
+    def add_to_queue(self):
+        """Queue the repositories entered in the text box."""
+        names = parse_repo_names(self.names_input.toPlainText())
+        if not names:
+            QMessageBox.warning(self, "Error", "No valid repository names found")
+            return
+        self.queue_repos(names)
+        self.names_input.clear()
+
+    def queue_repos(self, names):
+        """Queue a list of (owner, repo) tuples."""
+        added = enqueue_repos(names)
+        self.refresh_counts()
+        self.status_label.setText(
+            f"Queued {added} repositories ({len(names) - added} already queued)"
+        )
+
+    def start_imports(self):
+        """Start processing the queue."""
+        if self.import_thread and self.import_thread.isRunning():
+            return
+        workers = self.workers_spin.value()
+        get_db().set_setting("import_workers", str(workers))
+
+        self.import_thread = ImportQueueThread(get_scraper(), workers)
+        self.import_thread.progress.connect(self.on_progress)
+        self.import_thread.finished.connect(self.on_finished)
+        self.import_thread.start()
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+
+    def stop_imports(self):
+        """Stop processing after the current jobs."""
+        if self.import_thread:
+            self.import_thread.stop()
+            self.stop_btn.setEnabled(False)
+            self.status_label.setText("Stopping after current imports...")
+
+    def clear_finished(self):
+        """Remove finished jobs from the queue."""
+        ImportJobRepository.clear_finished()
+        self.refresh_counts()
+
+    def on_progress(self, counts: dict):
+        """Update aggregate progress."""
+        self.update_counts(counts)
+        self.status_label.setText(f"Importing... last: {counts.get('current', '')}")
+
+    def on_finished(self):
+        """Handle queue completion."""
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.refresh_counts()
+        counts = ImportJobRepository.get_counts()
+        self.status_label.setText(
+            f"Finished: {counts['done']} imported, {counts['failed']} failed, "
+            f"{counts['pending']} pending"
+        )
+        self.imports_finished.emit()
+
+    def refresh_counts(self):
+        """Reload job counts from the database."""
+        self.update_counts(ImportJobRepository.get_counts())
+
+    def update_counts(self, counts: dict):
+        """Show job counts on the progress bar."""
+        total = (
+            counts["pending"] + counts["running"] + counts["done"] + counts["failed"]
+        )
+        finished = counts["done"] + counts["failed"]
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(finished)
+        self.progress_bar.setFormat(
+            f"{finished}/{total} ({counts['failed']} failed, {counts['running']} running)"
+        )
+
+    def is_running(self) -> bool:
+        """Check whether imports are in progress."""
+        return bool(self.import_thread and self.import_thread.isRunning())
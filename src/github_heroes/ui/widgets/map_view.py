@@ -20,6 +20,7 @@ from github_heroes.data.repositories import (
     QuestRepository,
     DungeonRoomRepository,
 )
+from github_heroes.game.similarity import get_similarity_index
 from github_heroes.core.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -57,9 +58,9 @@ class MapView(QWidget):
 
         # Details panel
         details_group = QGroupBox("World Details")
-        details_layout = QHBoxLayout()  # Changed to horizontal layout for 3 columns
+        details_layout = QHBoxLayout()  # Changed to horizontal layout for 4 columns
 
-        # Create 3 column widgets
+        # Create 4 column widgets
         self.stats_label = QLabel("Select a world to view details")
         self.stats_label.setWordWrap(True)
         self.stats_label.setAlignment(Qt.AlignmentFlag.AlignTop)
@@ -72,9 +73,14 @@ class MapView(QWidget):
         self.enemy_label.setWordWrap(True)
         self.enemy_label.setAlignment(Qt.AlignmentFlag.AlignTop)
 
+        self.related_label = QLabel("")
+        self.related_label.setWordWrap(True)
+        self.related_label.setAlignment(Qt.AlignmentFlag.AlignTop)
+
         details_layout.addWidget(self.stats_label, stretch=1)
         details_layout.addWidget(self.content_label, stretch=1)
         details_layout.addWidget(self.enemy_label, stretch=1)
+        details_layout.addWidget(self.related_label, stretch=1)
 
         # Action buttons - stacked vertically
         buttons_layout = QVBoxLayout()
@@ -150,6 +156,7 @@ class MapView(QWidget):
             self.stats_label.setText("Select a world to view details")
             self.content_label.setText("")
             self.enemy_label.setText("")
+            self.related_label.setText("")
 
         for world in worlds:
             # Get main enemy
@@ -180,6 +187,7 @@ class MapView(QWidget):
         self.stats_label.setText("Select a world to view details")
         self.content_label.setText("")
         self.enemy_label.setText("")
+        self.related_label.setText("")
         self.enter_btn.setEnabled(False)
         self.quest_btn.setEnabled(False)
         self.refresh_btn.setEnabled(False)
@@ -234,9 +242,24 @@ class MapView(QWidget):
             enemy_text = "<b>Main Enemy:</b><br>"
             enemy_text += "No enemy data"
 
+        # Build related dungeons column text (README and file type overlap)
+        related_text = "<b>Related Dungeons:</b><br>"
+        related_worlds = []
+        for related_id, similarity in get_similarity_index().related(world_id):
+            related_world = RepoWorldRepository.get_by_id(related_id)
+            if related_world:
+                related_worlds.append(
+                    f"{related_world.full_name} ({similarity:.0%})<br>"
+                )
+        if related_worlds:
+            related_text += "".join(related_worlds)
+        else:
+            related_text += "No related dungeons yet"
+
         self.stats_label.setText(stats_text)
         self.content_label.setText(content_text)
         self.enemy_label.setText(enemy_text)
+        self.related_label.setText(related_text)
         self.enter_btn.setEnabled(True)
         self.quest_btn.setEnabled(True)
         self.refresh_btn.setEnabled(True)
@@ -273,7 +296,8 @@ class MapView(QWidget):
             reply = QMessageBox.question(
                 self,
                 "Refresh Repository",
-                "This will reset dungeon progress for this repo",
+                "This will re-fetch the repository and update its dungeon.\n"
+                "Visited rooms and started or completed quests are kept.",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No
             )
@@ -4,8 +4,9 @@ Search panel for adding repositories.
 
 import re
 
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
     QHBoxLayout,
     QLabel,
     QLineEdit,
@@ -18,21 +19,45 @@ from PyQt6.QtWidgets import (
 )
 
 from github_heroes.core.logging_utils import get_logger
-from github_heroes.github.scraper import GitHubScraper
+from github_heroes.github.search import get_repo_search
 
 logger = get_logger(__name__)
 
 
+class SearchThread(QThread):
+    """Thread for running a repository search in background."""
+
+    results_ready = pyqtSignal(str, object)  # query, ["owner/repo", ...] or None
+
+    def __init__(self, query: str):
+        super().__init__()
+        self.query = query
+
+    def run(self):
+        """Search, then prefetch the top results."""
+        results = None
+        try:
+            search = get_repo_search()
+            results = search.search(self.query)
+            if results:
+                search.prefetch(results)
+        except Exception as e:
+            logger.error(f"Error in search thread: {e}", exc_info=True)
+        self.results_ready.emit(self.query, results)
+
+
 class SearchPanel(QWidget):
     """
     Panel for searching and adding GitHub repositories.
     """
 
     repo_selected = pyqtSignal(str, str)  # owner, repo
+    repos_queued = pyqtSignal(list)  # [(owner, repo), ...] for bulk import
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.scraper = GitHubScraper()
+        self.search_threads = []
+        self.current_query = None
         self.init_ui()
 
     def init_ui(self):
@@ -64,8 +89,15 @@ class SearchPanel(QWidget):
         # Results list
         results_label = QLabel("Search Results:")
         self.results_list = QListWidget()
+        self.results_list.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection
+        )
         self.results_list.itemDoubleClicked.connect(self.on_result_selected)
 
+        queue_btn = QPushButton("Queue Selected for Import")
+        queue_btn.setToolTip("Add the selected results to the bulk import queue")
+        queue_btn.clicked.connect(self.queue_selected)
+
         # Layout
         layout.addLayout(url_layout)
         layout.addWidget(add_url_btn)
@@ -75,6 +107,7 @@ class SearchPanel(QWidget):
         layout.addWidget(search_btn)
         layout.addWidget(results_label)
         layout.addWidget(self.results_list)
+        layout.addWidget(queue_btn)
 
         self.setLayout(layout)
 
@@ -96,35 +129,47 @@ class SearchPanel(QWidget):
         self.url_input.clear()
 
     def search_repos(self):
-        """Search for repositories."""
+        """Search for repositories in background."""
         query = self.search_input.text().strip()
         if not query:
             QMessageBox.warning(self, "Error", "Please enter a search query")
             return
 
+        self.current_query = query
+        results = get_repo_search().cached(query)
+        if results is not None:
+            self.show_results(results)
+            get_repo_search().prefetch(results)
+            return
+
         self.results_list.clear()
         self.results_list.addItem("Searching...")
 
-        # Search (simplified - would need proper parsing)
-        html = self.scraper.search_repos_html(query)
-        if html:
-            # Simple parsing - in production would use proper parser
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(html, "html.parser")
-            self.results_list.clear()
-
-            # Find repo links
-            for link in soup.select('a[href*="/"][href*="/"][href*="/"]'):
-                href = link.get("href", "")
-                if href.startswith("/") and href.count("/") == 2:
-                    owner_repo = href.strip("/")
-                    if owner_repo and "/" in owner_repo:
-                        item = QListWidgetItem(owner_repo)
-                        self.results_list.addItem(item)
-        else:
-            self.results_list.clear()
+        thread = SearchThread(query)
+        thread.results_ready.connect(self.on_search_finished)
+        thread.finished.connect(lambda: self.search_threads.remove(thread))
+        self.search_threads.append(thread)
+        thread.start()
+
+    def on_search_finished(self, query: str, results):
+        """Show results, unless a newer search was started meanwhile."""
+        if query == self.current_query:
+            self.show_results(results)
+
+    def show_results(self, results):
+        """Fill the results list."""
+        self.results_list.clear()
+        if not results:
             self.results_list.addItem("No results found")
+            return
+        for owner_repo in results:
+            self.results_list.addItem(QListWidgetItem(owner_repo))
+
+    def stop_search(self):
+        """Wait for searches still running (e.g. before closing)."""
+        for thread in list(self.search_threads):
+            thread.wait()
+        get_repo_search().shutdown()
 
     def on_result_selected(self, item: QListWidgetItem):
         """Handle result selection."""
@@ -134,3 +179,15 @@ class SearchPanel(QWidget):
             if len(parts) >= 2:
                 owner, repo = parts[0], parts[1]
                 self.repo_selected.emit(owner, repo)
+
+    def queue_selected(self):
+        """Send the selected results to the bulk import queue."""
+        names = []
+        for item in self.results_list.selectedItems():
+            parts = item.text().split("/")
+            if len(parts) >= 2:
+                names.append((parts[0], parts[1]))
+        if not names:
+            QMessageBox.warning(self, "Error", "Select one or more search results")
+            return
+        self.repos_queued.emit(names)
@@ -2,6 +2,8 @@
 Settings dialog for Github Heroes.
 """
 
+import os
+
 from PyQt6.QtWidgets import (
     QCheckBox,
     QDialog,
@@ -16,8 +18,18 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from github_heroes.core.config import (
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_TRANSPORT,
+    PARSE_WORKERS,
+    REFRESH_MAX_AGE_HOURS,
+)
 from github_heroes.core.logging_utils import get_logger
 from github_heroes.data.database import get_db
+from github_heroes.github.http_cache import get_response_cache
+from github_heroes.github.parse_cache import get_parse_cache
+from github_heroes.github.scraper import get_scraper
+from github_heroes.github.transport import HTTP2_AVAILABLE
 
 logger = get_logger(__name__)
 
@@ -78,6 +90,70 @@ class SettingsDialog(QDialog):
         branch_layout.addWidget(self.branch_input)
         github_layout.addLayout(branch_layout)
 
+        # Response cache
+        cache_layout = QHBoxLayout()
+        cache_label = QLabel("Response Cache Size:")
+        cache_label.setToolTip(
+            "Downloaded pages are kept on disk and revalidated on refresh, "
+            "so unchanged repositories refresh almost instantly"
+        )
+        cache_layout.addWidget(cache_label)
+
+        self.cache_size_spin = QSpinBox()
+        self.cache_size_spin.setMinimum(1)
+        self.cache_size_spin.setMaximum(4096)
+        self.cache_size_spin.setSuffix(" MB")
+        cache_layout.addWidget(self.cache_size_spin)
+        cache_layout.addStretch()
+        github_layout.addLayout(cache_layout)
+
+        stats = get_response_cache().stats()
+        parse_stats = get_parse_cache().stats()
+        self.cache_stats_label = QLabel(
+            f"{stats['entries']} cached pages ({stats['bytes'] / (1024 * 1024):.1f} MB), "
+            f"{stats['hits']} hits / {stats['misses']} misses this session\n"
+            f"{parse_stats['entries']} cached parse results, "
+            f"{parse_stats['hits']} pages not parsed again this session"
+        )
+        self.cache_stats_label.setStyleSheet("color: gray;")
+        github_layout.addWidget(self.cache_stats_label)
+
+        # HTTP transport
+        self.http2_checkbox = QCheckBox("Use HTTP/2 connections")
+        if HTTP2_AVAILABLE:
+            self.http2_checkbox.setToolTip(
+                "Multiplex parallel downloads over one connection per host"
+            )
+        else:
+            self.http2_checkbox.setEnabled(False)
+            self.http2_checkbox.setToolTip('Requires httpx: pip install "httpx[http2]"')
+        github_layout.addWidget(self.http2_checkbox)
+
+        transport_stats = get_scraper().transport_stats()
+        self.transport_stats_label = QLabel(
+            f"{transport_stats['requests']} requests over "
+            f"{transport_stats['connections']} connections this session "
+            f"({transport_stats['reuse_ratio']:.0%} reused)"
+        )
+        self.transport_stats_label.setStyleSheet("color: gray;")
+        github_layout.addWidget(self.transport_stats_label)
+
+        # Parser processes
+        parse_workers_layout = QHBoxLayout()
+        parse_workers_label = QLabel("Parser Processes:")
+        parse_workers_label.setToolTip(
+            "Pages are parsed in separate processes so imports don't slow down the game.\n"
+            "0 parses in the game process."
+        )
+        parse_workers_layout.addWidget(parse_workers_label)
+
+        self.parse_workers_spin = QSpinBox()
+        self.parse_workers_spin.setMinimum(0)
+        self.parse_workers_spin.setMaximum(max(PARSE_WORKERS, os.cpu_count() or 1))
+        parse_workers_layout.addWidget(self.parse_workers_spin)
+        parse_workers_layout.addStretch()
+        github_layout.addLayout(parse_workers_layout)
+
         github_group.setLayout(github_layout)
         layout.addWidget(github_group)
 
@@ -86,12 +162,25 @@ class SettingsDialog(QDialog):
         game_layout = QVBoxLayout()
 
         # Auto-refresh
-        self.auto_refresh_checkbox = QCheckBox("Auto-refresh repo data on enter")
+        self.auto_refresh_checkbox = QCheckBox("Auto-refresh repo data in background")
         self.auto_refresh_checkbox.setToolTip(
-            "Automatically refresh repository data when entering a dungeon"
+            "Refresh repositories whose data is getting old while the game is idle,\n"
+            "starting with the dungeons you visited most recently"
         )
         game_layout.addWidget(self.auto_refresh_checkbox)
 
+        refresh_age_layout = QHBoxLayout()
+        refresh_age_label = QLabel("Maximum data age (hours):")
+        refresh_age_label.setToolTip("Repository data older than this gets refreshed")
+        refresh_age_layout.addWidget(refresh_age_label)
+
+        self.refresh_age_spin = QSpinBox()
+        self.refresh_age_spin.setMinimum(1)
+        self.refresh_age_spin.setMaximum(24 * 30)
+        refresh_age_layout.addWidget(self.refresh_age_spin)
+        refresh_age_layout.addStretch()
+        game_layout.addLayout(refresh_age_layout)
+
         # Combat text speed
         combat_speed_layout = QHBoxLayout()
         combat_speed_label = QLabel("Combat Text Speed (ms delay):")
@@ -168,9 +257,36 @@ class SettingsDialog(QDialog):
         branch = db.get_setting("default_branch", "")
         self.branch_input.setText(branch)
 
+        # Response cache size
+        cache_mb = db.get_setting(
+            "http_cache_max_mb", str(HTTP_CACHE_MAX_BYTES // (1024 * 1024))
+        )
+        try:
+            self.cache_size_spin.setValue(int(cache_mb))
+        except ValueError:
+            self.cache_size_spin.setValue(HTTP_CACHE_MAX_BYTES // (1024 * 1024))
+
+        # HTTP transport
+        transport = db.get_setting("http_transport", HTTP_TRANSPORT)
+        self.http2_checkbox.setChecked(HTTP2_AVAILABLE and transport == "http2")
+
+        # Parser processes
+        parse_workers = db.get_setting("parse_workers", str(PARSE_WORKERS))
+        try:
+            self.parse_workers_spin.setValue(int(parse_workers))
+        except ValueError:
+            self.parse_workers_spin.setValue(PARSE_WORKERS)
+
         # Auto-refresh
         auto_refresh = db.get_setting("auto_refresh", "false")
         self.auto_refresh_checkbox.setChecked(auto_refresh.lower() == "true")
+        refresh_age = db.get_setting(
+            "refresh_max_age_hours", str(REFRESH_MAX_AGE_HOURS)
+        )
+        try:
+            self.refresh_age_spin.setValue(int(float(refresh_age)))
+        except ValueError:
+            self.refresh_age_spin.setValue(REFRESH_MAX_AGE_HOURS)
 
         # Combat speed
         combat_speed = db.get_setting("combat_text_speed", "0")
@@ -197,11 +313,26 @@ class SettingsDialog(QDialog):
         else:
             db.set_setting("default_branch", "")
 
+        # Response cache size
+        cache_mb = self.cache_size_spin.value()
+        db.set_setting("http_cache_max_mb", str(cache_mb))
+        get_response_cache().set_max_bytes(cache_mb * 1024 * 1024)
+
+        # HTTP transport (applied when the scraper is reloaded)
+        db.set_setting(
+            "http_transport",
+            "http2" if self.http2_checkbox.isChecked() else "requests",
+        )
+
+        # Parser processes (applied when the parse pool is reloaded)
+        db.set_setting("parse_workers", str(self.parse_workers_spin.value()))
+
         # Auto-refresh
         db.set_setting(
             "auto_refresh",
             "true" if self.auto_refresh_checkbox.isChecked() else "false",
         )
+        db.set_setting("refresh_max_age_hours", str(self.refresh_age_spin.value()))
 
         # Combat speed
         db.set_setting("combat_text_speed", str(self.combat_speed_spin.value()))
@@ -220,7 +351,13 @@ class SettingsDialog(QDialog):
         if reply == QMessageBox.StandardButton.Yes:
             self.token_input.clear()
             self.branch_input.clear()
+            self.cache_size_spin.setValue(HTTP_CACHE_MAX_BYTES // (1024 * 1024))
+            self.http2_checkbox.setChecked(
+                HTTP2_AVAILABLE and HTTP_TRANSPORT == "http2"
+            )
+            self.parse_workers_spin.setValue(PARSE_WORKERS)
             self.auto_refresh_checkbox.setChecked(False)
+            self.refresh_age_spin.setValue(REFRESH_MAX_AGE_HOURS)
             self.combat_speed_spin.setValue(0)
 
     def reset_database(self):
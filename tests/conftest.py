@@ -0,0 +1,116 @@
+"""
+Shared test fixtures.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple, Union
+from urllib.parse import urlsplit
+
+import pytest
+
+from github_heroes.data.database import Database, set_db
+from github_heroes.game import similarity
+from github_heroes.github import branch_cache, parse_pool
+from github_heroes.github.parse_pool import ParsePool
+
+# A route answers with a body, a (status, headers, body) tuple, or a
+# function of the request headers returning either
+Route = Union[str, bytes, Tuple[int, Dict[str, str], Union[str, bytes]], Callable]
+
+
+class StandInServer:
+    """
+    A local HTTP server answering GET and HEAD requests from ``routes``, by
+    path without the query string; other paths get a 404. Every request is
+    recorded in ``requests`` as (method, path with query, headers).
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, Route] = {}
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._answer(self, send_body=True)
+
+            def do_HEAD(self):
+                server._answer(self, send_body=False)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def paths(self, method: str = "GET") -> List[str]:
+        """Paths (with query) requested with ``method``, in order."""
+        with self._lock:
+            return [path for m, path, _ in self.requests if m == method]
+
+    def _answer(self, handler: BaseHTTPRequestHandler, send_body: bool):
+        headers = dict(handler.headers)
+        with self._lock:
+            self.requests.append((handler.command, handler.path, headers))
+        route = self.routes.get(urlsplit(handler.path).path)
+        if callable(route):
+            route = route(headers)
+        if route is None:
+            status, extra, body = 404, {}, b""
+        elif isinstance(route, tuple):
+            status, extra, body = route
+        else:
+            status, extra, body = 200, {}, route
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        handler.send_response(status)
+        for name, value in extra.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if send_body:
+            handler.wfile.write(body)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A scratch database used as the global one."""
+    database = Database(tmp_path / "test.db")
+    set_db(database)
+    yield database
+    set_db(None)
+    database.close()
+
+
+@pytest.fixture
+def world_build(db, monkeypatch):
+    """
+    A scratch database plus fresh global state for world builds: parsing
+    inline, and a branch cache and similarity index of this database.
+    """
+    monkeypatch.setattr(parse_pool, "_parse_pool", ParsePool(0))
+    monkeypatch.setattr(branch_cache, "_branch_cache", None)
+    monkeypatch.setattr(similarity, "_similarity_index", None)
+    yield db
+
+
+@pytest.fixture
+def server():
+    """A local stand-in for GitHub (see StandInServer)."""
+    stand_in = StandInServer()
+    yield stand_in
+    stand_in.close()
@@ -0,0 +1,132 @@
+"""
+Tests for building a world with the REST API backend, against a local
+stand-in for api.github.com.
+"""
+
+import json
+import time
+
+from github_heroes.data.models import PullRequestData
+from github_heroes.data.repositories import (
+    DungeonRoomRepository,
+    EnemyRepository,
+    QuestRepository,
+)
+from github_heroes.game.generators import build_repo_world
+from github_heroes.github.analyzers import compute_pr_boss_level
+from github_heroes.github.scheduler import RequestScheduler
+from github_heroes.github.scraper import GitHubScraper
+
+REPO = {
+    "name": "r",
+    "description": "A test repository",
+    "language": "Python",
+    "stargazers_count": 1200,
+    "forks_count": 34,
+    "watchers_count": 1200,
+    "subscribers_count": 9,
+    "default_branch": "main",
+}
+TREE = {
+    "tree": [
+        {"path": "setup.py", "type": "blob", "size": 120},
+        {"path": "src", "type": "tree"},
+        {"path": "src/app.py", "type": "blob", "size": 800},
+    ]
+}
+ISSUES = [
+    {"number": 3, "title": "Crash on start", "state": "open", "comments": 4},
+    {"number": 4, "title": "Add caching", "state": "open", "pull_request": {}},
+    {"number": 8, "title": "Docs typo", "state": "open", "labels": [{"name": "docs"}]},
+]
+PULLS = [
+    {"number": 4, "title": "Add caching", "state": "open", "merged_at": None},
+    {"number": 6, "title": "Bump version", "state": "open", "merged_at": None},
+]
+PULL_4 = dict(PULLS[0], comments=7, additions=900, deletions=200)
+COMMITS = [
+    {
+        "sha": "abcdef1234567890",
+        "commit": {
+            "message": "Fix crash\n\nDetails",
+            "author": {"name": "A. Dev", "date": "2024-01-01T00:00:00Z"},
+        },
+    }
+]
+
+
+def rate_limited_once(body: str):
+    """A route answering with an exhausted rate limit once, then ``body``."""
+    calls = []
+
+    def route(headers):
+        calls.append(headers)
+        if len(calls) == 1:
+            reset = str(int(time.time()))
+            return 403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}, ""
+        return 200, {"X-RateLimit-Remaining": "4999"}, body
+
+    return route
+
+
+def test_build_world_from_api(world_build, server):
+    server.routes.update(
+        {
+            "/repos/o/r": json.dumps(REPO),
+            "/repos/o/r/readme": "# r\n\nInstall with `pip install r`.\n",
+            "/repos/o/r/git/trees/main": json.dumps(TREE),
+            "/repos/o/r/issues": rate_limited_once(json.dumps(ISSUES)),
+            "/repos/o/r/pulls": json.dumps(PULLS),
+            "/repos/o/r/pulls/4": json.dumps(PULL_4),
+            "/repos/o/r/commits": json.dumps(COMMITS),
+        }
+    )
+    scraper = GitHubScraper(
+        api_token="secret",
+        use_cache=False,
+        backend="api",
+        api_base_url=server.url,
+        scheduler=RequestScheduler(
+            rate=1000, burst=100, backoff_base=0.01, backoff_max=0.05
+        ),
+    )
+
+    world = build_repo_world("o", "r", scraper)
+
+    assert (world.stars, world.forks, world.watchers) == (1200, 34, 9)
+    assert world.primary_language == "Python"
+    rooms = DungeonRoomRepository.get_by_world_id(world.id)
+    assert sorted(room.file_path for room in rooms) == ["setup.py", "src/app.py"]
+    quests = QuestRepository.get_by_world_id(world.id)
+    assert sorted((q.source_type, q.source_number) for q in quests) == [
+        ("issue", 3),
+        ("issue", 8),
+        ("pr", 4),
+        ("pr", 6),
+    ]
+
+    # The rate limited issues page was retried
+    issue_requests = [p for p in server.paths() if p.startswith("/repos/o/r/issues")]
+    assert len(issue_requests) == 2
+    assert all(
+        headers.get("Authorization") == "token secret"
+        for _, _, headers in server.requests
+    )
+
+    # PR bosses are sized from each PR's details, or the list if unavailable
+    assert "/repos/o/r/pulls/4" in server.paths()
+    assert "/repos/o/r/pulls/6" in server.paths()
+    main_level = EnemyRepository.get_by_id(world.main_enemy_id).level
+    levels = {
+        enemy.name.split(":")[0]: enemy.level
+        for enemy in EnemyRepository.get_by_world_id(world.id)
+        if enemy.is_boss
+    }
+    assert levels == {
+        "PR #4": compute_pr_boss_level(
+            PullRequestData(pr_number=4, comment_count=7, additions=900, deletions=200),
+            main_level,
+        ),
+        "PR #6": compute_pr_boss_level(PullRequestData(pr_number=6), main_level),
+    }
+    assert levels["PR #4"] > levels["PR #6"]
@@ -0,0 +1,144 @@
+"""
+Tests for batch README and structure analysis.
+"""
+
+import json
+import random
+from dataclasses import asdict
+from types import SimpleNamespace
+
+import pytest
+
+from github_heroes.data.models import TreeEntry
+from github_heroes.data.repositories import ImportJobRepository
+from github_heroes.game import import_queue
+from github_heroes.github import analyzers
+from github_heroes.github.analyzers import (
+    compute_readme_features,
+    compute_readme_features_batch,
+    compute_structure_features,
+    compute_structure_features_batch,
+)
+from github_heroes.github.parse_pool import ParsePool, set_parse_pool
+
+WORDS = [
+    "api",
+    "server",
+    "react",
+    "cli",
+    "command-line",
+    "machine learning",
+    "deep learning",
+    "Django",
+    "the",
+    "a",
+    "install",
+    "run",
+    "café",
+    "naïve",
+    "2024",
+    "v1",
+    "foo_bar",
+    "x",
+    "Shell",
+    "parsing",
+]
+
+
+def random_readme(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(1, 30)):
+        if rng.random() < 0.2:
+            lines.append("#" * rng.randint(1, 3) + " " + rng.choice(WORDS))
+        else:
+            words = rng.choices(WORDS, k=rng.randint(0, 12))
+            lines.append(rng.choice([" ", ", ", "  ", " - "]).join(words))
+    return "\n".join(lines) + rng.choice(["", "\n"])
+
+
+def random_tree(rng: random.Random) -> list:
+    entries = []
+    for _ in range(rng.randint(0, 40)):
+        depth = rng.randint(0, 3)
+        parts = [rng.choice(["src", "docs", "tests", "lib"]) for _ in range(depth)]
+        if rng.random() < 0.3:
+            parts.append(rng.choice(["pkg", "util", "data"]))
+            entries.append(TreeEntry(path="/".join(parts), is_dir=True))
+        else:
+            extension = rng.choice(["py", "md", "js", "txt", None])
+            name = f"file{rng.randint(0, 9)}" + (f".{extension}" if extension else "")
+            parts.append(name)
+            entries.append(TreeEntry(path="/".join(parts), file_type=extension))
+    return entries
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request, monkeypatch):
+    """Run a test with the NumPy batch path and with the plain loop."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(analyzers, "np", None)
+    return request.param
+
+
+def test_readme_batch_matches_single(backend):
+    rng = random.Random(7)
+    texts = [random_readme(rng) for _ in range(60)] + [None, "", "\n", "a"]
+    batch = compute_readme_features_batch(texts, top_words=10)
+    for text, features in zip(texts, batch):
+        expected = compute_readme_features(text or "", top_words=10)
+        # Dumped as JSON to compare key order as well
+        assert json.dumps(asdict(features)) == json.dumps(asdict(expected))
+
+
+def test_structure_batch_matches_single(backend):
+    rng = random.Random(11)
+    listings = [random_tree(rng) for _ in range(60)] + [[]]
+    batch = compute_structure_features_batch(listings)
+    for entries, features in zip(listings, batch):
+        expected = compute_structure_features(entries)
+        assert json.dumps(features) == json.dumps(expected)
+
+
+def test_import_queue_analyzes_rounds_in_batch(db, monkeypatch):
+    rng = random.Random(3)
+    sources = {
+        f"owner/repo{index}": (random_readme(rng), random_tree(rng))
+        for index in range(5)
+    }
+    for full_name in sources:
+        ImportJobRepository.enqueue(*full_name.split("/"))
+
+    def fetch_repo_pages(owner, repo, scraper):
+        readme, tree = sources[f"{owner}/{repo}"]
+        return {"home": "<html></html>", "readme": readme, "tree": tree}
+
+    batches = []
+    analyze_pages_batch = import_queue.analyze_pages_batch
+
+    def analyze(page_sets):
+        batches.append(len(page_sets))
+        analyze_pages_batch(page_sets)
+
+    built = {}
+
+    def build_repo_world(owner, repo, scraper, pages):
+        built[f"{owner}/{repo}"] = pages
+        return SimpleNamespace(id=len(built))
+
+    monkeypatch.setattr(import_queue, "fetch_repo_pages", fetch_repo_pages)
+    monkeypatch.setattr(import_queue, "analyze_pages_batch", analyze)
+    monkeypatch.setattr(import_queue, "build_repo_world", build_repo_world)
+    set_parse_pool(ParsePool(0))
+    try:
+        import_queue.ImportQueue(None, workers=2, batch_size=3).run()
+    finally:
+        set_parse_pool(None)
+
+    assert batches == [3, 2]
+    for full_name, (readme, tree) in sources.items():
+        pages = built[full_name]
+        assert pages["readme_features"] == compute_readme_features(readme)
+        assert pages["structure_features"] == compute_structure_features(tree)
+    assert ImportJobRepository.get_counts()["done"] == 5
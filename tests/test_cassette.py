@@ -0,0 +1,161 @@
+"""
+Tests for recording and replaying HTTP traffic, and for the benchmark that
+replays it.
+"""
+
+import json
+
+import pytest
+import requests
+from click.testing import CliRunner
+
+from github_heroes.core.bench import run_bench
+from github_heroes.core.config import GITHUB_API_BASE
+from github_heroes.game import similarity
+from github_heroes.game.generators import build_repo_world
+from github_heroes.github.cassette import LATENCY_PROFILES, Cassette, CassetteMiss
+from github_heroes.github.scheduler import RequestScheduler
+from github_heroes.github.scraper import GitHubScraper
+from github_heroes.github.transport import RequestsTransport
+
+API_ROUTES = {
+    "/repos/o/r": json.dumps(
+        {"name": "r", "language": "Python", "default_branch": "main"}
+    ),
+    "/repos/o/r/readme": "# r\n",
+    "/repos/o/r/git/trees/main": json.dumps(
+        {"tree": [{"path": "app.py", "type": "blob", "size": 80}]}
+    ),
+    "/repos/o/r/issues": json.dumps([{"number": 1, "title": "Crash", "state": "open"}]),
+    "/repos/o/r/pulls": json.dumps([{"number": 2, "title": "Fix", "state": "open"}]),
+    "/repos/o/r/pulls/2": json.dumps({"number": 2, "title": "Fix", "additions": 5}),
+    "/repos/o/r/commits": json.dumps([]),
+}
+
+
+class StandInTransport(RequestsTransport):
+    """Sends api.github.com requests to a local server instead."""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+    def send(self, request, **kwargs):
+        request = request.copy()
+        request.url = request.url.replace(GITHUB_API_BASE, self.url, 1)
+        return super().send(request, **kwargs)
+
+
+def html_scraper(server, cassette: Cassette) -> GitHubScraper:
+    return GitHubScraper(
+        use_cache=False,
+        backend="html",
+        base_url=server.url,
+        scheduler=RequestScheduler(rate=1000, burst=100),
+        cassette=cassette,
+    )
+
+
+def get(url: str) -> requests.PreparedRequest:
+    return requests.Request("GET", url).prepare()
+
+
+def test_record_then_replay(db, server, tmp_path):
+    path = tmp_path / "traffic.json.gz"
+    server.routes["/o/r"] = (
+        200,
+        {"ETag": '"v1"', "Set-Cookie": "session=1", "Content-Type": "text/html"},
+        "<html>café</html>",
+    )
+    server.routes["/o/latin"] = b"<html>caf\xe9</html>"
+    with Cassette(path, mode="record") as cassette:
+        scraper = html_scraper(server, cassette)
+        assert scraper.fetch_repo_home("o", "r") == "<html>café</html>"
+        assert scraper.fetch_repo_home("o", "gone") is None
+        scraper.fetch_repo_home("o", "latin")
+    sent = len(server.requests)
+
+    replaying = Cassette(path)
+    scraper = html_scraper(server, replaying)
+    assert scraper.fetch_repo_home("o", "r") == "<html>café</html>"
+    assert scraper.fetch_repo_home("o", "gone") is None
+
+    # Replays never reach the server, and keep only the useful headers
+    assert len(server.requests) == sent
+    assert (replaying.replayed, replaying.missed) == (2, 0)
+    latin = replaying.replay(get(f"{server.url}/o/latin"))
+    assert latin.content == b"<html>caf\xe9</html>"
+    response = replaying.replay(get(f"{server.url}/o/r"))
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"v1"'
+    assert "Set-Cookie" not in response.headers
+    assert replaying.replay(get(f"{server.url}/o/gone")).status_code == 404
+
+
+def test_unrecorded_request_misses(tmp_path):
+    path = tmp_path / "empty.json.gz"
+    Cassette(path, mode="record").save()
+    cassette = Cassette(path)
+
+    with pytest.raises(CassetteMiss):
+        cassette.replay(get("https://github.com/o/r"))
+    assert (cassette.replayed, cassette.missed) == (0, 1)
+
+
+def test_miss_fails_the_fetch(db, server, tmp_path):
+    path = tmp_path / "empty.json.gz"
+    Cassette(path, mode="record").save()
+    cassette = Cassette(path)
+
+    assert html_scraper(server, cassette).fetch_repo_home("o", "r") is None
+    assert cassette.missed == 1
+    assert server.requests == []
+
+
+def test_latency_is_deterministic(tmp_path):
+    path = tmp_path / "empty.json.gz"
+    Cassette(path, mode="record").save()
+    url = "https://github.com/o/r"
+
+    assert Cassette(path).delay_for(url, 100_000) == 0
+    for profile, (rtt, bandwidth, jitter) in LATENCY_PROFILES.items():
+        if profile == "none":
+            continue
+        delay = Cassette(path, latency=profile).delay_for(url, 100_000)
+        assert delay == Cassette(path, latency=profile).delay_for(url, 100_000)
+        nominal = rtt + 100_000 / bandwidth
+        assert nominal * (1 - jitter) <= delay <= nominal * (1 + jitter)
+
+    mobile = Cassette(path, latency="mobile")
+    assert mobile.delay_for(url, 1_000_000) > mobile.delay_for(url, 1_000)
+    delays = {mobile.delay_for(f"{url}/{n}", 1_000) for n in range(10)}
+    assert len(delays) == 10
+
+
+def test_bench_replays_a_cassette(world_build, server, tmp_path, monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    server.routes.update(API_ROUTES)
+    path = tmp_path / "bench.json.gz"
+    with Cassette(path, mode="record") as cassette:
+        scraper = GitHubScraper(
+            use_cache=False,
+            backend="api",
+            scheduler=RequestScheduler(rate=1000, burst=100),
+            cassette=cassette,
+            transport=StandInTransport(server.url),
+        )
+        assert build_repo_world("o", "r", scraper)
+    sent = len(server.requests)
+    monkeypatch.setattr(similarity, "_similarity_index", None)
+
+    result = CliRunner().invoke(
+        run_bench,
+        ["o/r", "-c", str(path), "--backend", "api", "--parse-workers", "0"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count("run ") == 3
+    assert "(1 rooms, 2 quests)" in result.output
+    assert "3 builds" in result.output
+    assert f"{3 * sent} replayed, 0 missing responses" in result.output
+    assert len(server.requests) == sent
@@ -0,0 +1,63 @@
+"""
+Tests for database transactions.
+"""
+
+import threading
+
+import pytest
+
+from github_heroes.data.database import Database
+from github_heroes.data.repositories import ImportJobRepository
+
+
+def count_settings(db: Database) -> int:
+    return db.execute("SELECT COUNT(*) FROM settings").fetchone()[0]
+
+
+def test_transaction_rolls_back_on_error(db):
+    before = count_settings(db)
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute("INSERT INTO settings (key, value) VALUES ('a', '1')")
+            db.commit()  # Deferred to the end of the block
+            raise RuntimeError
+    assert count_settings(db) == before
+
+
+def test_nested_transaction_commits_with_outer(db):
+    before = count_settings(db)
+    with db.transaction():
+        with db.transaction():
+            db.execute("INSERT INTO settings (key, value) VALUES ('a', '1')")
+        db.execute("INSERT INTO settings (key, value) VALUES ('b', '2')")
+    assert count_settings(db) == before + 2
+
+
+def test_concurrent_claims_get_distinct_jobs(db):
+    for index in range(20):
+        ImportJobRepository.enqueue("owner", f"repo{index}")
+    claimed = []
+
+    def claim():
+        while (job := ImportJobRepository.claim_next()) is not None:
+            claimed.append(job.full_name)
+
+    threads = [threading.Thread(target=claim) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(f"owner/repo{index}" for index in range(20))
+
+
+def test_requeued_job_waits_for_its_retry(db):
+    ImportJobRepository.enqueue("owner", "repo")
+    job = ImportJobRepository.claim_next()
+    ImportJobRepository.requeue(job, delay=60)
+    assert ImportJobRepository.claim_next() is None
+    assert 0 < ImportJobRepository.seconds_until_due() <= 60
+
+    ImportJobRepository.requeue(job)
+    assert ImportJobRepository.seconds_until_due() == 0
+    assert ImportJobRepository.claim_next().attempts == 2
+    assert ImportJobRepository.seconds_until_due() is None
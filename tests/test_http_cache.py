@@ -0,0 +1,116 @@
+"""
+Tests for revalidating cached responses against a local server.
+"""
+
+import zlib
+
+import pytest
+
+from github_heroes.github.http_cache import ResponseCache
+from github_heroes.github.scheduler import RequestScheduler
+from github_heroes.github.scraper import GitHubScraper
+
+LAST_MODIFIED = "Tue, 02 Jan 2024 10:00:00 GMT"
+
+
+def etag_route(versions: dict):
+    """A route serving ``versions["body"]`` with ETag ``versions["etag"]``."""
+
+    def route(headers):
+        etag = versions["etag"]
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, ""
+        return 200, {"ETag": etag}, versions["body"]
+
+    return route
+
+
+def last_modified_route(headers):
+    if headers.get("If-Modified-Since") == LAST_MODIFIED:
+        return 304, {}, ""
+    return 200, {"Last-Modified": LAST_MODIFIED}, "<html>dated</html>"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "responses.db")
+
+
+@pytest.fixture
+def scraper(db, server, cache):
+    return GitHubScraper(
+        response_cache=cache,
+        backend="html",
+        base_url=server.url,
+        scheduler=RequestScheduler(rate=1000, burst=100),
+    )
+
+
+def sent_headers(server, path):
+    return [headers for _, sent, headers in server.requests if sent == path]
+
+
+def test_etag_revalidation(server, scraper, cache):
+    server.routes["/o/r"] = etag_route({"etag": '"v1"', "body": "<html>one</html>"})
+
+    assert scraper.fetch_repo_home("o", "r") == "<html>one</html>"
+    assert scraper.fetch_repo_home("o", "r") == "<html>one</html>"
+
+    first, second = sent_headers(server, "/o/r")
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == '"v1"'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_etag_replaces_the_entry(server, scraper, cache):
+    versions = {"etag": '"v1"', "body": "<html>one</html>"}
+    server.routes["/o/r"] = etag_route(versions)
+    scraper.fetch_repo_home("o", "r")
+
+    versions.update(etag='"v2"', body="<html>two</html>")
+    assert scraper.fetch_repo_home("o", "r") == "<html>two</html>"
+    assert scraper.fetch_repo_home("o", "r") == "<html>two</html>"
+
+    assert sent_headers(server, "/o/r")[-1]["If-None-Match"] == '"v2"'
+    assert cache.get(f"{server.url}/o/r").etag == '"v2"'
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_last_modified_revalidation(server, scraper, cache):
+    server.routes["/o/r"] = last_modified_route
+
+    assert scraper.fetch_repo_home("o", "r") == "<html>dated</html>"
+    assert scraper.fetch_repo_home("o", "r") == "<html>dated</html>"
+
+    assert sent_headers(server, "/o/r")[1]["If-Modified-Since"] == LAST_MODIFIED
+    assert cache.hits == 1
+
+
+def test_responses_without_validators_are_not_cached(server, scraper, cache):
+    server.routes["/o/r"] = "<html>plain</html>"
+
+    assert scraper.fetch_repo_home("o", "r") == "<html>plain</html>"
+    assert scraper.fetch_repo_home("o", "r") == "<html>plain</html>"
+
+    assert all(
+        "If-None-Match" not in headers and "If-Modified-Since" not in headers
+        for headers in sent_headers(server, "/o/r")
+    )
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_revalidated_entry_is_evicted(server, scraper, cache):
+    bodies = {name: f"<html>{name * 200}</html>" for name in "abc"}
+    for name, body in bodies.items():
+        server.routes[f"/o/{name}"] = etag_route({"etag": f'"{name}"', "body": body})
+    size = len(zlib.compress(bodies["a"].encode("utf-8")))
+    cache.set_max_bytes(2 * size)
+
+    scraper.fetch_repo_home("o", "a")
+    scraper.fetch_repo_home("o", "b")
+    scraper.fetch_repo_home("o", "a")  # Revalidated: now more recent than b
+    scraper.fetch_repo_home("o", "c")
+
+    cached = [name for name in "abc" if cache.get(f"{server.url}/o/{name}")]
+    assert cached == ["a", "c"]
+    assert cache.total_bytes == 2 * size
@@ -0,0 +1,32 @@
+"""
+Tests for the size-limited SQLite stores behind the on-disk caches.
+"""
+
+from github_heroes.data.models import TreeEntry
+from github_heroes.github.http_cache import ResponseCache
+from github_heroes.github.parse_cache import ParseCache
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.db", max_bytes=1000)
+    cache.store("a", "a" * 100, etag="1")
+    size = cache.total_bytes
+    cache.set_max_bytes(2 * size)
+    cache.store("b", "b" * 100, etag="2")
+    cache.record_hit("a")
+    cache.store("c", "c" * 100, etag="3")
+    assert [url for url in "abc" if cache.get(url)] == ["a", "c"]
+    assert cache.total_bytes == 2 * size
+    assert ResponseCache(tmp_path / "responses.db").total_bytes == 2 * size
+
+
+def test_parse_cache_counts_lookups(tmp_path):
+    cache = ParseCache(tmp_path / "parse.db")
+    key = ParseCache.key("tree", "parse_tree", ("<html></html>",))
+    assert cache.get(key, "tree") is None
+    cache.store(key, "tree", [TreeEntry(path="setup.py", file_type="py")])
+    assert cache.get(key, "tree") == [TreeEntry(path="setup.py", file_type="py")]
+    cache.remove(key)
+    stats = cache.stats()
+    assert stats["hits"] == stats["misses"] == 1
+    assert stats["entries"] == stats["bytes"] == 0
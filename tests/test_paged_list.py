@@ -0,0 +1,111 @@
+"""
+Tests for the pagination of issue, pull request and commit lists.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from github_heroes.game.generators import PagedList
+from github_heroes.github.api_parsers import count_json_entries, parse_issues_json
+
+
+def issues_page(first_number: int, size: int, pulls_every: int = 0) -> str:
+    """An API ``/issues`` page; every ``pulls_every``-th entry is a PR."""
+    entries = []
+    for number in range(first_number, first_number + size):
+        entry = {"number": number, "title": f"Issue {number}", "state": "open"}
+        if pulls_every and number % pulls_every == 0:
+            entry["pull_request"] = {"url": f"https://example.com/pull/{number}"}
+        entries.append(entry)
+    return json.dumps(entries)
+
+
+def read_pages(pages, page_size: int, budget: int, entries=None, max_pages=None):
+    """
+    Issue numbers read through a PagedList over the given raw pages (None
+    for a page that fails), and whether the list was read completely.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        paged = PagedList(
+            executor,
+            lambda page: pages[page - 1] if page <= len(pages) else None,
+            parse_issues_json,
+            pages[0],
+            parse_issues_json(pages[0]) if pages[0] else [],
+            page_size,
+            budget,
+            key=lambda issue: issue.issue_number,
+            max_pages=max_pages or len(pages) + 1,
+            entries=entries,
+        )
+        return [issue.issue_number for issue in paged.items()], paged.complete
+
+
+def paged_issues(pages, page_size: int, budget: int, entries=None) -> list:
+    """Issue numbers read through a PagedList over the given raw pages."""
+    return read_pages(pages, page_size, budget, entries)[0]
+
+
+def test_full_page_with_pull_requests_is_not_the_last():
+    pages = [
+        issues_page(1, 10, pulls_every=3),
+        issues_page(11, 10, pulls_every=3),
+        issues_page(21, 4),
+    ]
+    numbers = paged_issues(
+        pages, 10, 100, entries=lambda raw, items: count_json_entries(raw)
+    )
+    assert numbers == [n for n in range(1, 25) if n > 20 or n % 3]
+
+
+def test_page_of_only_pull_requests_continues():
+    pages = [issues_page(1, 10), issues_page(11, 10, pulls_every=1), issues_page(21, 3)]
+    numbers = paged_issues(
+        pages, 10, 100, entries=lambda raw, items: count_json_entries(raw)
+    )
+    assert numbers == list(range(1, 11)) + [21, 22, 23]
+
+
+def test_short_page_is_the_last():
+    pages = [issues_page(1, 10), issues_page(11, 5), issues_page(16, 10)]
+    assert paged_issues(pages, 10, 100) == list(range(1, 16))
+
+
+def test_budget_limits_items():
+    pages = [issues_page(1, 10), issues_page(11, 10), issues_page(21, 10)]
+    assert paged_issues(pages, 10, 15) == list(range(1, 16))
+
+
+def test_repeated_page_stops():
+    pages = [issues_page(1, 10), issues_page(1, 10), issues_page(11, 10)]
+    assert paged_issues(pages, 10, 100) == list(range(1, 11))
+
+
+def test_list_read_to_a_short_page_is_complete():
+    pages = [issues_page(1, 10), issues_page(11, 5)]
+    assert read_pages(pages, 10, 100) == (list(range(1, 16)), True)
+
+
+def test_list_cut_by_budget_is_incomplete():
+    pages = [issues_page(1, 10), issues_page(11, 10), issues_page(21, 3)]
+    assert read_pages(pages, 10, 15) == (list(range(1, 16)), False)
+
+
+def test_list_ending_exactly_at_budget_is_complete():
+    pages = [issues_page(1, 10), issues_page(11, 5)]
+    assert read_pages(pages, 10, 15) == (list(range(1, 16)), True)
+
+
+def test_list_cut_by_max_pages_is_incomplete():
+    pages = [issues_page(1, 10), issues_page(11, 10), issues_page(21, 3)]
+    numbers, complete = read_pages(pages, 10, 100, max_pages=2)
+    assert (numbers, complete) == (list(range(1, 21)), False)
+
+
+def test_failed_page_makes_the_list_incomplete():
+    pages = [issues_page(1, 10), None, issues_page(21, 3)]
+    assert read_pages(pages, 10, 100) == (list(range(1, 11)), False)
+
+
+def test_failed_first_page_makes_the_list_incomplete():
+    assert read_pages([None], 10, 100) == ([], False)
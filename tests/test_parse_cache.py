@@ -0,0 +1,56 @@
+"""
+Tests for caching parse results in the parse pool.
+"""
+
+import json
+
+import pytest
+
+from github_heroes.github import markup
+from github_heroes.github.markup import DEFAULT_SELECTORS, SelectorSet
+from github_heroes.github.parse_cache import ParseCache
+from github_heroes.github.parse_pool import ParsePool
+
+ISSUES_JSON = json.dumps([{"number": 7, "title": "Crash on start", "state": "open"}])
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return ParsePool(0, cache=ParseCache(tmp_path / "parse.db"))
+
+
+def test_parse_results_are_cached(pool):
+    first = pool.parse("api", "issues", ISSUES_JSON)
+    assert pool.parse("api", "issues", ISSUES_JSON) == first
+    assert pool.cache.stats()["hits"] == 1
+    assert pool.cache.stats()["entries"] == 1
+
+
+@pytest.mark.parametrize(
+    "backend, page_name, raw",
+    [
+        ("api", "home", "not json"),
+        ("api", "issues", "not json"),
+        ("html", "issues", "<html><body>Rate limited</body></html>"),
+        ("html", "commits", "<html><body>Something went wrong</body></html>"),
+    ],
+)
+def test_failed_parses_are_not_cached(pool, backend, page_name, raw):
+    assert not pool.parse(backend, page_name, raw)
+    assert not pool.parse(backend, page_name, raw)
+    assert pool.cache.stats()["entries"] == 0
+    assert pool.cache.stats()["hits"] == 0
+
+
+def test_key_covers_the_selector_set_version(monkeypatch):
+    key = ParseCache.key("tree", "parse_tree", ("<html></html>",))
+    monkeypatch.setattr(
+        markup,
+        "_selector_set",
+        SelectorSet(
+            DEFAULT_SELECTORS["version"] + 1,
+            DEFAULT_SELECTORS["selectors"],
+            DEFAULT_SELECTORS["row_classes"],
+        ),
+    )
+    assert ParseCache.key("tree", "parse_tree", ("<html></html>",)) != key
@@ -0,0 +1,46 @@
+"""
+Tests for incremental README analysis.
+"""
+
+import json
+import random
+from dataclasses import asdict
+
+import pytest
+
+from github_heroes.github.analyzers import ReadmeAnalyzer, compute_readme_features
+
+README = """# Example Project
+
+A command-line tool and REST API server for machine learning
+pipelines, with a React frontend.\r\n
+## Install
+
+    pip install example   # works in any shell
+
+Deep  learning, deep-learning and deep
+learning are different things. Café naïve 2024 v1 foo_bar.
+### Usage
+Run `example --help`; the CLI, the api and the Server share one config"""
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunked_feed_matches_whole_text(seed):
+    rng = random.Random(seed)
+    text = README * rng.randint(1, 3)
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 40)))
+    analyzer = ReadmeAnalyzer()
+    start = 0
+    for cut in cuts + [len(text)]:
+        analyzer.feed(text[start:cut])
+        start = cut
+    expected = compute_readme_features(text)
+    assert json.dumps(asdict(analyzer.finish())) == json.dumps(asdict(expected))
+
+
+def test_one_character_chunks():
+    analyzer = ReadmeAnalyzer(top_words=5)
+    for char in README:
+        analyzer.feed(char)
+    expected = compute_readme_features(README, top_words=5)
+    assert json.dumps(asdict(analyzer.finish())) == json.dumps(asdict(expected))
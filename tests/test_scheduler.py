@@ -0,0 +1,267 @@
+"""
+Tests for request scheduling, on a fake clock.
+"""
+
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from github_heroes.github import scheduler as scheduler_module
+from github_heroes.github.scheduler import RequestScheduler, SingleFlight, TokenBucket
+
+WALL_CLOCK_START = 1_700_000_000.0
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock at once."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return WALL_CLOCK_START + self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler_module, "time", fake)
+    return fake
+
+
+def response(status: int, **headers) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status
+    result.headers = CaseInsensitiveDict(
+        {name.replace("_", "-"): value for name, value in headers.items()}
+    )
+    result._content = b""
+    result._content_consumed = True
+    return result
+
+
+def replay(*responses):
+    """A send function answering with the given responses in turn."""
+    remaining = list(responses)
+    return lambda: remaining.pop(0)
+
+
+def test_token_bucket_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    acquired_at = []
+    for _ in range(6):
+        bucket.acquire()
+        acquired_at.append(clock.now)
+    assert acquired_at == pytest.approx([0, 0, 0.5, 1.0, 1.5, 2.0])
+
+
+def test_token_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=3)
+    for _ in range(3):
+        bucket.acquire()
+    clock.now += 60
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.now == 60
+    bucket.acquire()
+    assert clock.now == pytest.approx(61)
+
+
+def test_token_bucket_pause(clock):
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.pause(5)
+    bucket.acquire()
+    assert clock.now >= 5
+
+
+def test_retry_after_seconds(clock):
+    scheduler = RequestScheduler(rate=100, burst=10, backoff_max=60)
+    result = scheduler.request(
+        "https://api.github.com/x",
+        replay(response(429, Retry_After="7"), response(200)),
+    )
+    assert result.status_code == 200
+    assert clock.sleeps[0] == pytest.approx(7)
+
+
+def test_retry_after_http_date(clock):
+    scheduler = RequestScheduler(rate=100, burst=10, backoff_max=60)
+    when = datetime.fromtimestamp(WALL_CLOCK_START + 12, timezone.utc)
+    scheduler.request(
+        "https://api.github.com/x",
+        replay(
+            response(503, Retry_After=format_datetime(when, usegmt=True)), response(200)
+        ),
+    )
+    assert clock.sleeps[0] == pytest.approx(12)
+
+
+def test_exhausted_rate_limit_waits_for_reset(clock):
+    scheduler = RequestScheduler(rate=100, burst=10, backoff_max=60)
+    reset = str(int(WALL_CLOCK_START + 20))
+    result = scheduler.request(
+        "https://api.github.com/x",
+        replay(
+            response(403, X_RateLimit_Remaining="0", X_RateLimit_Reset=reset),
+            response(200),
+        ),
+    )
+    assert result.status_code == 200
+    assert clock.sleeps[0] == pytest.approx(20)
+
+
+def test_server_delay_is_capped(clock):
+    scheduler = RequestScheduler(rate=100, burst=10, backoff_max=30)
+    scheduler.request(
+        "https://api.github.com/x",
+        replay(response(429, Retry_After="3600"), response(200)),
+    )
+    assert clock.sleeps[0] == pytest.approx(30)
+
+
+def test_rate_limit_pauses_the_host(clock):
+    scheduler = RequestScheduler(rate=100, burst=10, backoff_max=60)
+    scheduler.request(
+        "https://api.github.com/x",
+        replay(response(429, Retry_After="5"), response(200)),
+    )
+    scheduler.request(
+        "https://github.com/x",
+        replay(response(503, Retry_After="5"), response(200)),
+    )
+    # Other requests to a rate limited host wait too; a server error doesn't
+    # hold back the host
+    assert scheduler._bucket("api.github.com").paused_until == pytest.approx(5)
+    assert scheduler._bucket("github.com").paused_until == 0
+
+
+def test_forbidden_without_exhausted_limit_is_not_retried(clock):
+    scheduler = RequestScheduler(rate=100, burst=10)
+    result = scheduler.request(
+        "https://api.github.com/x",
+        replay(response(403, X_RateLimit_Remaining="12"), response(200)),
+    )
+    assert result.status_code == 403
+    assert clock.sleeps == []
+
+
+def test_jittered_exponential_backoff(clock, monkeypatch):
+    monkeypatch.setattr(scheduler_module, "random", random.Random(4))
+    scheduler = RequestScheduler(
+        rate=100, burst=10, max_retries=5, backoff_base=1, backoff_max=8
+    )
+    result = scheduler.request("https://api.github.com/x", replay(*[response(502)] * 6))
+
+    # Every retry was tried and the last failure returned
+    assert result.status_code == 502
+    caps = [1, 2, 4, 8, 8]
+    assert len(clock.sleeps) == len(caps)
+    assert all(0 <= delay <= cap for delay, cap in zip(clock.sleeps, caps))
+
+    # Full jitter spreads delays over the whole range
+    delays = [scheduler._backoff(3) for _ in range(500)]
+    assert max(delays) <= 8
+    assert min(delays) < 1 and max(delays) > 7
+
+
+def test_connection_errors_are_retried(clock):
+    scheduler = RequestScheduler(rate=100, burst=10, max_retries=2)
+    attempts = []
+
+    def send():
+        attempts.append(clock.now)
+        if len(attempts) < 3:
+            raise requests.ConnectionError("refused")
+        return response(200)
+
+    assert scheduler.request("https://api.github.com/x", send).status_code == 200
+    assert len(attempts) == 3
+
+    def refuse():
+        attempts.append(clock.now)
+        raise requests.ConnectionError("refused")
+
+    attempts.clear()
+    with pytest.raises(requests.ConnectionError):
+        scheduler.request("https://api.github.com/x", refuse)
+    assert len(attempts) == 3
+
+
+def wait_until(condition):
+    """Poll ``condition`` for up to 5 seconds."""
+    for _ in range(500):
+        if condition():
+            return
+        threading.Event().wait(0.01)
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "body"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(single_flight.do("k", fetch)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: single_flight.coalesced == 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["body"] * 4
+    assert len(calls) == 1
+    assert single_flight.coalesced == 3
+
+    # Once finished, the key runs afresh
+    assert single_flight.do("k", fetch) == "body"
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_exceptions():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            single_flight.do("k", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: single_flight.coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert len({id(error) for error in errors}) == 1
@@ -0,0 +1,56 @@
+"""
+Tests for HTML selector overrides.
+"""
+
+import json
+
+import pytest
+
+from github_heroes.github import markup
+from github_heroes.github.markup import load_selector_set
+from github_heroes.github.parsers import parse_search_results
+
+SEARCH_PAGE = """
+<html><body>
+  <header><a href="/features/actions">Actions</a></header>
+  <div class="search-title"><a href="/psf/requests">psf/requests</a></div>
+  <div class="search-title"><a href="/pallets/flask">pallets/flask</a></div>
+  <footer><a href="/about/careers">Careers</a></footer>
+</body></html>
+"""
+
+
+@pytest.fixture
+def use_selectors(tmp_path, monkeypatch):
+    """Make the parsers use a selector set with the given overrides."""
+
+    def use(selectors=None):
+        path = tmp_path / "selectors.json"
+        if selectors is not None:
+            path.write_text(json.dumps({"version": 2, "selectors": selectors}))
+        monkeypatch.setattr(markup, "_selector_set", load_selector_set(path))
+
+    return use
+
+
+def test_default_site_links(use_selectors):
+    use_selectors()
+    assert parse_search_results(SEARCH_PAGE) == [
+        "features/actions",
+        "psf/requests",
+        "pallets/flask",
+        "about/careers",
+    ]
+
+
+def test_site_links_override_sees_whole_page(use_selectors):
+    # The containers are outside the built-in link strainer
+    use_selectors({"site_links": '.search-title a[href^="/"]'})
+    assert parse_search_results(SEARCH_PAGE) == ["psf/requests", "pallets/flask"]
+
+
+def test_overridden_link_selector_has_no_strainer(use_selectors):
+    use_selectors({"tree_links": ".js-navigation-open"})
+    strainers = markup.get_selector_set().strainers
+    assert strainers["tree_links"] is None
+    assert strainers["site_links"] is not None
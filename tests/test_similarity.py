@@ -0,0 +1,113 @@
+"""
+Tests for the MinHash similarity index of worlds.
+"""
+
+import json
+from array import array
+
+import pytest
+
+from github_heroes.data.models import RepoWorld
+from github_heroes.data.repositories import (
+    RepoWorldRepository,
+    WorldSignatureRepository,
+)
+from github_heroes.game.similarity import MinHasher, SimilarityIndex
+
+
+def tokens(prefix: str, count: int, start: int = 0) -> set:
+    return {f"word:{prefix}{index}" for index in range(start, start + count)}
+
+
+def features(words: set) -> tuple:
+    """README and structure features whose tokens are ``words``."""
+    readme = {"word_frequencies": {word.split(":", 1)[1]: 1 for word in words}}
+    return readme, {}
+
+
+@pytest.mark.parametrize("shared", [20, 60, 100, 150, 180])
+def test_jaccard_estimate_is_close(shared):
+    # Two sets of 200 tokens sharing ``shared`` of them
+    first = tokens("t", 200)
+    second = tokens("t", 200, start=200 - shared)
+    jaccard = len(first & second) / len(first | second)
+
+    hasher = MinHasher(256)
+    a, b = hasher.signature(first), hasher.signature(second)
+    estimate = sum(x == y for x, y in zip(a, b)) / hasher.hashes
+
+    assert abs(estimate - jaccard) < 0.1
+
+
+def test_signatures_are_stable():
+    words = tokens("t", 50)
+    assert MinHasher().signature(words) == MinHasher().signature(set(sorted(words)))
+    assert MinHasher().signature(set()) is None
+
+
+def test_lsh_finds_near_duplicates_only():
+    hasher = MinHasher()
+    index = SimilarityIndex(hasher)
+    base = tokens("t", 100)
+    index.add(1, hasher.signature(base))
+    index.add(2, hasher.signature(base - tokens("t", 5) | tokens("x", 5)))
+    index.add(3, hasher.signature(tokens("u", 100)))
+    index.add(4, hasher.signature(tokens("v", 100)))
+
+    related = index.related(1)
+    assert [world_id for world_id, _ in related] == [2]
+    assert related[0][1] > 0.8
+    assert index.related(3) == []
+
+    index.remove(2)
+    assert index.related(1) == []
+
+
+def create_world(name: str, words: set) -> RepoWorld:
+    readme, structure = features(words)
+    return RepoWorldRepository.create(
+        RepoWorld(
+            owner="o",
+            repo=name,
+            full_name=f"o/{name}",
+            readme_features_json=json.dumps(readme),
+            structure_features_json=json.dumps(structure),
+        )
+    )
+
+
+def test_signatures_persist(db):
+    index = SimilarityIndex()
+    scheme = index.hasher.scheme
+    first = create_world("first", tokens("t", 100))
+    second = create_world("second", tokens("t", 95) | tokens("x", 5))
+    index.update_world(first.id, *features(tokens("t", 100)))
+    index.update_world(second.id, *features(tokens("t", 95) | tokens("x", 5)))
+
+    stored = WorldSignatureRepository.get_all(scheme)
+    assert set(stored) == {first.id, second.id}
+    signature = array("I")
+    signature.frombytes(stored[first.id])
+    assert signature == index.signatures[first.id]
+
+    loaded = SimilarityIndex()
+    loaded.load()
+    assert loaded.signatures == index.signatures
+    assert loaded.related(first.id) == index.related(first.id)
+    assert [world_id for world_id, _ in loaded.related(first.id)] == [second.id]
+
+    index.remove_world(second.id)
+    assert set(WorldSignatureRepository.get_all(scheme)) == {first.id}
+
+
+def test_load_signs_worlds_without_a_stored_signature(db):
+    world = create_world("first", tokens("t", 100))
+    other = create_world("second", tokens("t", 100))
+    WorldSignatureRepository.save(other.id, "minhash-old", b"\0" * 8)
+
+    index = SimilarityIndex()
+    index.load()
+
+    stored = WorldSignatureRepository.get_all(index.hasher.scheme)
+    assert set(stored) == {world.id, other.id}
+    assert index.related(world.id) == [(other.id, 1.0)]
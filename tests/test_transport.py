@@ -0,0 +1,88 @@
+"""
+Tests for the scraper's HTTP transports, against a local server.
+"""
+
+import pytest
+import requests
+
+from github_heroes.github.transport import HTTPXTransport, RequestsTransport
+
+
+def requests_transport(**kwargs):
+    return RequestsTransport(**kwargs)
+
+
+def httpx_transport(**kwargs):
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    return HTTPXTransport(**kwargs)
+
+
+TRANSPORTS = [requests_transport, httpx_transport]
+
+
+def session_with(transport) -> requests.Session:
+    session = requests.Session()
+    session.trust_env = False
+    session.mount("http://", transport)
+    session.mount("https://", transport)
+    return session
+
+
+@pytest.mark.parametrize("make_transport", TRANSPORTS)
+def test_keep_alive_reuses_the_connection(server, make_transport):
+    server.routes["/page"] = "hello"
+    transport = make_transport()
+    session = session_with(transport)
+
+    for _ in range(5):
+        response = session.get(f"{server.url}/page", timeout=5)
+        assert response.text == "hello"
+
+    stats = transport.stats.snapshot()
+    assert (stats["requests"], stats["connections"], stats["reused"]) == (5, 1, 4)
+    assert stats["reuse_ratio"] == pytest.approx(0.8)
+    assert stats["per_host"] == {"127.0.0.1": {"connections": 1, "requests": 5}}
+    assert [entry["requests"] for entry in stats["per_connection"]] == [5]
+    transport.close()
+
+
+@pytest.mark.parametrize("make_transport", TRANSPORTS)
+def test_without_keep_alive_every_request_connects(server, make_transport):
+    server.routes["/page"] = "hello"
+    transport = make_transport(keep_alive=False)
+    session = session_with(transport)
+
+    for _ in range(3):
+        assert session.get(f"{server.url}/page", timeout=5).text == "hello"
+
+    stats = transport.stats.snapshot()
+    assert (stats["requests"], stats["connections"], stats["reused"]) == (3, 3, 0)
+    transport.close()
+
+
+@pytest.mark.parametrize("make_transport", TRANSPORTS)
+def test_proxies_are_used(server, make_transport):
+    server.routes["/page"] = "via proxy"
+    transport = make_transport()
+    session = session_with(transport)
+    session.proxies = {"http": server.url}
+
+    response = session.get("http://github.invalid/page", timeout=5)
+
+    assert response.text == "via proxy"
+    assert server.paths() == ["http://github.invalid/page"]
+    transport.close()
+
+
+def test_httpx_client_per_tls_configuration(server):
+    server.routes["/page"] = "hello"
+    transport = httpx_transport()
+    session = session_with(transport)
+
+    session.get(f"{server.url}/page", timeout=5)
+    session.get(f"{server.url}/page", timeout=5, verify=False)
+    session.get(f"{server.url}/page", timeout=5)
+
+    assert len(transport._clients) == 2
+    transport.close()
@@ -0,0 +1,175 @@
+"""
+Tests for syncing the quests and enemies of a rebuilt world with the stored
+ones.
+"""
+
+import pytest
+
+from github_heroes.data.models import Enemy, Quest, RepoWorld
+from github_heroes.data.repositories import (
+    EnemyRepository,
+    QuestRepository,
+    RepoWorldRepository,
+)
+from github_heroes.game.generators import QuestSync, sync_enemies
+
+
+@pytest.fixture
+def world(db):
+    return RepoWorldRepository.create(
+        RepoWorld(owner="octo", repo="cat", full_name="octo/cat")
+    )
+
+
+def quest(world, number, title=None, difficulty=1, status="new", source="issue"):
+    return Quest(
+        world_id=world.id,
+        source_type=source,
+        source_number=number,
+        title=title or f"Issue {number}",
+        difficulty=difficulty,
+        status=status,
+    )
+
+
+def boss(world, number, level=5):
+    return Enemy(
+        world_id=world.id,
+        name=f"PR #{number}: Change {number}",
+        level=level,
+        hp=100 + level * 10,
+        is_boss=True,
+    )
+
+
+def stored_quests(world):
+    return {q.source_number: q for q in QuestRepository.get_by_world_id(world.id)}
+
+
+def sync_quests(world, quests, remove_stale=True):
+    sync = QuestSync(QuestRepository.get_by_world_id(world.id), "issue")
+    sync.apply(quests)
+    return sync.finish(remove_stale=remove_stale)
+
+
+def test_quests_keep_id_and_status_and_update_changes(world):
+    QuestRepository.create_many(
+        [quest(world, 1), quest(world, 2, status="in_progress"), quest(world, 3)]
+    )
+    before = stored_quests(world)
+
+    sync_quests(
+        world,
+        [
+            quest(world, 1),
+            quest(world, 2, title="Renamed", difficulty=4),
+            quest(world, 3),
+            quest(world, 4),
+        ],
+    )
+
+    after = stored_quests(world)
+    assert sorted(after) == [1, 2, 3, 4]
+    for number in (1, 2, 3):
+        assert after[number].id == before[number].id
+    assert after[2].status == "in_progress"
+    assert (after[2].title, after[2].difficulty) == ("Renamed", 4)
+    assert after[4].status == "new"
+
+
+def test_stale_quests_are_deleted_unless_started_or_completed(world):
+    QuestRepository.create_many(
+        [
+            quest(world, 1),
+            quest(world, 2),
+            quest(world, 3, status="in_progress"),
+            quest(world, 4, status="completed"),
+            quest(world, 9, source="pr"),
+        ]
+    )
+
+    removed = sync_quests(world, [quest(world, 1)])
+
+    assert removed == [2]
+    assert sorted(stored_quests(world)) == [1, 3, 4, 9]
+
+
+def test_stale_quests_survive_an_incomplete_list(world):
+    QuestRepository.create_many([quest(world, 1), quest(world, 2)])
+
+    assert sync_quests(world, [quest(world, 1)], remove_stale=False) == []
+    assert sorted(stored_quests(world)) == [1, 2]
+
+
+def test_duplicate_quests_are_removed_keeping_the_most_progress(world):
+    QuestRepository.create_many(
+        [
+            quest(world, 1),
+            quest(world, 1, status="completed"),
+            quest(world, 1, status="in_progress"),
+            quest(world, 2),
+            quest(world, 2),
+        ]
+    )
+
+    sync_quests(world, [quest(world, 1), quest(world, 2)], remove_stale=False)
+
+    quests = QuestRepository.get_by_world_id(world.id)
+    assert sorted(q.source_number for q in quests) == [1, 2]
+    assert stored_quests(world)[1].status == "completed"
+
+
+def test_enemies_keep_ids_and_update_changes(world):
+    main = EnemyRepository.create(Enemy(world_id=world.id, name="Main", level=3))
+    world.main_enemy_id = main.id
+    RepoWorldRepository.update(world)
+    EnemyRepository.create_many([boss(world, 1), boss(world, 2)])
+    before = {e.name: e.id for e in EnemyRepository.get_by_world_id(world.id)}
+
+    stored_main = sync_enemies(
+        world,
+        Enemy(world_id=world.id, name="Main", level=7),
+        [boss(world, 1), boss(world, 2, level=9), boss(world, 3)],
+    )
+
+    enemies = {e.name: e for e in EnemyRepository.get_by_world_id(world.id)}
+    assert stored_main.id == main.id
+    assert enemies["Main"].level == 7
+    assert enemies["PR #1: Change 1"].id == before["PR #1: Change 1"]
+    assert enemies["PR #2: Change 2"].id == before["PR #2: Change 2"]
+    assert enemies["PR #2: Change 2"].level == 9
+    assert "PR #3: Change 3" in enemies
+
+
+def test_stale_and_duplicate_enemies_are_deleted(world):
+    main = EnemyRepository.create(Enemy(world_id=world.id, name="Main"))
+    world.main_enemy_id = main.id
+    EnemyRepository.create_many(
+        [
+            Enemy(world_id=world.id, name="Old main"),
+            boss(world, 1),
+            boss(world, 1),
+            boss(world, 2),
+        ]
+    )
+
+    sync_enemies(world, Enemy(world_id=world.id, name="Main"), [boss(world, 1)])
+
+    names = sorted(e.name for e in EnemyRepository.get_by_world_id(world.id))
+    assert names == ["Main", "PR #1: Change 1"]
+
+
+def test_stale_bosses_survive_an_incomplete_list(world):
+    main = EnemyRepository.create(Enemy(world_id=world.id, name="Main"))
+    world.main_enemy_id = main.id
+    EnemyRepository.create_many([boss(world, 1), boss(world, 2)])
+
+    sync_enemies(
+        world,
+        Enemy(world_id=world.id, name="Main"),
+        [boss(world, 1)],
+        remove_stale_bosses=False,
+    )
+
+    names = sorted(e.name for e in EnemyRepository.get_by_world_id(world.id))
+    assert names == ["Main", "PR #1: Change 1", "PR #2: Change 2"]